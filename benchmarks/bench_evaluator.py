@@ -0,0 +1,105 @@
+import argparse
+import time
+from interpreter.ast import LetStatement
+from interpreter.evaluator import Evaluator, EvaluationError
+from interpreter.parser import parse
+
+
+class Environment:
+    def __init__(self, outer=None):
+        self.store = {}
+        self.outer = outer
+
+    def get(self, name):
+        environment = self
+        while environment is not None:
+            if name in environment.store:
+                return environment.store[name]
+            environment = environment.outer
+        raise EvaluationError(f"identifier not found: {name}")
+
+
+class NaiveEvaluator(Evaluator):
+    # Same walker, but identifiers are looked up by name through a chain of
+    # dicts instead of through resolved (depth, slot) pairs.
+    def __init__(self, depth=1):
+        super().__init__()
+        self.globals = self.environment = Environment()
+        for _ in range(depth - 1):
+            self.environment = Environment(self.environment)
+
+    def evaluate(self, program):
+        return self.run(program)
+
+    def run(self, program):
+        result = None
+        for statement in program.statements:
+            if isinstance(statement, LetStatement):
+                self.globals.store[statement.name.value] = \
+                    self.eval_expression(statement.value)
+            else:
+                result = self.eval_statement(statement)
+        return result
+
+    def eval_expression(self, expression):
+        return Evaluator.eval_expression(self, expression)
+
+    def lookup(self, identifier):
+        return self.environment.get(identifier.value)
+
+
+def variable_name(index):
+    name = "v"
+    while True:
+        name += "abcdefghijklmnopqrstuvwxyz"[index % 26]
+        index //= 26
+        if not index:
+            return name
+
+
+def make_program(statements, variables):
+    names = [variable_name(i) for i in range(variables)]
+    lines = [f"let {name} = {i + 1};" for i, name in enumerate(names)]
+    for i in range(statements):
+        a, b, c = names[i % variables], names[(i * 7) % variables], names[(i * 13) % variables]
+        lines.append(f"{a} * {i % 9 + 1} + {b} - {c} / 3 > {a} == true;")
+    return "\n".join(lines)
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare slot-resolved and dict-based evaluation.")
+    arg_parser.add_argument("--statements", type=int, default=20000)
+    arg_parser.add_argument("--variables", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    program = parse(make_program(args.statements, args.variables)).program
+    identifiers = sum(1 for s in program.statements if not isinstance(s, LetStatement)) * 4
+
+    evaluator = Evaluator()
+    start = time.perf_counter()
+    evaluator.resolve(program)
+    print(f"resolver pass:    {time.perf_counter() - start:.3f}s")
+
+    resolved = best_time(lambda: evaluator.run(program), args.repeat)
+    print(f"resolved slots:   {resolved:.3f}s")
+
+    # The naive walker must not see resolved slots.
+    program = parse(make_program(args.statements, args.variables)).program
+    for depth in (1, 4):
+        naive = best_time(lambda: NaiveEvaluator(depth).run(program), args.repeat)
+        print(f"dict chain x{depth}:   {naive:.3f}s ({naive / resolved:.2f}x)")
+    print(f"{identifiers} identifier lookups per run")
+
+
+if __name__ == "__main__":
+    main()
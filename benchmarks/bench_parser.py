@@ -0,0 +1,136 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from benchmarks.generator import generate_program, parse_operator_mix, parse_size
+from interpreter import token
+from interpreter.byte_lexer import ByteLexer
+from interpreter.lexer import ENGINES, Lexer
+from interpreter.parser import Parser
+from interpreter.recognizer import validate
+
+
+def count_tokens(source, engine):
+    if engine == "bytes":
+        next_token = ByteLexer(source).next_token
+    else:
+        next_token = Lexer(source, engine=engine).next_token
+    count = 0
+    while next_token().type != token.EOF:
+        count += 1
+    return count
+
+
+def parse_statements(source):
+    return len(Parser(Lexer(source, engine="regex")).parse_program().statements)
+
+
+def timed(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def rate(count, seconds):
+    return round(count / seconds) if seconds else None
+
+
+def run_case(source, repeat, measure_memory=True):
+    case = {"bytes": len(source), "lexer": {}}
+    encoded = source.encode("ascii")
+    for engine in (*ENGINES, "bytes"):
+        text = encoded if engine == "bytes" else source
+        tokens, seconds = timed(lambda: count_tokens(text, engine), repeat)
+        case["lexer"][engine] = {
+            "tokens": tokens,
+            "seconds": seconds,
+            "tokens_per_second": rate(tokens, seconds),
+        }
+
+    statements, seconds = timed(lambda: parse_statements(source), repeat)
+    case["parser"] = {
+        "statements": statements,
+        "seconds": seconds,
+        "statements_per_second": rate(statements, seconds),
+    }
+    if measure_memory:
+        case["parser"]["peak_memory_bytes"] = peak_memory(lambda: parse_statements(source))
+
+    result, seconds = timed(lambda: validate(source, stats=True), repeat)
+    statements = result.stats["statements"]
+    case["validate"] = {
+        "statements": statements,
+        "seconds": seconds,
+        "statements_per_second": rate(statements, seconds),
+    }
+    if measure_memory:
+        case["validate"]["peak_memory_bytes"] = peak_memory(lambda: validate(source))
+    return case
+
+
+def run_suite(sizes, depths=(4,), seed=0, operators=None, repeat=3, measure_memory=True):
+    results = []
+    for depth in depths:
+        for size in sizes:
+            source = generate_program(size, seed, depth, operators)
+            case = {"size": size, "depth": depth}
+            case.update(run_case(source, repeat, measure_memory))
+            results.append(case)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "seed": seed,
+        "operators": operators,
+        "results": results,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure lexer and parser throughput.")
+    arg_parser.add_argument("--sizes", default="1K,100K,1M",
+        help="comma separated program sizes, e.g. 1K,10M,100M")
+    arg_parser.add_argument("--depths", default="4",
+        help="comma separated maximum nesting depths")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--operators", type=parse_operator_mix,
+        help="weighted operator mix, e.g. '+:3,*:1,==:1'")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--no-memory", dest="memory", action="store_false",
+        help="skip the tracemalloc run, which is slow on large sizes")
+    arg_parser.add_argument("--output", help="write the JSON report to this file")
+    args = arg_parser.parse_args()
+
+    report = run_suite(
+        [parse_size(size) for size in args.sizes.split(",")],
+        [int(depth) for depth in args.depths.split(",")],
+        args.seed,
+        args.operators,
+        args.repeat,
+        args.memory,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import interpreter.token as token
+from benchmarks.bench_evaluator import best_time
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser
+from interpreter.pool import ParserPool
+
+SNIPPETS = ["a + b * 2", "let x = 5;", "-a == !true", "(1 + 2) * 3 / x", "return y;"]
+
+
+class PerInstanceParser(Parser):
+    # Registers bound methods on every construction, the way Parser did
+    # before the dispatch tables were built once per class.
+    def __init__(self, lexer):
+        self.register_prefix(token.IDENT, self.parse_identifier)
+        self.register_prefix(token.INT, self.parse_integer_literal)
+        self.register_prefix(token.BANG, self.parse_prefix_expression)
+        self.register_prefix(token.MINUS, self.parse_prefix_expression)
+        self.register_prefix(token.TRUE, self.parse_boolean)
+        self.register_prefix(token.FALSE, self.parse_boolean)
+        self.register_prefix(token.LPAREN, self.parse_grouped_expression)
+
+        self.register_infix(token.PLUS, self.parse_infix_expression)
+        self.register_infix(token.MINUS, self.parse_infix_expression)
+        self.register_infix(token.SLASH, self.parse_infix_expression)
+        self.register_infix(token.ASTERISK, self.parse_infix_expression)
+        self.register_infix(token.EQ, self.parse_infix_expression)
+        self.register_infix(token.NOT_EQ, self.parse_infix_expression)
+        self.register_infix(token.LT, self.parse_infix_expression)
+        self.register_infix(token.GT, self.parse_infix_expression)
+        super().__init__(lexer)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure per-snippet parser overhead.")
+    arg_parser.add_argument("--snippets", type=int, default=100000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    snippets = (SNIPPETS * (args.snippets // len(SNIPPETS) + 1))[:args.snippets]
+
+    def fresh(parser_class):
+        def run():
+            for snippet in snippets:
+                parser_class(Lexer(snippet, engine="regex")).parse_program()
+        return run
+
+    def reused():
+        parser = Parser(Lexer("", engine="regex"))
+        for snippet in snippets:
+            parser.reset(snippet).parse_program()
+
+    def pooled():
+        pool = ParserPool()
+        for snippet in snippets:
+            pool.parse(snippet)
+
+    baseline = None
+    for name, run in (
+        ("per-instance tables", fresh(PerInstanceParser)),
+        ("class tables", fresh(Parser)),
+        ("reset", reused),
+        ("pool", pooled),
+    ):
+        seconds = best_time(run, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<20} {seconds / len(snippets) * 1e6:7.2f} us/snippet "
+            f"({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
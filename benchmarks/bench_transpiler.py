@@ -0,0 +1,41 @@
+import argparse
+from benchmarks.bench_evaluator import best_time, make_program
+from interpreter.compiler import compile_program
+from interpreter.evaluator import Evaluator
+from interpreter.parser import parse
+from interpreter.transpiler import CodeCache, load
+from interpreter.vm import VM
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Compare the AST walker, the bytecode VM and transpiled Python code.")
+    arg_parser.add_argument("--statements", type=int, default=20000)
+    arg_parser.add_argument("--variables", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    source = make_program(args.statements, args.variables)
+    program = parse(source).program
+
+    evaluator = Evaluator()
+    evaluator.resolve(program)
+    walker = best_time(lambda: evaluator.run(program), args.repeat)
+    print(f"AST walker:  {walker:.3f}s")
+
+    bytecode = compile_program(program)
+    vm = best_time(lambda: VM(bytecode).run(), args.repeat)
+    print(f"bytecode VM: {vm:.3f}s ({walker / vm:.2f}x faster)")
+
+    cache = CodeCache()
+    cold = best_time(lambda: CodeCache().code(source), 1)
+    function = load(cache.code(source))
+    transpiled = best_time(function, args.repeat)
+    warm = best_time(lambda: cache.run(source), args.repeat)
+    print(f"transpile:   {cold:.3f}s including parse")
+    print(f"transpiled:  {transpiled:.3f}s ({walker / transpiled:.2f}x faster)")
+    print(f"cached run:  {warm:.3f}s including hashing and loading")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+from benchmarks.bench_evaluator import best_time
+from interpreter.parser import parse
+from interpreter.vectorize import evaluate_columns, evaluate_rows, np
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Compare column-at-a-time with row-at-a-time expression evaluation.")
+    arg_parser.add_argument("--expression", default="a * 2 + b > c / 3")
+    arg_parser.add_argument("--rows", type=int, default=1000000)
+    arg_parser.add_argument("--sample", type=int, default=20000,
+        help="rows evaluated one at a time; the total is extrapolated")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    if np is None:
+        arg_parser.error("numpy is not installed")
+
+    expression = parse(args.expression).program.statements[0].expression
+    generator = np.random.default_rng(0)
+    columns = {name: generator.integers(-1000, 1000, args.rows) for name in "abc"}
+
+    vectorized = best_time(lambda: evaluate_columns(expression, columns), args.repeat)
+    sample = {name: values[:args.sample] for name, values in columns.items()}
+    rows = best_time(lambda: evaluate_rows(expression, sample, (args.sample,)), 1)
+    rows *= args.rows / args.sample
+    print(f"rows:       {rows:.3f}s (extrapolated from {args.sample})")
+    print(f"vectorized: {vectorized:.3f}s ({rows / vectorized:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+from benchmarks.bench_evaluator import best_time, make_program
+from interpreter.compiler import compile_program
+from interpreter.evaluator import Evaluator
+from interpreter.parser import parse
+from interpreter.vm import VM
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare the AST walker with the bytecode VM.")
+    arg_parser.add_argument("--statements", type=int, default=20000)
+    arg_parser.add_argument("--variables", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    program = parse(make_program(args.statements, args.variables)).program
+
+    evaluator = Evaluator()
+    evaluator.resolve(program)
+    walker = best_time(lambda: evaluator.run(program), args.repeat)
+    print(f"AST walker:  {walker:.3f}s")
+
+    compiled = best_time(lambda: compile_program(program), 1)
+    bytecode = compile_program(program)
+    vm = best_time(lambda: VM(bytecode).run(), args.repeat)
+    print(f"compile:     {compiled:.3f}s ({len(bytecode.instructions)} words)")
+    print(f"bytecode VM: {vm:.3f}s ({walker / vm:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import random
+import sys
+
+DEFAULT_OPERATORS = {
+    "+": 4,
+    "-": 3,
+    "*": 3,
+    "/": 1,
+    "<": 1,
+    ">": 1,
+    "==": 1,
+    "!=": 1,
+}
+
+SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def parse_operator_mix(text):
+    mix = {}
+    for item in text.split(","):
+        operator, _, weight = item.partition(":")
+        mix[operator.strip()] = float(weight or 1)
+    return mix
+
+
+class ProgramGenerator:
+    def __init__(self, seed=0, max_depth=4, operators=None, identifiers=64):
+        self.random = random.Random(seed)
+        self.max_depth = max_depth
+        mix = operators or DEFAULT_OPERATORS
+        self.operators = list(mix)
+        self.weights = list(mix.values())
+        self.identifiers = [self.identifier_name(i) for i in range(identifiers)]
+        self.defined = []
+
+    @staticmethod
+    def identifier_name(index):
+        name = ""
+        while True:
+            name += "abcdefghijklmnopqrstuvwxyz"[index % 26]
+            index //= 26
+            if not index:
+                return name
+
+    def operator(self):
+        return self.random.choices(self.operators, self.weights)[0]
+
+    def operand(self):
+        roll = self.random.random()
+        if roll < 0.45 and self.defined:
+            return self.random.choice(self.defined)
+        if roll < 0.9:
+            return str(self.random.randint(0, 10000))
+        if roll < 0.95:
+            return self.random.choice(("true", "false"))
+        return self.random.choice(("-", "!")) + self.operand_literal()
+
+    def operand_literal(self):
+        return str(self.random.randint(0, 100))
+
+    def expression(self):
+        # Nesting is built by wrapping, so depth costs no recursion.
+        expression = self.operand()
+        for _ in range(self.random.randint(0, 4)):
+            expression = f"{expression} {self.operator()} {self.operand()}"
+        for _ in range(self.random.randint(0, self.max_depth)):
+            if self.random.random() < 0.2:
+                expression = f"-({expression})"
+            else:
+                expression = f"({expression}) {self.operator()} {self.operand()}"
+        return expression
+
+    def statement(self):
+        roll = self.random.random()
+        if roll < 0.4 or not self.defined:
+            name = self.random.choice(self.identifiers)
+            statement = f"let {name} = {self.expression()};"
+            if name not in self.defined:
+                self.defined.append(name)
+            return statement
+        if roll < 0.45:
+            return f"return {self.expression()};"
+        return f"{self.expression()};"
+
+    def generate(self, size):
+        lines = []
+        total = 0
+        while total < size:
+            line = self.statement()
+            lines.append(line)
+            total += len(line) + 1
+        return "\n".join(lines) + "\n"
+
+
+def generate_program(size, seed=0, max_depth=4, operators=None):
+    return ProgramGenerator(seed, max_depth, operators).generate(size)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic Monkey program.")
+    arg_parser.add_argument("size", type=parse_size, help="target size, e.g. 1K, 10M")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--depth", type=int, default=4, help="maximum nesting depth")
+    arg_parser.add_argument("--operators", type=parse_operator_mix,
+        help="weighted operator mix, e.g. '+:3,*:1,==:1'")
+    args = arg_parser.parse_args()
+
+    sys.stdout.write(generate_program(args.size, args.seed, args.depth, args.operators))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import json
+import time
+from benchmarks.generator import generate_program
+from interpreter.service import Histogram, ParseService, ServiceClient
+
+
+async def run_client(client, sources, requests, concurrency, latency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.parse(sources[index % len(sources)])
+            latency.observe((time.perf_counter() - started) * 1000)
+            return "error" not in response
+
+    return sum(await asyncio.gather(*(one(i) for i in range(requests))))
+
+
+async def run(args):
+    service = None
+    if args.unix is None and args.port is None:
+        service = ParseService(args.batch_size, args.batch_delay / 1000)
+        server = await service.start_tcp()
+        host, port = server.sockets[0].getsockname()[:2]
+    else:
+        host, port = args.host, args.port
+
+    sources = [generate_program(args.size, seed) for seed in range(16)]
+    clients = []
+    for _ in range(args.clients):
+        if args.unix:
+            clients.append(await ServiceClient.connect_unix(args.unix))
+        else:
+            clients.append(await ServiceClient.connect_tcp(host, port))
+
+    latency = Histogram()
+    started = time.perf_counter()
+    succeeded = sum(await asyncio.gather(*(
+        run_client(client, sources, args.requests, args.concurrency, latency)
+        for client in clients)))
+    elapsed = time.perf_counter() - started
+
+    server_stats = await clients[0].stats()
+    for client in clients:
+        await client.close()
+    if service is not None:
+        await service.close()
+
+    total = args.clients * args.requests
+    return {
+        "requests": total,
+        "succeeded": succeeded,
+        "seconds": elapsed,
+        "requests_per_second": round(total / elapsed),
+        "client_latency_ms": latency.snapshot(),
+        "server": {key: value for key, value in server_stats.items() if key != "id"},
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Generate load against the parse service.")
+    arg_parser.add_argument("--unix", help="connect to a running service on this socket")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int,
+        help="connect to a running service on this port; by default one is started in-process")
+    arg_parser.add_argument("--clients", type=int, default=4)
+    arg_parser.add_argument("--requests", type=int, default=500, help="requests per client")
+    arg_parser.add_argument("--concurrency", type=int, default=32,
+        help="requests in flight per client")
+    arg_parser.add_argument("--size", type=int, default=200, help="source size in bytes")
+    arg_parser.add_argument("--batch-size", type=int, default=64)
+    arg_parser.add_argument("--batch-delay", type=float, default=2.0, help="milliseconds")
+    args = arg_parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
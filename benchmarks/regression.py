@@ -0,0 +1,206 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from benchmarks.bench_parser import count_tokens, parse_statements, peak_memory
+from benchmarks.generator import generate_program
+from interpreter.parser import parse
+from interpreter.recognizer import validate
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# MAD times this estimates the standard deviation of normally distributed
+# timings.
+MAD_SIGMA = 1.4826
+
+# Peak memory must also grow by this many bytes to count, since the
+# streaming workloads peak at a few kilobytes.
+MEMORY_SLACK = 64 << 10
+
+
+def workloads():
+    # Fixed inputs, so that every run and every baseline measure the same
+    # work. Each entry maps a name to a function taking no arguments.
+    program = generate_program(100000, seed=0, max_depth=4)
+    nested = generate_program(50000, seed=1, max_depth=400)
+    chain = " + ".join(["x"] * 20000) + ";"
+    encoded = program.encode("ascii")
+    return {
+        "lexer.regex": lambda: count_tokens(program, "regex"),
+        "lexer.char": lambda: count_tokens(program, "char"),
+        "lexer.bytes": lambda: count_tokens(encoded, "bytes"),
+        "parser.program": lambda: parse_statements(program),
+        "parser.nested": lambda: parse(nested),
+        "parser.chain": lambda: parse(chain),
+        "recognizer.validate": lambda: validate(program),
+    }
+
+
+def calibrate():
+    # A fixed piece of interpreter-bound work, timed right before every
+    # workload sample. Dividing by it cancels most of the difference between
+    # a fast and a slow machine, and drift in clock speed during a run, so a
+    # baseline recorded on one box can gate another.
+    table = {chr(code): code for code in range(32, 127)}
+    text = "".join(table) * 40
+    total = 0
+    for _ in range(60):
+        for index in range(len(text)):
+            total += table.get(text[index], 0) & 7
+    return total
+
+
+def summarize(samples):
+    median = statistics.median(samples)
+    mad = statistics.median(abs(sample - median) for sample in samples)
+    return {"median": median, "mad": mad}
+
+
+def elapsed(function):
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def sample(function, repeat):
+    # Pairs of (calibration, workload) seconds.
+    function()
+    return [(elapsed(calibrate), elapsed(function)) for _ in range(repeat)]
+
+
+def measure(selected=None, repeat=7, memory=True):
+    functions = workloads()
+    if selected:
+        unknown = set(selected) - set(functions)
+        if unknown:
+            raise ValueError(f"Unknown workloads: {', '.join(sorted(unknown))}")
+        functions = {name: functions[name] for name in selected}
+
+    calibrate()
+    calibration = []
+    results = {}
+    for name, function in functions.items():
+        pairs = sample(function, repeat)
+        calibration.extend(scale for scale, _ in pairs)
+        timings = summarize([seconds for _, seconds in pairs])
+        normalized = summarize([seconds / scale for scale, seconds in pairs])
+        timings["normalized"] = normalized["median"]
+        timings["normalized_mad"] = normalized["mad"]
+        if memory:
+            timings["peak_memory_bytes"] = peak_memory(function)
+        results[name] = timings
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "calibration": summarize(calibration),
+        "workloads": results,
+    }
+
+
+def compare(baseline, current, threshold=0.1, memory_threshold=0.1, noise=3.0, raw=False):
+    # A workload regresses when its median is slower than the baseline by
+    # more than the threshold, and also by more than `noise` standard
+    # deviations, estimated from the larger of the two MADs. Returns one
+    # row per workload in the current run.
+    median, mad = ("median", "mad") if raw else ("normalized", "normalized_mad")
+    rows = []
+    for name, now in current["workloads"].items():
+        before = baseline["workloads"].get(name)
+        if before is None:
+            rows.append({"workload": name, "status": "new", "current": now[median]})
+            continue
+
+        change = now[median] / before[median] - 1
+        spread = noise * MAD_SIGMA * max(before[mad], now[mad])
+        slower = change > threshold and now[median] - before[median] > spread
+        row = {
+            "workload": name,
+            "baseline": before[median],
+            "current": now[median],
+            "change": change,
+            "status": "slower" if slower else "ok",
+        }
+
+        before_memory = before.get("peak_memory_bytes")
+        now_memory = now.get("peak_memory_bytes")
+        if before_memory and now_memory is not None:
+            row["memory_change"] = now_memory / before_memory - 1
+            if row["memory_change"] > memory_threshold \
+                    and now_memory - before_memory > MEMORY_SLACK:
+                row["status"] = "more memory" if row["status"] == "ok" else "slower, more memory"
+        rows.append(row)
+    return rows
+
+
+def format_rows(rows, raw=False):
+    unit = "seconds" if raw else "normalized"
+    lines = [f"{'workload':<24} {'baseline':>12} {'current':>12} {'time':>8} "
+        f"{'memory':>8}  status ({unit})"]
+    for row in rows:
+        baseline = f"{row['baseline']:.4f}" if "baseline" in row else "-"
+        change = f"{row['change']:+.1%}" if "change" in row else "-"
+        memory = f"{row['memory_change']:+.1%}" if "memory_change" in row else "-"
+        lines.append(f"{row['workload']:<24} {baseline:>12} {row['current']:>12.4f} "
+            f"{change:>8} {memory:>8}  {row['status']}")
+    return "\n".join(lines)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Compare lexer and parser speed and memory against a stored baseline.")
+    arg_parser.add_argument("--baseline", default=BASELINE)
+    arg_parser.add_argument("--update", action="store_true",
+        help="measure and write the baseline instead of comparing")
+    arg_parser.add_argument("--workloads", help="comma separated workload names")
+    arg_parser.add_argument("--repeat", type=int, default=7)
+    arg_parser.add_argument("--threshold", type=float, default=0.1,
+        help="allowed slowdown as a fraction of the baseline median")
+    arg_parser.add_argument("--memory-threshold", type=float, default=0.1,
+        help="allowed growth of peak memory as a fraction of the baseline")
+    arg_parser.add_argument("--noise", type=float, default=3.0,
+        help="standard deviations a slowdown must also exceed")
+    arg_parser.add_argument("--raw", action="store_true",
+        help="compare seconds instead of times normalized by the calibration loop")
+    arg_parser.add_argument("--no-memory", dest="memory", action="store_false")
+    arg_parser.add_argument("--output", help="also write the measurements to this file")
+    args = arg_parser.parse_args()
+
+    selected = args.workloads.split(",") if args.workloads else None
+    current = measure(selected, args.repeat, args.memory)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["python"] != current["python"] \
+            or baseline["implementation"] != current["implementation"]:
+        print(f"warning: baseline is from {baseline['implementation']} {baseline['python']}, "
+            f"running {current['implementation']} {current['python']}", file=sys.stderr)
+
+    rows = compare(baseline, current, args.threshold, args.memory_threshold, args.noise, args.raw)
+    print(format_rows(rows, args.raw))
+    failed = [row["workload"] for row in rows if row["status"] not in ("ok", "new")]
+    if failed:
+        print(f"Regressed: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
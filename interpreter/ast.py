@@ -1,21 +1,31 @@
 import interpreter.token as token
 from interpreter.token import Token
-from typing import List, Optional
+from typing import List, Optional, TextIO
 from abc import ABC, abstractmethod
 
 class Program:
+    __slots__ = ("statements",)
+    child_fields = ("statements",)
+
     def __init__(self):
         self.statements: List[Expression] = []
 
     def string(self):
-        return ''.join([s.string() for s in self.statements])
+        return "".join([statement.string() for statement in self.statements])
 
     def token_literal(self):
         if self.statements:
             return self.statements[0].token_literal()
         return ""
 
+    def children(self):
+        return tuple(statement for statement in self.statements if statement is not None)
+
 class Node(ABC):
+    __slots__ = ()
+    # Attributes holding child nodes, in source order.
+    child_fields = ()
+
     @abstractmethod
     def token_literal() -> str:
         ...
@@ -24,21 +34,36 @@ class Node(ABC):
     def string() -> str:
         ...
 
+    @property
+    def position(self) -> Optional[int]:
+        return self.token.position
+
+    def children(self) -> tuple:
+        return ()
+
 
 class Expression(Node):
+    __slots__ = ()
+
     def expression_node():
         ...
 
 
 class Statement(Node):
+    __slots__ = ()
+
     def statement_node():
         ...
 
 
 class Identifier(Expression):
+    __slots__ = ("token", "value", "depth", "slot")
+
     def __init__(self, token: Token, value: str):
         self.token = token
         self.value = value
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def __str__(self) -> str:
         return f"{self.token}, Value: {self.value}"
@@ -51,6 +76,9 @@ class Identifier(Expression):
 
 
 class LetStatement(Statement):
+    __slots__ = ("token", "name", "value")
+    child_fields = ("name", "value")
+
     def __init__(self, token: Token, 
         identifier: Optional[Identifier] = None, 
         expression: Optional[Expression] = None):
@@ -65,16 +93,21 @@ class LetStatement(Statement):
         return self.token.literal
 
     def string(self) -> str:
-        ret = self.token_literal() + " "
-        ret += self.name.string()
-        ret += " = "
-        if self.value:
-            ret += self.value.string()
-        ret += ";"
-        return ret
+        value = direct_string(self.value, DIRECT_DEPTH)
+        if value is None or self.name is None:
+            return to_string(self)
+        return f"{self.token.literal} {self.name.value} = {value};"
+
+    def children(self) -> tuple:
+        if self.name is None or self.value is None:
+            return tuple(child for child in (self.name, self.value) if child is not None)
+        return (self.name, self.value)
 
 
 class ReturnStatement(Statement):
+    __slots__ = ("token", "return_value")
+    child_fields = ("return_value",)
+
     def __init__(self, token: Token, 
         return_value: Optional[Expression] = None):
         self.token = token
@@ -87,14 +120,19 @@ class ReturnStatement(Statement):
         return self.token.literal
 
     def string(self) -> str:
-        ret = " "
-        if self.return_value:
-            ret += self.return_value.string()
-        ret += ";"
-        return ret
+        value = direct_string(self.return_value, DIRECT_DEPTH)
+        if value is None:
+            return to_string(self)
+        return f"{self.token.literal} {value};"
+
+    def children(self) -> tuple:
+        return (self.return_value,) if self.return_value is not None else ()
 
 
 class ExpressionStatement(Statement):
+    __slots__ = ("token", "expression")
+    child_fields = ("expression",)
+
     def __init__(self, token: Token, expression: Optional[Expression] = None):
         self.token = token
         self.expression = expression
@@ -106,12 +144,16 @@ class ExpressionStatement(Statement):
         return self.token.literal
 
     def string(self) -> str:
-        if self.expression:
-            return self.expression.string()
-        return ""
+        text = direct_string(self.expression, DIRECT_DEPTH)
+        return to_string(self) if text is None else text
+
+    def children(self) -> tuple:
+        return (self.expression,) if self.expression is not None else ()
 
 
 class  IntegerLiteral(Expression):
+    __slots__ = ("token", "value")
+
     def __init__(self, token: Token, value: Optional[int] = None):
         self.token = token
         self.value = value
@@ -127,6 +169,9 @@ class  IntegerLiteral(Expression):
 
 
 class PrefixExpression(Expression):
+    __slots__ = ("token", "operator", "right")
+    child_fields = ("right",)
+
     def __init__(self, token: Token, operator: str, right: Optional[Expression] = None):
         self.token = token
         self.operator = operator
@@ -136,9 +181,16 @@ class PrefixExpression(Expression):
         return self.token.literal
 
     def string(self):
-        return f"({self.operator}{self.right.string()})"
+        text = direct_string(self, DIRECT_DEPTH)
+        return to_string(self) if text is None else text
+
+    def children(self):
+        return (self.right,) if self.right is not None else ()
 
 class InfixExpression(Expression):
+    __slots__ = ("token", "left", "operator", "right")
+    child_fields = ("left", "right")
+
     def __init__(self, 
         token: Token, 
         left: Expression, 
@@ -149,14 +201,29 @@ class InfixExpression(Expression):
         self.operator = operator
         self.right = right
 
+    @property
+    def position(self) -> Optional[int]:
+        node = self
+        while isinstance(node, InfixExpression) and node.left is not None:
+            node = node.left
+        return node.token.position
+
     def token_literal(self):
         return self.token.literal
 
     def string(self):
-        return f"({self.left.string()} {self.operator} {self.right.string()})"
+        text = direct_string(self, DIRECT_DEPTH)
+        return to_string(self) if text is None else text
+
+    def children(self):
+        if self.left is None or self.right is None:
+            return tuple(child for child in (self.left, self.right) if child is not None)
+        return (self.left, self.right)
 
 
 class Boolean(Expression):
+    __slots__ = ("token", "value")
+
     def __init__(self, token: Token, value: bool):
         self.token = token
         self.value = value
@@ -165,4 +232,133 @@ class Boolean(Expression):
         return self.token.literal
 
     def string(self):
-        return self.token.literal
\ No newline at end of file
+        return self.token.literal
+
+# Expressions up to this deep are printed by direct recursion, which is
+# faster than the stack in write() for the shallow trees most code has.
+DIRECT_DEPTH = 32
+
+
+def direct_string(node, depth: int) -> Optional[str]:
+    # The text of an expression, or None when it is deeper than depth, in
+    # which case write() prints it instead. Missing expressions print as
+    # nothing, as in write().
+    node_type = type(node)
+    if node_type is Identifier:
+        return node.value
+    if node_type is IntegerLiteral or node_type is Boolean:
+        return node.token.literal
+    if node is None:
+        return ""
+    if depth == 0:
+        return None
+    if node_type is InfixExpression:
+        left = direct_string(node.left, depth - 1)
+        if left is None:
+            return None
+        right = direct_string(node.right, depth - 1)
+        if right is None:
+            return None
+        return f"({left} {node.operator} {right})"
+    if node_type is PrefixExpression:
+        right = direct_string(node.right, depth - 1)
+        if right is None:
+            return None
+        return f"({node.operator}{right})"
+    return None
+
+
+WRITE_BUFFER_PIECES = 4096
+
+
+def write(node, stream: Optional[TextIO] = None) -> List[str]:
+    # Walks the tree with an explicit stack of nodes and pending text, so
+    # the output of arbitrarily deep trees matches string() without
+    # recursion. Missing children print as nothing. With a stream the text
+    # is written out in batches, otherwise the pieces are returned.
+    pieces: List[str] = []
+    out = pieces.append
+    stack = [node]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        item = pop()
+        item_type = type(item)
+        if item_type is str:
+            out(item)
+        elif item_type is InfixExpression:
+            # Leaf operands are printed in place, which saves a trip through
+            # the stack for most nodes.
+            left = item.left
+            right = item.right
+            right_type = type(right)
+            if right_type is Identifier:
+                right_text = right.value
+            elif right_type is IntegerLiteral or right_type is Boolean:
+                right_text = right.token.literal
+            else:
+                right_text = None
+            left_type = type(left)
+            if left_type is Identifier:
+                left_text = left.value
+            elif left_type is IntegerLiteral or left_type is Boolean:
+                left_text = left.token.literal
+            else:
+                left_text = None
+
+            if right_text is None:
+                push(")")
+                push(right)
+                right_text = f" {item.operator} "
+            else:
+                right_text = f" {item.operator} {right_text})"
+            if left_text is None:
+                out("(")
+                push(right_text)
+                push(left)
+            else:
+                out(f"({left_text}{right_text}")
+        elif item_type is Identifier:
+            out(item.value)
+        elif item_type is IntegerLiteral or item_type is Boolean:
+            out(item.token.literal)
+        elif item_type is PrefixExpression:
+            right = item.right
+            right_type = type(right)
+            if right_type is Identifier:
+                out(f"({item.operator}{right.value})")
+            elif right_type is IntegerLiteral or right_type is Boolean:
+                out(f"({item.operator}{right.token.literal})")
+            else:
+                out("(" + item.operator)
+                push(")")
+                push(right)
+        elif item_type is ExpressionStatement:
+            push(item.expression)
+        elif item_type is LetStatement:
+            out(item.token.literal + " ")
+            push(";")
+            push(item.value)
+            push(" = ")
+            push(item.name)
+        elif item_type is ReturnStatement:
+            out(item.token.literal + " ")
+            push(";")
+            push(item.return_value)
+        elif item_type is Program:
+            stack.extend(reversed(item.statements))
+        elif item is not None:
+            out(item.string())
+
+        if stream is not None and len(pieces) >= WRITE_BUFFER_PIECES:
+            stream.write("".join(pieces))
+            pieces.clear()
+
+    if stream is not None:
+        stream.write("".join(pieces))
+        pieces.clear()
+    return pieces
+
+
+def to_string(node) -> str:
+    return "".join(write(node))
@@ -0,0 +1,63 @@
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from interpreter.parser import parse
+from interpreter.serialize import dumps, loads
+
+
+class BatchResult(namedtuple("BatchResult", ["path", "data", "errors"])):
+    # data is None when the file could not be read; errors then holds the
+    # reason instead of parser errors.
+    __slots__ = ()
+
+    @property
+    def program(self):
+        return None if self.data is None else loads(self.data)
+
+
+def parse_file(path, encoding="utf-8"):
+    try:
+        with open(path, encoding=encoding) as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return BatchResult(path, None, [f"Cannot read {path}: {e}"])
+    result = parse(source)
+    return BatchResult(path, dumps(result.program), result.errors)
+
+
+def parse_chunk(paths, encoding="utf-8"):
+    return [parse_file(path, encoding) for path in paths]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_many(paths, workers=None, chunk_size=16, encoding="utf-8"):
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(paths, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from parse_chunk(chunk, encoding)
+        return
+
+    # Only a few chunks per worker are queued at a time, so results stream
+    # back while the rest of paths is still being consumed.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in islice(chunks, workers * 2):
+            pending.add(executor.submit(parse_chunk, chunk, encoding))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for chunk in islice(chunks, 1):
+                    pending.add(executor.submit(parse_chunk, chunk, encoding))
+                yield from future.result()
@@ -0,0 +1,125 @@
+import re
+import interpreter.token as token
+from interpreter.position import LineIndex
+from interpreter.token import Token
+
+OTHER = 0
+LETTER = 1
+DIGIT = 2
+SPACE = 3
+
+
+def _byte_classes():
+    classes = bytearray(256)
+    for byte in b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ":
+        classes[byte] = LETTER
+    for byte in b"0123456789":
+        classes[byte] = DIGIT
+    for byte in b" \t\n\r":
+        classes[byte] = SPACE
+    return bytes(classes)
+
+
+BYTE_CLASSES = _byte_classes()
+
+# Single-byte symbols, indexed by byte value. The literal of every symbol
+# token is one of these shared strings.
+SYMBOL_TOKENS = [None] * 256
+for _symbol, _type in {**token.operators, **token.delimiters}.items():
+    if len(_symbol) == 1:
+        SYMBOL_TOKENS[ord(_symbol)] = (_type, _symbol)
+
+EQUALS = ord("=")
+# First byte of a two-byte operator ending in "=".
+DOUBLE_TOKENS = {ord("="): (token.EQ, "=="), ord("!"): (token.NOT_EQ, "!=")}
+
+KEYWORDS = {word.encode("ascii"): (type, word) for word, type in token.keywords.items()}
+LONGEST_KEYWORD = max(len(word) for word in KEYWORDS)
+
+NEWLINE_BYTES = re.compile(b"\n")
+
+
+class OffsetToken(Token):
+    # Identifiers and integers keep their offsets into the source and only
+    # decode their text when the literal is read.
+    __slots__ = ("source", "end")
+
+    def __init__(self, type, source, start, end):
+        self.type = type
+        self.source = source
+        self.position = start
+        self.end = end
+
+    @property
+    def literal(self):
+        return str(self.source[self.position:self.end], "ascii")
+
+    def decoded(self):
+        # A plain Token with the same text, which does not keep the source
+        # alive. The parser keeps these in nodes.
+        return Token(self.type, self.literal, self.position)
+
+
+class ByteLexer:
+    # Lexes ASCII source held in bytes, or in a bytearray, mmap or any other
+    # buffer through a memoryview, so the input is never copied. Bytes
+    # outside ASCII are ILLEGAL tokens. Identifier and integer tokens refer
+    # to the buffer until the parser decodes them into a node, so trees do
+    # not: it can be closed or changed once parsing is done.
+    def __init__(self, source):
+        self.data = source if type(source) is bytes else memoryview(source).cast("B")
+        self.offset = 0
+
+    def __iter__(self):
+        while True:
+            tok = self.next_token()
+            if tok.type == token.EOF:
+                return
+            yield tok
+
+    def line_index(self):
+        line_starts = [0]
+        line_starts.extend(newline.end() for newline in NEWLINE_BYTES.finditer(self.data))
+        return LineIndex(line_starts=line_starts)
+
+    def next_token(self):
+        data = self.data
+        classes = BYTE_CLASSES
+        length = len(data)
+        start = self.offset
+
+        while start < length and classes[data[start]] == SPACE:
+            start += 1
+        if start >= length:
+            self.offset = start
+            return Token(token.EOF, '', length)
+
+        byte = data[start]
+        byte_class = classes[byte]
+        end = start + 1
+        if byte_class == LETTER:
+            while end < length and classes[data[end]] == LETTER:
+                end += 1
+            self.offset = end
+            if end - start <= LONGEST_KEYWORD:
+                keyword = KEYWORDS.get(bytes(data[start:end]))
+                if keyword is not None:
+                    return Token(keyword[0], keyword[1], start)
+            return OffsetToken(token.IDENT, data, start, end)
+
+        if byte_class == DIGIT:
+            while end < length and classes[data[end]] == DIGIT:
+                end += 1
+            self.offset = end
+            return OffsetToken(token.INT, data, start, end)
+
+        double = DOUBLE_TOKENS.get(byte)
+        if double is not None and end < length and data[end] == EQUALS:
+            self.offset = end + 1
+            return Token(double[0], double[1], start)
+
+        self.offset = end
+        symbol = SYMBOL_TOKENS[byte]
+        if symbol is not None:
+            return Token(symbol[0], symbol[1], start)
+        return Token(token.ILLEGAL, chr(byte), start)
@@ -0,0 +1,120 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from interpreter.parser import parse
+from interpreter.serialize import FormatError, dumps, loads_result
+
+
+def source_key(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    # Cached programs are shared between callers and must be treated as
+    # read-only. max_source_bytes bounds the total size of the cached
+    # sources, not of their trees, which take roughly ten times as much
+    # memory. The directory store is best-effort: entries that cannot be
+    # read or written are parsed again.
+    def __init__(self, max_entries=1024, max_source_bytes=64 << 20, directory=None):
+        self.max_entries = max_entries
+        self.max_source_bytes = max_source_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, source):
+        return source_key(source) in self.entries
+
+    def parse(self, source):
+        key = source_key(source)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        result = self.load(key)
+        if result is not None:
+            with self.lock:
+                self.disk_hits += 1
+        else:
+            result = parse(source)
+            self.store(key, result)
+            with self.lock:
+                self.misses += 1
+
+        with self.lock:
+            self.insert(key, result, len(source.encode("utf-8")))
+        return result
+
+    def insert(self, key, result, size):
+        if key in self.entries:
+            return
+        self.entries[key] = (result, size)
+        self.size += size
+        while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_source_bytes):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "source_bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+        }
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), "rb") as f:
+                return loads_result(f.read())
+        except (OSError, FormatError):
+            return None
+
+    def store(self, key, result):
+        if self.directory is None:
+            return
+        path = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(result.program, result.errors))
+            os.replace(tmp_path, path)
+        except BaseException as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            if not isinstance(e, OSError):
+                raise
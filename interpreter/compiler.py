@@ -0,0 +1,159 @@
+from array import array
+from collections import namedtuple
+from interpreter.ast import (
+    Boolean,
+    ExpressionStatement,
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    ReturnStatement,
+)
+
+OP_CONSTANT = 0
+OP_TRUE = 1
+OP_FALSE = 2
+OP_NULL = 3
+OP_ADD = 4
+OP_SUB = 5
+OP_MUL = 6
+OP_DIV = 7
+OP_EQUAL = 8
+OP_NOT_EQUAL = 9
+OP_LESS_THAN = 10
+OP_GREATER_THAN = 11
+OP_MINUS = 12
+OP_BANG = 13
+OP_POP = 14
+OP_SET_GLOBAL = 15
+OP_GET_GLOBAL = 16
+OP_RETURN_VALUE = 17
+
+OPCODE_NAMES = {
+    value: name for name, value in globals().items() if name.startswith("OP_")
+}
+
+# Opcodes followed by one operand word.
+OPERAND_OPCODES = {OP_CONSTANT, OP_SET_GLOBAL, OP_GET_GLOBAL}
+
+INFIX_OPCODES = {
+    "+": OP_ADD,
+    "-": OP_SUB,
+    "*": OP_MUL,
+    "/": OP_DIV,
+    "==": OP_EQUAL,
+    "!=": OP_NOT_EQUAL,
+    "<": OP_LESS_THAN,
+    ">": OP_GREATER_THAN,
+}
+
+PREFIX_OPCODES = {
+    "-": OP_MINUS,
+    "!": OP_BANG,
+}
+
+Bytecode = namedtuple("Bytecode", ["instructions", "constants", "names"])
+
+
+class CompilationError(Exception):
+    pass
+
+
+class Compiler:
+    def __init__(self):
+        self.instructions = array('I')
+        self.constants = []
+        self.constant_indexes = {}
+        self.names = []
+        self.symbols = {}
+
+    def bytecode(self):
+        return Bytecode(self.instructions, self.constants, self.names)
+
+    def compile(self, program):
+        emit = self.instructions.append
+        for statement in program.statements:
+            if isinstance(statement, ExpressionStatement):
+                self.compile_expression(statement.expression)
+                emit(OP_POP)
+            elif isinstance(statement, LetStatement):
+                self.compile_expression(statement.value)
+                emit(OP_SET_GLOBAL)
+                emit(self.symbol(statement.name.value))
+            elif isinstance(statement, ReturnStatement):
+                self.compile_expression(statement.return_value)
+                emit(OP_RETURN_VALUE)
+            else:
+                raise CompilationError(f"cannot compile {type(statement).__name__}")
+        return self.bytecode()
+
+    def symbol(self, name):
+        index = self.symbols.get(name)
+        if index is None:
+            index = self.symbols[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def constant(self, value):
+        index = self.constant_indexes.get(value)
+        if index is None:
+            index = self.constant_indexes[value] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def compile_expression(self, expression):
+        # Post-order emission with an explicit stack, like the evaluator.
+        emit = self.instructions.append
+        work = [(expression, False)]
+        while work:
+            node, operands_done = work.pop()
+            node_type = type(node)
+            if node_type is IntegerLiteral:
+                emit(OP_CONSTANT)
+                emit(self.constant(node.value))
+            elif node_type is Boolean:
+                emit(OP_TRUE if node.value else OP_FALSE)
+            elif node_type is Identifier:
+                emit(OP_GET_GLOBAL)
+                emit(self.symbol(node.value))
+            elif node_type is InfixExpression:
+                if operands_done:
+                    emit(INFIX_OPCODES[node.operator])
+                elif node.operator not in INFIX_OPCODES:
+                    raise CompilationError(f"unknown operator {node.operator}")
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+            elif node_type is PrefixExpression:
+                if operands_done:
+                    emit(PREFIX_OPCODES[node.operator])
+                elif node.operator not in PREFIX_OPCODES:
+                    raise CompilationError(f"unknown operator {node.operator}")
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+            elif node is None:
+                emit(OP_NULL)
+            else:
+                raise CompilationError(f"cannot compile {node_type.__name__}")
+
+
+def compile_program(program):
+    return Compiler().compile(program)
+
+
+def disassemble(instructions):
+    lines = []
+    ip = 0
+    while ip < len(instructions):
+        opcode = instructions[ip]
+        name = OPCODE_NAMES[opcode]
+        if opcode in OPERAND_OPCODES:
+            lines.append(f"{ip:04d} {name} {instructions[ip + 1]}")
+            ip += 2
+        else:
+            lines.append(f"{ip:04d} {name}")
+            ip += 1
+    return "\n".join(lines)
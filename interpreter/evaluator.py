@@ -0,0 +1,219 @@
+from interpreter.ast import (
+    Boolean,
+    ExpressionStatement,
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    ReturnStatement,
+)
+
+
+class EvaluationError(Exception):
+    pass
+
+
+UNSET = object()
+
+
+def type_name(value):
+    if value is None:
+        return "NULL"
+    if value is True or value is False:
+        return "BOOLEAN"
+    return "INTEGER"
+
+
+def is_integer(value):
+    return type(value) is int
+
+
+def divide(left, right):
+    if right == 0:
+        raise EvaluationError("division by zero")
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+INTEGER_OPERATORS = {
+    "+": lambda left, right: left + right,
+    "-": lambda left, right: left - right,
+    "*": lambda left, right: left * right,
+    "/": divide,
+    "<": lambda left, right: left < right,
+    ">": lambda left, right: left > right,
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+}
+
+
+def eval_prefix(operator, right):
+    if operator == "!":
+        return right is False or right is None
+    if operator == "-":
+        if not is_integer(right):
+            raise EvaluationError(f"unknown operator: -{type_name(right)}")
+        return -right
+    raise EvaluationError(f"unknown operator: {operator}{type_name(right)}")
+
+
+def eval_infix(operator, left, right):
+    if is_integer(left) and is_integer(right):
+        apply = INTEGER_OPERATORS.get(operator)
+        if apply is not None:
+            return apply(left, right)
+    elif operator == "==":
+        return type(left) is type(right) and left == right
+    elif operator == "!=":
+        return type(left) is not type(right) or left != right
+    elif type(left) is not type(right):
+        raise EvaluationError(
+            f"type mismatch: {type_name(left)} {operator} {type_name(right)}")
+    raise EvaluationError(
+        f"unknown operator: {type_name(left)} {operator} {type_name(right)}")
+
+
+class Scope:
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.slots = {}
+
+    def declare(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.slots)
+        return slot
+
+    def lookup(self, name):
+        scope = self
+        depth = 0
+        while scope is not None:
+            slot = scope.slots.get(name)
+            if slot is not None:
+                return depth, slot
+            scope = scope.parent
+            depth += 1
+        return None, None
+
+
+class Resolver:
+    def __init__(self, scope=None):
+        self.scope = scope or Scope()
+
+    def resolve(self, program):
+        # Declarations are collected first so that a use before the let
+        # still resolves to the slot and fails at runtime as it would with
+        # name lookup.
+        for statement in program.statements:
+            if isinstance(statement, LetStatement) and statement.name is not None:
+                self.scope.declare(statement.name.value)
+
+        stack = list(program.statements)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Identifier):
+                node.depth, node.slot = self.scope.lookup(node.value)
+            elif isinstance(node, InfixExpression):
+                stack.append(node.left)
+                stack.append(node.right)
+            elif isinstance(node, PrefixExpression):
+                stack.append(node.right)
+            elif isinstance(node, LetStatement):
+                stack.append(node.name)
+                stack.append(node.value)
+            elif isinstance(node, ReturnStatement):
+                stack.append(node.return_value)
+            elif isinstance(node, ExpressionStatement):
+                stack.append(node.expression)
+        return self.scope
+
+
+class ReturnValue(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class Evaluator:
+    def __init__(self):
+        self.scope = Scope()
+        self.frames = [[]]
+
+    def evaluate(self, program):
+        self.resolve(program)
+        return self.run(program)
+
+    def resolve(self, program):
+        Resolver(self.scope).resolve(program)
+        frame = self.frames[-1]
+        frame.extend([UNSET] * (len(self.scope.slots) - len(frame)))
+
+    def run(self, program):
+        result = None
+        try:
+            for statement in program.statements:
+                result = self.eval_statement(statement)
+        except ReturnValue as returned:
+            return returned.value
+        return result
+
+    def eval_statement(self, statement):
+        if isinstance(statement, ExpressionStatement):
+            return self.eval_expression(statement.expression)
+        if isinstance(statement, LetStatement):
+            value = self.eval_expression(statement.value)
+            name = statement.name
+            self.frames[-1 - name.depth][name.slot] = value
+            return None
+        if isinstance(statement, ReturnStatement):
+            raise ReturnValue(self.eval_expression(statement.return_value))
+        raise EvaluationError(f"cannot evaluate {type(statement).__name__}")
+
+    def lookup(self, identifier):
+        if identifier.slot is not None:
+            value = self.frames[-1 - identifier.depth][identifier.slot]
+            if value is not UNSET:
+                return value
+        raise EvaluationError(f"identifier not found: {identifier.value}")
+
+    def eval_expression(self, expression):
+        # Post-order walk with explicit stacks, so that long operator chains
+        # do not run into the recursion limit. A node is pushed a second time
+        # (paired with True) once its operands have been scheduled.
+        frames = self.frames
+        values = []
+        work = [(expression, False)]
+        while work:
+            node, operands_ready = work.pop()
+            node_type = type(node)
+            if node_type is IntegerLiteral or node_type is Boolean:
+                values.append(node.value)
+            elif node_type is Identifier:
+                if node.slot is None:
+                    values.append(self.lookup(node))
+                else:
+                    value = frames[-1 - node.depth][node.slot]
+                    values.append(value if value is not UNSET else self.lookup(node))
+            elif node_type is InfixExpression:
+                if operands_ready:
+                    right = values.pop()
+                    values.append(eval_infix(node.operator, values.pop(), right))
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+            elif node_type is PrefixExpression:
+                if operands_ready:
+                    values.append(eval_prefix(node.operator, values.pop()))
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+            elif node is None:
+                values.append(None)
+            else:
+                raise EvaluationError(f"cannot evaluate {node_type.__name__}")
+        return values.pop()
+
+
+def evaluate(program):
+    return Evaluator().evaluate(program)
@@ -0,0 +1,181 @@
+from bisect import bisect_left, bisect_right
+import interpreter.token as token
+from interpreter.ast import Program
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser, located_message
+from interpreter.position import LineIndex
+
+
+class StatementRecord:
+    __slots__ = ("statement", "start", "tokens", "errors")
+
+    def __init__(self, statement, start, tokens, errors):
+        self.statement = statement
+        self.start = start
+        self.tokens = tokens
+        self.errors = errors
+
+
+class RecordingParser(Parser):
+    def __init__(self, lexer):
+        self.record = None
+        super().__init__(lexer)
+
+    def next_token(self):
+        if self.record is not None:
+            self.record.tokens.append(self.cur_token)
+        super().next_token()
+
+    def error(self, message, tok):
+        self.record.errors.append((message, tok.position))
+
+    def parse_records(self, resync=None):
+        records = []
+        while self.cur_token.type != token.EOF:
+            start = self.cur_token.position
+            if resync is not None and resync(start):
+                break
+            self.record = StatementRecord(None, start, [], [])
+            self.record.statement = self.parse_statement()
+            self.next_token()
+            records.append(self.record)
+        return records
+
+
+class ParsedDocument:
+    def __init__(self, source, records, shift_starts=(), shift_totals=()):
+        self.source = source
+        self.records = records
+        # Offsets not yet added to the positions in records: the records
+        # from shift_starts[k] up to the next entry are shift_totals[k] off.
+        # Edits only update these, and the first read of program or errors
+        # applies them.
+        self.shift_starts = list(shift_starts)
+        self.shift_totals = list(shift_totals)
+        self._program = None
+        self._errors = None
+
+    def shift(self, index):
+        entry = bisect_right(self.shift_starts, index)
+        return self.shift_totals[entry - 1] if entry else 0
+
+    def start(self, index):
+        return self.records[index].start + self.shift(index)
+
+    def apply_shifts(self):
+        ends = self.shift_starts[1:] + [len(self.records)]
+        for first, end, delta in zip(self.shift_starts, ends, self.shift_totals):
+            if not delta:
+                continue
+            for record in self.records[first:end]:
+                record.start += delta
+                for tok in record.tokens:
+                    tok.position += delta
+                record.errors = [(message, position + delta) for message, position in record.errors]
+        self.shift_starts.clear()
+        self.shift_totals.clear()
+
+    @property
+    def program(self):
+        if self._program is None:
+            self.apply_shifts()
+            self._program = Program()
+            self._program.statements = [
+                record.statement for record in self.records if record.statement is not None
+            ]
+        return self._program
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            self.apply_shifts()
+            line_index = LineIndex(self.source)
+            self._errors = [
+                located_message(message, line_index.location(position))
+                for record in self.records
+                for message, position in record.errors
+            ]
+        return self._errors
+
+
+def parse_document(source):
+    parser = RecordingParser(Lexer(source, engine="regex"))
+    return ParsedDocument(source, parser.parse_records())
+
+
+def apply_edits(source, edits):
+    pieces = []
+    offset = 0
+    for start, end, replacement in edits:
+        if start < offset or end < start or end > len(source):
+            raise ValueError(f"Invalid or overlapping edit ({start}, {end})")
+        pieces.append(source[offset:start])
+        pieces.append(replacement)
+        offset = end
+    pieces.append(source[offset:])
+    return "".join(pieces)
+
+
+def reparse(document, edits):
+    # Reuses the statements of document that the edits cannot have
+    # affected. Their tokens are shifted in place when the new document is
+    # first read, so document must not be used afterwards.
+    edits = sorted(edits, key=lambda edit: edit[0])
+    if not edits:
+        return document
+
+    source = apply_edits(document.source, edits)
+    edit_start = edits[0][0]
+    edit_end = max(end for _, end, _ in edits)
+    delta = len(source) - len(document.source)
+    new_edit_end = edit_end + delta
+
+    records = document.records
+    indices = range(len(records))
+    start = document.start
+
+    # A statement's parse depends on its own tokens and on the first token
+    # of the next statement, so reparsing starts two statements before the
+    # first one that begins at or after the edit.
+    restart = max(0, bisect_left(indices, edit_start, key=start) - 2)
+    restart_offset = start(restart) if restart else 0
+
+    reuse_from = len(records)
+
+    def resync(position):
+        nonlocal reuse_from
+        if position < new_edit_end:
+            return False
+        index = bisect_left(indices, position - delta, key=start)
+        if index == len(records) or start(index) != position - delta:
+            return False
+        reuse_from = index
+        return True
+
+    parser = RecordingParser(Lexer(source, readPostion=restart_offset, engine="regex"))
+    reparsed = parser.parse_records(resync)
+
+    # The shifts before the restart carry over, the reparsed records are
+    # exact, and the reused ones move by delta on top of what they had.
+    shift_starts = []
+    shift_totals = []
+    for first, total in zip(document.shift_starts, document.shift_totals):
+        if first < restart:
+            shift_starts.append(first)
+            shift_totals.append(total)
+    if shift_totals and shift_totals[-1]:
+        shift_starts.append(restart)
+        shift_totals.append(0)
+    reused_from = restart + len(reparsed)
+    if reuse_from < len(records):
+        total = document.shift(reuse_from) + delta
+        if total:
+            shift_starts.append(reused_from)
+            shift_totals.append(total)
+        for first, total in zip(document.shift_starts, document.shift_totals):
+            if first > reuse_from:
+                shift_starts.append(first - reuse_from + reused_from)
+                shift_totals.append(total + delta)
+
+    return ParsedDocument(source, records[:restart] + reparsed + records[reuse_from:],
+        shift_starts, shift_totals)
@@ -0,0 +1,185 @@
+import time
+import tracemalloc
+from collections import Counter, namedtuple
+from functools import partial
+from interpreter.lexer import Lexer
+from interpreter.parser import ParseResult, Parser
+from interpreter.walk import walk
+
+STATEMENT_FUNCTIONS = (
+    "parse_statement",
+    "parse_let_statement",
+    "parse_return_statement",
+    "parse_expression_statement",
+)
+
+FunctionStats = namedtuple("FunctionStats", ["calls", "total_ns", "self_ns"])
+
+
+class Report:
+    def __init__(self, functions, token_counts, token_ns, max_expression_depth,
+                 nodes, allocated_bytes, stacks):
+        self.functions = functions
+        self.token_counts = token_counts
+        self.token_ns = token_ns
+        self.max_expression_depth = max_expression_depth
+        self.nodes = nodes
+        self.allocated_bytes = allocated_bytes
+        self.stacks = stacks
+
+    @property
+    def tokens(self):
+        return sum(self.token_counts.values())
+
+    def collapsed(self):
+        # One "frame;frame;frame microseconds" line per distinct stack, the
+        # input format of flamegraph.pl and speedscope.
+        return "".join(f"{stack} {max(1, ns // 1000)}\n"
+            for stack, ns in sorted(self.stacks.items()))
+
+    def dump_collapsed(self, stream):
+        stream.write(self.collapsed())
+
+    def format(self):
+        lines = [f"{'function':<32} {'calls':>10} {'total ms':>10} {'self ms':>10}"]
+        for name, stats in sorted(self.functions.items(), key=lambda item: -item[1].total_ns):
+            lines.append(f"{name:<32} {stats.calls:>10} "
+                f"{stats.total_ns / 1e6:>10.3f} {stats.self_ns / 1e6:>10.3f}")
+        lines.append("")
+        lines.append(f"{'token':<32} {'count':>10} {'total ms':>10}")
+        for token_type, count in self.token_counts.most_common():
+            lines.append(f"{token_type:<32} {count:>10} {self.token_ns[token_type] / 1e6:>10.3f}")
+        lines.append("")
+        lines.append(f"tokens: {self.tokens}")
+        lines.append(f"max expression depth: {self.max_expression_depth}")
+        lines.append("nodes: " + ", ".join(f"{name} {count}"
+            for name, count in self.nodes.most_common()))
+        if self.allocated_bytes is not None:
+            lines.append(f"peak allocated bytes: {self.allocated_bytes}")
+        return "\n".join(lines)
+
+
+class Instrumentation:
+    # Instrumentation replaces the hooks on one lexer and parser instance
+    # only, so the classes, and every other instance, run unchanged. The
+    # iterative fast path in parse_expression recognises the class's own
+    # parse functions, so wrapped prefix and infix functions are called
+    # recursively instead and very deep expressions can hit the recursion
+    # limit while instrumented.
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stack = []
+        self.child_ns = [0]
+        self.calls = Counter()
+        self.total_ns = Counter()
+        self.self_ns = Counter()
+        self.stacks = Counter()
+        self.token_counts = Counter()
+        self.token_ns = Counter()
+        self.nodes = Counter()
+        self.expression_functions = set()
+        self.expression_depth = 0
+        self.max_expression_depth = 0
+        self.allocated_bytes = None
+
+    def wrap(self, name, function):
+        stack = self.stack
+        child_ns = self.child_ns
+        expression = name in self.expression_functions
+        perf_counter_ns = time.perf_counter_ns
+
+        def wrapper(*args):
+            stack.append(name)
+            child_ns.append(0)
+            if expression:
+                self.expression_depth += 1
+                if self.expression_depth > self.max_expression_depth:
+                    self.max_expression_depth = self.expression_depth
+            start = perf_counter_ns()
+            try:
+                result = function(*args)
+            finally:
+                elapsed = perf_counter_ns() - start
+                children = child_ns.pop()
+                child_ns[-1] += elapsed
+                self.record(name, elapsed, elapsed - children)
+                stack.pop()
+                if expression:
+                    self.expression_depth -= 1
+            return result
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def record(self, name, elapsed, own):
+        self.calls[name] += 1
+        self.total_ns[name] += elapsed
+        self.self_ns[name] += own
+        self.stacks[";".join(self.stack)] += own
+
+    def count_nodes(self, program):
+        nodes = self.nodes
+        for statement in program.statements:
+            for node in walk(statement):
+                nodes[type(node).__name__] += 1
+
+    def instrument_lexer(self, lexer):
+        next_token = self.wrap("next_token", lexer.next_token)
+        token_counts = self.token_counts
+        token_ns = self.token_ns
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed_next_token():
+            start = perf_counter_ns()
+            tok = next_token()
+            token_counts[tok.type] += 1
+            token_ns[tok.type] += perf_counter_ns() - start
+            return tok
+
+        lexer.next_token = timed_next_token
+        return lexer
+
+    def instrument_parser(self, parser):
+        for functions in (parser.prefix_parse_fns, parser.infix_parse_fns):
+            for token_type, function in functions.items():
+                self.expression_functions.add(function.__name__)
+        # Table functions take the parser first, registered ones do not.
+        for token_type, function in parser.prefix_parse_fns.items():
+            parser.register_prefix(token_type,
+                self.wrap(function.__name__, partial(function, parser)))
+        for token_type, function in parser.infix_parse_fns.items():
+            parser.register_infix(token_type,
+                self.wrap(function.__name__, partial(function, parser)))
+
+        for name in STATEMENT_FUNCTIONS:
+            setattr(parser, name, self.wrap(name, getattr(parser, name)))
+        parser.parse_program = self.wrap("parse_program", parser.parse_program)
+        return parser
+
+    def parse(self, source, engine="regex"):
+        lexer = self.instrument_lexer(Lexer(source, engine=engine))
+        if self.memory:
+            tracemalloc.start()
+        try:
+            parser = self.instrument_parser(Parser(lexer))
+            program = parser.parse_program()
+            if self.memory:
+                self.allocated_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            if self.memory:
+                tracemalloc.stop()
+        self.count_nodes(program)
+        return ParseResult(program, parser.errors)
+
+    def report(self):
+        functions = {name: FunctionStats(self.calls[name], self.total_ns[name], self.self_ns[name])
+            for name in self.calls}
+        return Report(functions, Counter(self.token_counts), Counter(self.token_ns),
+            self.max_expression_depth, Counter(self.nodes), self.allocated_bytes,
+            dict(self.stacks))
+
+
+def profile(source, engine="regex", memory=False):
+    instrumentation = Instrumentation(memory)
+    result = instrumentation.parse(source, engine)
+    return result, instrumentation.report()
@@ -0,0 +1,66 @@
+import sys
+import interpreter.token as token
+from interpreter.ast import Boolean, Identifier, InfixExpression, IntegerLiteral, PrefixExpression
+
+
+class Interner:
+    # Hands out one shared node per identifier name, integer literal and
+    # boolean, and with share_subtrees one per structurally identical
+    # prefix or infix expression. Shared nodes keep the token, and so the
+    # position, of their first occurrence, and must not be changed in
+    # place: analyses that rewrite nodes, like the optimizer, need an
+    # unshared tree. An interner can be reused across parses.
+    def __init__(self, share_subtrees=False):
+        self.share_subtrees = share_subtrees
+        self.identifiers = {}
+        self.integers = {}
+        self.booleans = {}
+        self.subtrees = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.identifiers) + len(self.integers) + len(self.booleans) + len(self.subtrees)
+
+    def identifier(self, tok):
+        node = self.identifiers.get(tok.literal)
+        if node is None:
+            name = sys.intern(tok.literal)
+            node = self.identifiers[name] = Identifier(tok, name)
+        else:
+            self.hits += 1
+        return node
+
+    def integer(self, tok):
+        node = self.integers.get(tok.literal)
+        if node is None:
+            node = self.integers[tok.literal] = IntegerLiteral(tok, int(tok.literal))
+        else:
+            self.hits += 1
+        return node
+
+    def boolean(self, tok):
+        node = self.booleans.get(tok.type)
+        if node is None:
+            node = self.booleans[tok.type] = Boolean(tok, tok.type == token.TRUE)
+        else:
+            self.hits += 1
+        return node
+
+    def share(self, node):
+        # Children are shared before their parents, so identical subtrees
+        # have identical children and a key of child identities suffices.
+        if not self.share_subtrees:
+            return node
+        node_type = type(node)
+        if node_type is InfixExpression:
+            key = (node_type, node.operator, node.left, node.right)
+        elif node_type is PrefixExpression:
+            key = (node_type, node.operator, node.right)
+        else:
+            return node
+        shared = self.subtrees.get(key)
+        if shared is None:
+            self.subtrees[key] = node
+            return node
+        self.hits += 1
+        return shared
@@ -1,14 +1,63 @@
+import codecs
+import re
 import interpreter.token as token
+from interpreter.position import LineIndex
 from interpreter.token import Token
 
 
+def _symbol_pattern(symbols):
+    ordered = sorted(symbols, key=len, reverse=True)
+    return "|".join(re.escape(symbol) for symbol in ordered)
+
+
+MASTER_PATTERN = re.compile(
+    r"[ \t\n\r]*(?:"
+    r"(?P<ident>[^\W\d_]+)"
+    r"|(?P<int>\d+)"
+    f"|(?P<symbol>{_symbol_pattern({**token.operators, **token.delimiters})})"
+    r"|(?P<illegal>[^ \t\n\r])"
+    r"|(?P<eof>\Z))",
+    re.DOTALL,
+)
+
+SYMBOL_TYPES = {**token.operators, **token.delimiters}
+
+ENGINES = ("char", "regex")
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
 class Lexer:
-    def __init__(self, input, position=0, readPostion=0, ch=''):
+    def __init__(self, input, position=0, readPostion=0, ch='', engine="char"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown lexer engine {engine!r}, expected one of {ENGINES}")
+
         self.input = input
         self.position = position
         self.readPostion = readPostion
         self.ch = ch
-        self.read_char()
+        self.engine = engine
+
+        if engine == "regex":
+            self.next_token = self.scan_tokens(readPostion).__next__
+        else:
+            self.read_char()
+
+
+    def reset(self, input):
+        self.input = input
+        self.position = 0
+        self.readPostion = 0
+        self.ch = ''
+
+        if self.engine == "regex":
+            self.next_token = self.scan_tokens().__next__
+        else:
+            self.read_char()
+
+
+    def line_index(self):
+        return LineIndex(self.input)
 
 
     def read_char(self):
@@ -22,59 +71,61 @@ class Lexer:
 
     def next_token(self):
         self.skip_whitespace()
+        start = self.position
 
         tok = None
         if self.ch == '=':
             if self.peek_char() == '=':
                 ch = self.ch
                 self.read_char()
-                tok = Token(token.EQ, ch + self.ch)
+                tok = Token(token.EQ, ch + self.ch, start)
             else:
-                tok = Token(token.ASSIGN, self.ch)
+                tok = Token(token.ASSIGN, self.ch, start)
         elif self.ch == '+':
-            tok = Token(token.PLUS, self.ch)
+            tok = Token(token.PLUS, self.ch, start)
         elif self.ch == '-':
-            tok = Token(token.MINUS, self.ch)
+            tok = Token(token.MINUS, self.ch, start)
         elif self.ch == '!':
             if self.peek_char() == '=':
                 ch = self.ch
                 self.read_char()
-                tok = Token(token.NOT_EQ, ch + self.ch)
+                tok = Token(token.NOT_EQ, ch + self.ch, start)
             else:
-                tok = Token(token.BANG, self.ch)
+                tok = Token(token.BANG, self.ch, start)
         elif self.ch == '/':
-            tok = Token(token.SLASH, self.ch)
+            tok = Token(token.SLASH, self.ch, start)
         elif self.ch == '*':
-            tok = Token(token.ASTERISK, self.ch)
+            tok = Token(token.ASTERISK, self.ch, start)
         elif self.ch == '<':
-            tok = Token(token.LT, self.ch)
+            tok = Token(token.LT, self.ch, start)
         elif self.ch == '>':
-            tok = Token(token.GT, self.ch)
+            tok = Token(token.GT, self.ch, start)
         elif self.ch == ';':
-            tok = Token(token.SEMICOLON, self.ch)
+            tok = Token(token.SEMICOLON, self.ch, start)
         elif self.ch == '(':
-            tok = Token(token.LPAREN, self.ch)
+            tok = Token(token.LPAREN, self.ch, start)
         elif self.ch == ')':
-            tok = Token(token.RPAREN, self.ch)
+            tok = Token(token.RPAREN, self.ch, start)
         elif self.ch == ',':
-            tok = Token(token.COMMA, self.ch)
+            tok = Token(token.COMMA, self.ch, start)
         elif self.ch == '{':
-            tok = Token(token.LBRACE, self.ch)
+            tok = Token(token.LBRACE, self.ch, start)
         elif self.ch == '}':
-            tok = Token(token.RBRACE, self.ch)
+            tok = Token(token.RBRACE, self.ch, start)
         elif self.ch == 0:
-            tok = Token(token.EOF, '')
+            # Reading on would move every later EOF past the end.
+            return Token(token.EOF, '', start)
         else:
             if self.is_letter():
                 literal = self.read_identifier()
                 type = token.lookup_ident(literal)
-                return Token(type, literal)
+                return Token(type, literal, start)
             elif self.is_digit():
                 literal = self.read_number()
                 type = token.INT
-                return Token(type, literal)
+                return Token(type, literal, start)
             else:
-                tok = Token(token.ILLEGAL, self.ch)
+                tok = Token(token.ILLEGAL, self.ch, start)
         
         self.read_char()
         return tok
@@ -100,7 +151,7 @@ class Lexer:
 
 
     def peek_char(self):
-        if self.readPostion > len(self.input):
+        if self.readPostion >= len(self.input):
             return 0
         return self.input[self.readPostion]
     
@@ -111,3 +162,139 @@ class Lexer:
 
     def is_digit(self):
         return self.ch.isnumeric()
+
+
+    def scan_tokens(self, start=0):
+        lookup_keyword = token.keywords.get
+        symbol_types = SYMBOL_TYPES
+
+        for match in MASTER_PATTERN.finditer(self.input, start):
+            kind = match.lastgroup
+            literal = match[kind]
+            position = match.start(kind)
+            if kind == "symbol":
+                yield Token(symbol_types[literal], literal, position)
+            elif kind == "ident":
+                yield Token(lookup_keyword(literal, token.IDENT), literal, position)
+            elif kind == "int":
+                yield Token(token.INT, literal, position)
+            elif kind == "illegal":
+                yield Token(token.ILLEGAL, literal, position)
+            else:
+                break
+
+        end = len(self.input)
+        while True:
+            yield Token(token.EOF, '', end)
+
+
+class LocatedToken(Token):
+    # A token that carries its 1-based line and column, for lexers that do
+    # not keep the text to work them out from later.
+    __slots__ = ("line", "column")
+
+    def __init__(self, type, literal, position, line, column):
+        self.type = type
+        self.literal = literal
+        self.position = position
+        self.line = line
+        self.column = column
+
+
+class StreamLexer:
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        self.source = source
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.offset = 0
+        # Tokens carry their own line and column, so nothing grows with the
+        # input. These hold the last line and its start once all of it has
+        # been read, for the EOF token.
+        self.line = 1
+        self.line_start = 0
+        self.tokens = self.scan_tokens()
+
+
+    def __iter__(self):
+        return self.tokens
+
+
+    def next_token(self):
+        return next(self.tokens, None) or LocatedToken(
+            token.EOF, '', self.offset, self.line, self.offset - self.line_start + 1)
+
+
+    def read_chunks(self):
+        decoder = None
+        while True:
+            chunk = self.source.read(self.chunk_size)
+            if isinstance(chunk, (bytes, bytearray, memoryview)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self.encoding)()
+                text = decoder.decode(chunk, final=not chunk)
+            else:
+                text = chunk
+
+            if not chunk:
+                if text:
+                    yield text
+                return
+            if text:
+                yield text
+
+
+    def scan_tokens(self):
+        lookup_keyword = token.keywords.get
+        symbol_types = SYMBOL_TYPES
+
+        line = 1
+        line_start = 0
+        buffer = ""
+        chunks = self.read_chunks()
+        final = False
+        while not final:
+            chunk = next(chunks, None)
+            final = chunk is None
+            if not final:
+                buffer += chunk
+
+            offset = self.offset
+            rest = len(buffer)
+            # The first newline not yet counted, or past the end.
+            newline = buffer.find("\n")
+            if newline < 0:
+                newline = rest + 1
+            for match in MASTER_PATTERN.finditer(buffer):
+                kind = match.lastgroup
+                start = match.start(kind)
+                while newline < start:
+                    line += 1
+                    line_start = offset + newline + 1
+                    newline = buffer.find("\n", newline + 1)
+                    if newline < 0:
+                        newline = rest + 1
+                if kind == "eof":
+                    break
+                if not final and match.end() == len(buffer):
+                    # The token may continue in the next chunk.
+                    rest = start
+                    break
+
+                literal = match[kind]
+                position = offset + start
+                if kind == "symbol":
+                    type = symbol_types[literal]
+                elif kind == "ident":
+                    type = lookup_keyword(literal, token.IDENT)
+                elif kind == "int":
+                    type = token.INT
+                else:
+                    type = token.ILLEGAL
+                yield LocatedToken(type, literal, position, line, position - line_start + 1)
+            buffer = buffer[rest:]
+            self.offset += rest
+        self.line = line
+        self.line_start = line_start
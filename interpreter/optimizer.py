@@ -0,0 +1,142 @@
+import interpreter.token as token
+from interpreter.ast import (
+    Boolean,
+    ExpressionStatement,
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    ReturnStatement,
+)
+from interpreter.evaluator import EvaluationError, eval_infix, eval_prefix
+from interpreter.token import Token
+
+INTEGER = "INTEGER"
+BOOLEAN = "BOOLEAN"
+
+ARITHMETIC_OPERATORS = {"+", "-", "*", "/"}
+
+# operator -> (identity operand, identity allowed on the left)
+IDENTITIES = {
+    "+": (0, True),
+    "-": (0, False),
+    "*": (1, True),
+    "/": (1, False),
+}
+
+
+def literal(value, position):
+    if value is True or value is False:
+        literal = "true" if value else "false"
+        return Boolean(Token(token.TRUE if value else token.FALSE, literal, position), value)
+    return IntegerLiteral(Token(token.INT, str(value), position), value)
+
+
+def is_literal(node):
+    return type(node) is IntegerLiteral or type(node) is Boolean
+
+
+class Optimizer:
+    # Identities and double negations are only simplified when the static
+    # type of the remaining operand is known, so that programs that would
+    # fail with a type error at runtime still do.
+    def __init__(self):
+        self.types = {}
+        self.removed = 0
+
+    def optimize(self, program):
+        for statement in program.statements:
+            if isinstance(statement, ExpressionStatement):
+                statement.expression = self.optimize_expression(statement.expression)
+            elif isinstance(statement, LetStatement):
+                statement.value = self.optimize_expression(statement.value)
+                if statement.name is not None:
+                    self.types[statement.name.value] = self.static_type(statement.value)
+            elif isinstance(statement, ReturnStatement):
+                statement.return_value = self.optimize_expression(statement.return_value)
+        return self.removed
+
+    def static_type(self, node):
+        node_type = type(node)
+        if node_type is IntegerLiteral:
+            return INTEGER
+        if node_type is Boolean:
+            return BOOLEAN
+        if node_type is Identifier:
+            return self.types.get(node.value)
+        if node_type is PrefixExpression:
+            return INTEGER if node.operator == "-" else BOOLEAN
+        if node_type is InfixExpression:
+            return INTEGER if node.operator in ARITHMETIC_OPERATORS else BOOLEAN
+        return None
+
+    def optimize_expression(self, expression):
+        values = []
+        work = [(expression, False)]
+        while work:
+            node, operands_done = work.pop()
+            node_type = type(node)
+            if node_type is InfixExpression:
+                if operands_done:
+                    node.right = values.pop()
+                    node.left = values.pop()
+                    values.append(self.fold_infix(node))
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+            elif node_type is PrefixExpression:
+                if operands_done:
+                    node.right = values.pop()
+                    values.append(self.fold_prefix(node))
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+            else:
+                values.append(node)
+        return values.pop()
+
+    def replace(self, replacement, removed):
+        self.removed += removed
+        return replacement
+
+    def fold_prefix(self, node):
+        right = node.right
+        if is_literal(right):
+            try:
+                value = eval_prefix(node.operator, right.value)
+            except EvaluationError:
+                return node
+            return self.replace(literal(value, node.position), 1)
+
+        if type(right) is PrefixExpression and right.operator == node.operator:
+            inner = right.right
+            expected = BOOLEAN if node.operator == "!" else INTEGER
+            if self.static_type(inner) == expected:
+                return self.replace(inner, 2)
+        return node
+
+    def fold_infix(self, node):
+        left, right = node.left, node.right
+        if is_literal(left) and is_literal(right):
+            try:
+                value = eval_infix(node.operator, left.value, right.value)
+            except EvaluationError:
+                return node
+            return self.replace(literal(value, node.position), 2)
+
+        identity = IDENTITIES.get(node.operator)
+        if identity is not None:
+            value, on_left = identity
+            if type(right) is IntegerLiteral and right.value == value \
+                    and self.static_type(left) == INTEGER:
+                return self.replace(left, 2)
+            if on_left and type(left) is IntegerLiteral and left.value == value \
+                    and self.static_type(right) == INTEGER:
+                return self.replace(right, 2)
+        return node
+
+
+def optimize(program):
+    return Optimizer().optimize(program)
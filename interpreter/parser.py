@@ -1,3 +1,4 @@
+from collections import namedtuple
 from enum import IntEnum
 import interpreter.token as token
 from interpreter.ast import (
@@ -11,6 +12,10 @@ from interpreter.ast import (
     Program,
     ReturnStatement,
 )
+from interpreter.byte_lexer import ByteLexer, OffsetToken
+from interpreter.intern import Interner
+from interpreter.lexer import Lexer, LocatedToken
+from interpreter.token_buffer import TokenBuffer
 
 class Precedence(IntEnum):
     LOWEST = 0
@@ -32,46 +37,166 @@ PrecedenceMap = {
     token.ASTERISK: Precedence.PRODUCT,
 }
 
+# Types no node keeps, except as the first token of an expression
+# statement. Parsing a TokenBuffer, one Token without a position stands in
+# for every token of each of these types.
+SHARED_TYPES = (
+    token.ASSIGN, token.COMMA, token.SEMICOLON,
+    token.LPAREN, token.RPAREN, token.LBRACE, token.RBRACE,
+)
+
+SHARED_TOKENS = tuple(
+    token.Token(type, token.fixed_literals[code]) if type in SHARED_TYPES else None
+    for code, type in enumerate(token.token_types)
+)
+
+ParseResult = namedtuple("ParseResult", ["program", "errors"])
+
+
+def located_message(message, location):
+    if location is None:
+        return message
+    return f"{message} at line {location[0]}, column {location[1]}"
+
+
+def parse(source, engine="regex", intern=False):
+    parser = Parser(Lexer(source, engine=engine), intern=intern)
+    program = parser.parse_program()
+    return ParseResult(program, parser.errors)
+
+
+PREFIX_PARSE_FUNCTIONS = {
+    token.IDENT: "parse_identifier",
+    token.INT: "parse_integer_literal",
+    token.BANG: "parse_prefix_expression",
+    token.MINUS: "parse_prefix_expression",
+    token.TRUE: "parse_boolean",
+    token.FALSE: "parse_boolean",
+    token.LPAREN: "parse_grouped_expression",
+}
+
+INFIX_PARSE_FUNCTIONS = {
+    token.PLUS: "parse_infix_expression",
+    token.MINUS: "parse_infix_expression",
+    token.SLASH: "parse_infix_expression",
+    token.ASTERISK: "parse_infix_expression",
+    token.EQ: "parse_infix_expression",
+    token.NOT_EQ: "parse_infix_expression",
+    token.LT: "parse_infix_expression",
+    token.GT: "parse_infix_expression",
+}
+
 
 class Parser:
-    def __init__(self, lexer):
+    # The dispatch tables hold plain functions, called with the parser as
+    # their first argument, and are built once per class. Registering a
+    # function on an instance gives that instance its own copy.
+    prefix_parse_fns = {}
+    infix_parse_fns = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.build_dispatch_tables()
+
+    @classmethod
+    def build_dispatch_tables(cls):
+        cls.prefix_parse_fns = {
+            token_type: getattr(cls, name) for token_type, name in PREFIX_PARSE_FUNCTIONS.items()
+        }
+        cls.infix_parse_fns = {
+            token_type: getattr(cls, name) for token_type, name in INFIX_PARSE_FUNCTIONS.items()
+        }
+
+    def __init__(self, lexer, intern=False):
+        # intern is False, True, "subtrees" to also share identical
+        # expressions, or an Interner to share nodes across parsers.
+        if isinstance(intern, Interner):
+            self.interner = intern
+        elif intern:
+            self.interner = Interner(share_subtrees=intern == "subtrees")
+        else:
+            self.interner = None
+        self.lexer = None
+        self.reset(lexer)
+
+    def reset(self, source):
+        if isinstance(source, str):
+            if isinstance(self.lexer, Lexer):
+                self.lexer.reset(source)
+            else:
+                self.lexer = Lexer(source, engine="regex")
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.lexer = ByteLexer(source)
+        else:
+            self.lexer = source
+
         self.errors = []
+        self.line_index = None
         self.cur_token = None
         self.peek_token = None
-        self.lexer = lexer
+
+        if isinstance(self.lexer, TokenBuffer):
+            self.token_index = -1
+            self.next_token = self.next_buffered_token
+        else:
+            self.token_index = None
+            self.__dict__.pop("next_token", None)
 
         self.next_token()
         self.next_token()
-
-        self.prefix_parse_fns = dict()
-        self.register_prefix(token.IDENT, self.parse_identifier)
-        self.register_prefix(token.INT, self.parse_integer_literal)
-        self.register_prefix(token.BANG, self.parse_prefix_expression)
-        self.register_prefix(token.MINUS, self.parse_prefix_expression)
-        self.register_prefix(token.TRUE, self.parse_boolean)
-        self.register_prefix(token.FALSE, self.parse_boolean)
-        self.register_prefix(token.LPAREN, self.parse_grouped_expression)
-
-        self.infix_parse_fns = dict()
-        self.register_infix(token.PLUS, self.parse_infix_expression)
-        self.register_infix(token.MINUS, self.parse_infix_expression)
-        self.register_infix(token.SLASH, self.parse_infix_expression)
-        self.register_infix(token.ASTERISK, self.parse_infix_expression)
-        self.register_infix(token.EQ, self.parse_infix_expression)
-        self.register_infix(token.NOT_EQ, self.parse_infix_expression)
-        self.register_infix(token.LT, self.parse_infix_expression)
-        self.register_infix(token.GT, self.parse_infix_expression)
+        return self
 
     def register_prefix(self, token_type, prefix_parse_fn):
-        self.prefix_parse_fns[token_type] = prefix_parse_fn
+        if "prefix_parse_fns" not in self.__dict__:
+            self.prefix_parse_fns = dict(self.prefix_parse_fns)
+        self.prefix_parse_fns[token_type] = self.table_function(prefix_parse_fn)
 
     def register_infix(self, token_type, infix_parse_fn):
-        self.infix_parse_fns[token_type] = infix_parse_fn
+        if "infix_parse_fns" not in self.__dict__:
+            self.infix_parse_fns = dict(self.infix_parse_fns)
+        self.infix_parse_fns[token_type] = self.table_function(infix_parse_fn)
+
+    def table_function(self, parse_fn):
+        # Registered functions take only the parse arguments, without the
+        # parser. This parser's own methods go in the table unbound, so
+        # parse_expression still recognizes them; anything else is adapted.
+        if getattr(parse_fn, "__self__", None) is self:
+            return parse_fn.__func__
+        return lambda parser, *args: parse_fn(*args)
 
     def next_token(self):
         self.cur_token = self.peek_token
         self.peek_token = self.lexer.next_token()
 
+    def next_buffered_token(self):
+        # The index is the cursor. Tokens are only built for the types nodes
+        # keep, and only identifiers, integers and illegal characters slice
+        # the source for their literal.
+        self.cur_token = self.peek_token
+        index = self.token_index = self.token_index + 1
+        buffer = self.lexer
+        try:
+            code = buffer.types[index]
+        except IndexError:
+            self.peek_token = buffer.token(index)
+            return
+        shared = SHARED_TOKENS[code]
+        if shared is not None:
+            self.peek_token = shared
+            return
+        literal = token.fixed_literals[code]
+        start = buffer.starts[index]
+        if literal is None:
+            literal = buffer.source[start:buffer.ends[index]]
+        self.peek_token = token.Token(token.token_types[code], literal, start)
+
+    def positioned(self, tok, offset):
+        # tok itself, or for a shared token the full token at offset from
+        # the peek token.
+        if tok.position is None and self.token_index is not None:
+            return self.lexer.token(self.token_index + offset)
+        return tok
+
     def parse_program(self):
         program = Program()
         while self.cur_token.type != token.EOF:
@@ -94,14 +219,26 @@ class Parser:
         if not self.expect_peek(token.IDENT):
             return None
 
-        statement.name = Identifier(self.cur_token, self.cur_token.literal)
+        tok = self.cur_token
+        if type(tok) is OffsetToken:
+            tok = tok.decoded()
+        if self.interner is not None:
+            statement.name = self.interner.identifier(tok)
+        else:
+            statement.name = Identifier(tok, tok.literal)
 
         if not self.expect_peek(token.ASSIGN):
             self.next_token()
-        
-        while not self.cur_token_is(token.SEMICOLON) and not self.cur_token_is(token.EOF):
+            while not self.cur_token_is(token.SEMICOLON) and not self.cur_token_is(token.EOF):
+                self.next_token()
+            return statement
+
+        self.next_token()
+        statement.value = self.parse_expression(Precedence.LOWEST)
+
+        if self.peek_token_is(token.SEMICOLON):
             self.next_token()
-        
+
         return statement
 
     def parse_return_statement(self):
@@ -109,13 +246,22 @@ class Parser:
 
         self.next_token()
 
-        if not self.cur_token_is(token.SEMICOLON):
+        if self.cur_token_is(token.SEMICOLON):
+            return statement
+
+        statement.return_value = self.parse_expression(Precedence.LOWEST)
+
+        if self.peek_token_is(token.SEMICOLON):
             self.next_token()
 
         return statement
 
     def parse_expression_statement(self):
-        statement = ExpressionStatement(self.cur_token)
+        tok = self.positioned(self.cur_token, -1)
+        if type(tok) is OffsetToken:
+            # Shared with the expression's first node, as with other lexers.
+            tok = self.cur_token = tok.decoded()
+        statement = ExpressionStatement(tok)
         statement.expression = self.parse_expression(Precedence.LOWEST)
 
         if self.peek_token_is(token.SEMICOLON):
@@ -124,29 +270,91 @@ class Parser:
         return statement
 
     def parse_expression(self, precedence):
-        prefix = self.prefix_parse_fns.get(self.cur_token.type)
-        if not prefix:
-            self.no_prefix_parse_error(self.cur_token.type)
-            return None
-        
-        leftExp = prefix()
-
-        while not self.peek_token_is(token.SEMICOLON) and precedence < self.peek_precedence():
-            infix = self.infix_parse_fns.get(self.peek_token.type)
-            if not infix:
-                return leftExp
-
-            self.next_token()
-            leftExp = infix(leftExp)
-
-        return leftExp
+        parser_class = type(self)
+        parse_prefix_expression = parser_class.parse_prefix_expression
+        parse_grouped_expression = parser_class.parse_grouped_expression
+        parse_infix_expression = parser_class.parse_infix_expression
+
+        # Operators and open parentheses still waiting for their right-hand
+        # side, each paired with the precedence to resume with afterwards.
+        # Keeping them here instead of on the Python stack makes arbitrarily
+        # long and deeply nested expressions safe to parse.
+        pending = []
+        while True:
+            prefix = self.prefix_parse_fns.get(self.cur_token.type)
+            if prefix is parse_prefix_expression:
+                expression = PrefixExpression(self.cur_token, self.cur_token.literal)
+                pending.append((expression, precedence))
+                precedence = Precedence.PREFIX
+                self.next_token()
+                continue
+            if prefix is parse_grouped_expression:
+                pending.append((None, precedence))
+                precedence = Precedence.LOWEST
+                self.next_token()
+                continue
+
+            if prefix:
+                leftExp = prefix(self)
+                returned = False
+            else:
+                self.no_prefix_parse_error(self.cur_token.type)
+                leftExp = None
+                returned = True
+
+            while True:
+                if not returned:
+                    infix = None
+                    while not self.peek_token_is(token.SEMICOLON) and precedence < self.peek_precedence():
+                        infix = self.infix_parse_fns.get(self.peek_token.type)
+                        if not infix:
+                            break
+
+                        self.next_token()
+                        if infix is parse_infix_expression:
+                            break
+                        leftExp = infix(self, leftExp)
+                        infix = None
+
+                    if infix is parse_infix_expression:
+                        expression = InfixExpression(self.cur_token, leftExp, self.cur_token.literal)
+                        pending.append((expression, precedence))
+                        precedence = self.cur_precedence()
+                        self.next_token()
+                        break
+
+                if not pending:
+                    return leftExp
+
+                expression, precedence = pending.pop()
+                if expression is None:
+                    if not self.expect_peek(token.RPAREN):
+                        leftExp = None
+                else:
+                    expression.right = leftExp
+                    leftExp = expression
+                    if self.interner is not None:
+                        leftExp = self.interner.share(expression)
+                returned = False
 
     def parse_identifier(self):
-        return Identifier(self.cur_token, self.cur_token.literal)
+        # Nodes outlive the lexer, so they never keep a token that refers to
+        # a byte buffer.
+        tok = self.cur_token
+        if type(tok) is OffsetToken:
+            tok = tok.decoded()
+        if self.interner is not None:
+            return self.interner.identifier(tok)
+        return Identifier(tok, tok.literal)
 
     def parse_integer_literal(self):
-        integer_literal = IntegerLiteral(self.cur_token)
-        integer_literal.value = int(self.cur_token.literal)
+        tok = self.cur_token
+        if type(tok) is OffsetToken:
+            tok = tok.decoded()
+        if self.interner is not None:
+            return self.interner.integer(tok)
+        integer_literal = IntegerLiteral(tok)
+        integer_literal.value = int(tok.literal)
         return integer_literal
 
     def parse_prefix_expression(self):
@@ -159,6 +367,8 @@ class Parser:
 
         expression.right = self.parse_expression(Precedence.PREFIX)
 
+        if self.interner is not None:
+            return self.interner.share(expression)
         return expression
 
     def parse_infix_expression(self, left):
@@ -168,9 +378,13 @@ class Parser:
         self.next_token()
         expression.right = self.parse_expression(precedence)
 
+        if self.interner is not None:
+            return self.interner.share(expression)
         return expression
 
     def parse_boolean(self):
+        if self.interner is not None:
+            return self.interner.boolean(self.cur_token)
         return Boolean(self.cur_token, self.cur_token_is(token.TRUE))
 
     def parse_grouped_expression(self):
@@ -204,10 +418,24 @@ class Parser:
         return Precedence.LOWEST
 
     def peek_error(self, token_type):
-        self.errors.append(f"Expected next token to be {token_type}, " \
-            f"got {self.peek_token.type} instead")
+        self.error(f"Expected next token to be {token_type}, " \
+            f"got {self.peek_token.type} instead", self.positioned(self.peek_token, 0))
 
     def no_prefix_parse_error(self, token_type):
-        self.errors.append(f"No prefix parse function for {token_type} found")
+        self.error(f"No prefix parse function for {token_type} found",
+            self.positioned(self.cur_token, -1))
+
+    def error(self, message, tok):
+        self.errors.append(located_message(message, self.location(tok)))
+
+    def location(self, tok):
+        if type(tok) is LocatedToken:
+            return tok.line, tok.column
+        if tok.position is None or not hasattr(self.lexer, "line_index"):
+            return None
+        if self.line_index is None:
+            self.line_index = self.lexer.line_index()
+        return self.line_index.location(tok.position)
 
 
+Parser.build_dispatch_tables()
@@ -0,0 +1,51 @@
+import threading
+from contextlib import contextmanager
+from interpreter.lexer import Lexer
+from interpreter.parser import ParseResult, Parser
+
+
+class ParserPool:
+    # Parsers are reset when handed out, so an idle parser still refers to
+    # the last source it parsed, but not to the tree built from it. At most
+    # max_idle parsers are kept; extra ones are created on demand under
+    # load and dropped when released.
+    def __init__(self, max_idle=16, engine="regex", parser_class=Parser):
+        self.max_idle = max_idle
+        self.engine = engine
+        self.parser_class = parser_class
+        self.idle = []
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.idle)
+
+    def acquire(self, source):
+        with self.lock:
+            parser = self.idle.pop() if self.idle else None
+            if parser is None:
+                self.created += 1
+        if parser is None:
+            return self.parser_class(Lexer(source, engine=self.engine))
+        return parser.reset(source)
+
+    def release(self, parser):
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(parser)
+
+    @contextmanager
+    def parser(self, source):
+        parser = self.acquire(source)
+        try:
+            yield parser
+        finally:
+            self.release(parser)
+
+    def parse(self, source):
+        parser = self.acquire(source)
+        try:
+            program = parser.parse_program()
+            return ParseResult(program, parser.errors)
+        finally:
+            self.release(parser)
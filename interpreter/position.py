@@ -0,0 +1,26 @@
+import re
+from bisect import bisect_right
+
+
+NEWLINE_PATTERN = re.compile("\n")
+
+
+class LineIndex:
+    def __init__(self, source="", line_starts=None):
+        self.source = source
+        self._line_starts = line_starts
+
+    @property
+    def line_starts(self):
+        if self._line_starts is None:
+            self._line_starts = [0]
+            self._line_starts.extend(
+                newline.end() for newline in NEWLINE_PATTERN.finditer(self.source))
+        return self._line_starts
+
+    def line(self, offset):
+        return bisect_right(self.line_starts, offset)
+
+    def location(self, offset):
+        line = self.line(offset)
+        return line, offset - self.line_starts[line - 1] + 1
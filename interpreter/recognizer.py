@@ -0,0 +1,171 @@
+from collections import namedtuple
+import interpreter.token as token
+from interpreter.lexer import MASTER_PATTERN, SYMBOL_TYPES
+from interpreter.parser import Precedence, PrecedenceMap, located_message
+from interpreter.position import LineIndex
+
+ValidationResult = namedtuple("ValidationResult", ["valid", "errors", "stats"])
+
+LEAF_TYPES = frozenset((token.IDENT, token.INT, token.TRUE, token.FALSE))
+PRECEDENCES = {token_type: int(precedence) for token_type, precedence in PrecedenceMap.items()}
+PREFIX = int(Precedence.PREFIX)
+# Added to the precedence saved for an open parenthesis, to tell the two
+# kinds of pending entries apart without allocating.
+PAREN = 1 << 8
+
+
+def scan(source, counts):
+    lookup_keyword = token.keywords.get
+    symbol_types = SYMBOL_TYPES
+    tokens = 0
+    for match in MASTER_PATTERN.finditer(source):
+        kind = match.lastgroup
+        if kind == "symbol":
+            yield symbol_types[match[kind]], match.start(kind)
+        elif kind == "ident":
+            yield lookup_keyword(match[kind], token.IDENT), match.start(kind)
+        elif kind == "int":
+            yield token.INT, match.start(kind)
+        elif kind == "illegal":
+            yield token.ILLEGAL, match.start(kind)
+        else:
+            break
+        tokens += 1
+
+    counts["tokens"] = tokens
+    end = len(source)
+    while True:
+        yield token.EOF, end
+
+
+class Recognizer:
+    # Follows the grammar of Parser.parse_program token for token and
+    # reports the same errors, but keeps only token types and positions and
+    # never builds a node.
+    def __init__(self, source):
+        self.source = source
+        self.errors = []
+        self.line_index = None
+        self.stats = {"tokens": 0, "statements": 0, "max_depth": 0}
+
+    def error(self, message, position):
+        if self.line_index is None:
+            self.line_index = LineIndex(self.source)
+        self.errors.append(located_message(message, self.line_index.location(position)))
+
+    def peek_error(self, token_type, peek_type, peek_position):
+        self.error(f"Expected next token to be {token_type}, " \
+            f"got {peek_type} instead", peek_position)
+
+    def recognize(self):
+        EOF = token.EOF
+        SEMICOLON = token.SEMICOLON
+        leaf_types = LEAF_TYPES
+        precedences = PRECEDENCES
+
+        stats = self.stats
+        next_token = scan(self.source, stats).__next__
+        cur_type, cur_position = next_token()
+        peek_type, peek_position = next_token()
+        statements = 0
+        max_depth = 0
+
+        while cur_type != EOF:
+            if cur_type == token.LET:
+                if peek_type != token.IDENT:
+                    self.peek_error(token.IDENT, peek_type, peek_position)
+                    cur_type, cur_position = peek_type, peek_position
+                    peek_type, peek_position = next_token()
+                    continue
+                cur_type, cur_position = peek_type, peek_position
+                peek_type, peek_position = next_token()
+                if peek_type != token.ASSIGN:
+                    self.peek_error(token.ASSIGN, peek_type, peek_position)
+                    cur_type, cur_position = peek_type, peek_position
+                    peek_type, peek_position = next_token()
+                    while cur_type != SEMICOLON and cur_type != EOF:
+                        cur_type, cur_position = peek_type, peek_position
+                        peek_type, peek_position = next_token()
+                    statements += 1
+                    cur_type, cur_position = peek_type, peek_position
+                    peek_type, peek_position = next_token()
+                    continue
+                cur_type, cur_position = peek_type, peek_position
+                peek_type, peek_position = next_token()
+                cur_type, cur_position = peek_type, peek_position
+                peek_type, peek_position = next_token()
+            elif cur_type == token.RETURN:
+                cur_type, cur_position = peek_type, peek_position
+                peek_type, peek_position = next_token()
+                if cur_type == SEMICOLON:
+                    statements += 1
+                    cur_type, cur_position = peek_type, peek_position
+                    peek_type, peek_position = next_token()
+                    continue
+
+            # The expression loop of Parser.parse_expression, keeping only
+            # the precedences of the pending operators and parentheses.
+            precedence = 0
+            pending = []
+            while pending is not None:
+                if cur_type in leaf_types:
+                    returned = False
+                elif cur_type == token.BANG or cur_type == token.MINUS:
+                    pending.append(precedence)
+                    precedence = PREFIX
+                    cur_type, cur_position = peek_type, peek_position
+                    peek_type, peek_position = next_token()
+                    continue
+                elif cur_type == token.LPAREN:
+                    pending.append(precedence + PAREN)
+                    precedence = 0
+                    cur_type, cur_position = peek_type, peek_position
+                    peek_type, peek_position = next_token()
+                    continue
+                else:
+                    self.error(f"No prefix parse function for {cur_type} found", cur_position)
+                    returned = True
+
+                if len(pending) >= max_depth:
+                    max_depth = len(pending) + 1
+
+                while True:
+                    if not returned and peek_type != SEMICOLON \
+                            and precedence < precedences.get(peek_type, 0):
+                        pending.append(precedence)
+                        precedence = precedences[peek_type]
+                        peek_type, peek_position = next_token()
+                        cur_type, cur_position = peek_type, peek_position
+                        peek_type, peek_position = next_token()
+                        break
+
+                    if not pending:
+                        pending = None
+                        break
+
+                    precedence = pending.pop()
+                    if precedence >= PAREN:
+                        precedence -= PAREN
+                        if peek_type == token.RPAREN:
+                            cur_type, cur_position = peek_type, peek_position
+                            peek_type, peek_position = next_token()
+                        else:
+                            self.peek_error(token.RPAREN, peek_type, peek_position)
+                    returned = False
+
+            if peek_type == SEMICOLON:
+                cur_type, cur_position = peek_type, peek_position
+                peek_type, peek_position = next_token()
+            statements += 1
+            cur_type, cur_position = peek_type, peek_position
+            peek_type, peek_position = next_token()
+
+        stats["statements"] = statements
+        stats["max_depth"] = max_depth
+        return not self.errors
+
+
+def validate(source, stats=False):
+    recognizer = Recognizer(source)
+    valid = recognizer.recognize()
+    return ValidationResult(valid, recognizer.errors, recognizer.stats if stats else None)
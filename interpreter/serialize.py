@@ -0,0 +1,253 @@
+import gc
+import interpreter.token as token
+from interpreter.ast import (
+    Boolean,
+    ExpressionStatement,
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    Program,
+    ReturnStatement,
+)
+from interpreter.parser import ParseResult
+from interpreter.token import Token
+
+# Layout: MAGIC, version, string table, statement count, statements in
+# preorder, error count, errors. Every integer is an unsigned LEB128 varint.
+# A node is its tag (0 for a missing node), its token (type code, literal
+# string, position), its own fields and then its children. Positions are
+# stored as the zigzagged distance from the previous node's position plus
+# one, with 0 meaning no position, which keeps most of them to one byte.
+MAGIC = b"MKAST"
+VERSION = 1
+
+NODE_TAGS = {
+    Identifier: 1,
+    IntegerLiteral: 2,
+    Boolean: 3,
+    PrefixExpression: 4,
+    InfixExpression: 5,
+    LetStatement: 6,
+    ReturnStatement: 7,
+    ExpressionStatement: 8,
+}
+
+
+class FormatError(ValueError):
+    pass
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def zigzag(value):
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def dumps(program, errors=()):
+    strings = {}
+    body = bytearray()
+    type_codes = token.type_codes
+
+    def string(value):
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        write_varint(body, index)
+
+    previous_position = 0
+    write_varint(body, len(program.statements))
+    stack = list(reversed(program.statements))
+    while stack:
+        node = stack.pop()
+        if node is None:
+            body.append(0)
+            continue
+
+        node_type = type(node)
+        tag = NODE_TAGS.get(node_type)
+        if tag is None:
+            raise TypeError(f"Cannot serialize {node_type.__name__} nodes")
+        body.append(tag)
+
+        tok = node.token
+        body.append(type_codes[tok.type])
+        string(tok.literal)
+        if tok.position is None:
+            body.append(0)
+        else:
+            write_varint(body, zigzag(tok.position - previous_position) + 1)
+            previous_position = tok.position
+
+        if node_type is Identifier:
+            string(node.value)
+        elif node_type is IntegerLiteral:
+            write_varint(body, 0 if node.value is None else zigzag(node.value) + 1)
+        elif node_type is Boolean:
+            body.append(1 if node.value else 0)
+        elif node_type is PrefixExpression:
+            string(node.operator)
+            stack.append(node.right)
+        elif node_type is InfixExpression:
+            string(node.operator)
+            stack.append(node.right)
+            stack.append(node.left)
+        elif node_type is LetStatement:
+            stack.append(node.value)
+            stack.append(node.name)
+        elif node_type is ReturnStatement:
+            stack.append(node.return_value)
+        else:
+            stack.append(node.expression)
+
+    write_varint(body, len(errors))
+    for error in errors:
+        string(error)
+
+    out = bytearray(MAGIC)
+    write_varint(out, VERSION)
+    write_varint(out, len(strings))
+    for value in strings:
+        encoded = value.encode("utf-8")
+        write_varint(out, len(encoded))
+        out += encoded
+    out += body
+    return bytes(out)
+
+
+def loads(data):
+    return loads_result(data).program
+
+
+def loads_result(data):
+    # The loader only builds acyclic trees, so pausing the cycle collector
+    # is safe and avoids repeated scans of the growing set of new nodes.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return read_result(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_result(data):
+    data = bytes(data)
+    if not data.startswith(MAGIC):
+        raise FormatError("Not a serialized Monkey program")
+
+    def read_rest(value):
+        shift = 7
+        value &= 0x7f
+        while True:
+            byte = next_byte()
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def read():
+        value = next_byte()
+        return value if value < 0x80 else read_rest(value)
+
+    try:
+        # The header and string table are read by offset so that strings are
+        # sliced out whole; the node stream after them goes through an
+        # iterator, which is faster byte by byte.
+        version, offset = read_varint(data, len(MAGIC))
+        if version != VERSION:
+            raise FormatError(f"Unsupported AST format version {version}")
+
+        strings = []
+        count, offset = read_varint(data, offset)
+        for _ in range(count):
+            length, offset = read_varint(data, offset)
+            end = offset + length
+            if end > len(data):
+                raise FormatError("Truncated or corrupt serialized program")
+            strings.append(data[offset:end].decode("utf-8"))
+            offset = end
+        next_byte = iter(data[offset:]).__next__
+
+        token_types = token.token_types
+        previous_position = 0
+
+        def read_node(slots):
+            nonlocal previous_position
+            tag = next_byte()
+            if tag == 0:
+                return None
+
+            token_type = token_types[next_byte()]
+            literal = strings[read()]
+            position = read()
+            if position:
+                position = previous_position = previous_position + unzigzag(position - 1)
+            else:
+                position = None
+            tok = Token(token_type, literal, position)
+
+            if tag == 5:
+                node = InfixExpression(tok, None, strings[read()])
+                slots.append((node, "right"))
+                slots.append((node, "left"))
+            elif tag == 1:
+                node = Identifier(tok, strings[read()])
+            elif tag == 2:
+                value = read()
+                node = IntegerLiteral(tok, unzigzag(value - 1) if value else None)
+            elif tag == 3:
+                node = Boolean(tok, next_byte() == 1)
+            elif tag == 4:
+                node = PrefixExpression(tok, strings[read()])
+                slots.append((node, "right"))
+            elif tag == 8:
+                node = ExpressionStatement(tok)
+                slots.append((node, "expression"))
+            elif tag == 6:
+                node = LetStatement(tok)
+                slots.append((node, "value"))
+                slots.append((node, "name"))
+            elif tag == 7:
+                node = ReturnStatement(tok)
+                slots.append((node, "return_value"))
+            else:
+                raise FormatError(f"Unknown node tag {tag}")
+            return node
+
+        program = Program()
+        statements = program.statements
+        slots = []
+        for _ in range(read()):
+            statements.append(read_node(slots))
+            while slots:
+                node, attribute = slots.pop()
+                setattr(node, attribute, read_node(slots))
+
+        errors = [strings[read()] for _ in range(read())]
+    except (StopIteration, IndexError, UnicodeDecodeError) as e:
+        raise FormatError("Truncated or corrupt serialized program") from e
+
+    return ParseResult(program, errors)
@@ -0,0 +1,392 @@
+import argparse
+import asyncio
+import base64
+import json
+import struct
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from interpreter.evaluator import EvaluationError, evaluate
+from interpreter.parser import parse
+from interpreter.serialize import dumps
+
+# Every message is a JSON object preceded by its length as a 4-byte
+# big-endian integer. Requests carry an "id" that is echoed back, so a
+# client may pipeline requests and match responses in any order.
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 << 20
+
+FORMATS = ("string", "ast")
+
+# Upper bounds of the latency buckets, in milliseconds.
+SHUTTING_DOWN = {"error": "service is shutting down"}
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def encode_frame(message):
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader):
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ProtocolError("Connection closed inside a frame header") from e
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit")
+    try:
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise ProtocolError("Connection closed inside a frame") from e
+    return json.loads(payload)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        # The upper bound of the bucket holding the requested rank.
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "buckets": [[bound, count] for bound, count in zip(self.buckets, self.counts)]
+                + [["inf", self.counts[-1]]],
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+def handle_request(request):
+    source = request.get("source")
+    if not isinstance(source, str):
+        return {"error": "request needs a string 'source'"}
+    output = request.get("format", "string")
+    if output not in FORMATS:
+        return {"error": f"unknown format {output!r}, expected one of {FORMATS}"}
+
+    result = parse(source)
+    response = {"errors": result.errors}
+    if output == "ast":
+        response["ast"] = base64.b64encode(dumps(result.program, result.errors)).decode("ascii")
+    else:
+        response["program"] = result.program.string()
+
+    if request.get("evaluate") and not result.errors:
+        try:
+            response["value"] = evaluate(result.program)
+        except EvaluationError as e:
+            response["evaluation_error"] = str(e)
+    return response
+
+
+def handle_batch(requests):
+    # One failing request must not take the rest of its batch with it.
+    responses = []
+    for request in requests:
+        try:
+            responses.append(handle_request(request))
+        except Exception as e:
+            responses.append({"error": f"internal error: {e}"})
+    return responses
+
+
+class ParseService:
+    # Requests from all connections go through one bounded queue. The
+    # batcher takes whatever has arrived within batch_delay, up to
+    # batch_size requests, and parses them in one executor call. When the
+    # queue is full, connection readers stop reading until there is room,
+    # which pushes back on clients through the socket.
+    def __init__(self, batch_size=64, batch_delay=0.002, max_queue=1024,
+                 max_batches=2, executor=None):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_queue = max_queue
+        self.max_batches = max_batches
+        self.executor = executor
+        self.own_executor = executor is None
+        self.queue = None
+        self.slots = None
+        self.server = None
+        self.batcher = None
+        self.running = set()
+        self.latency = Histogram()
+        self.requests = 0
+        self.batches = 0
+
+    async def start_unix(self, path):
+        self.prepare()
+        self.server = await asyncio.start_unix_server(self.handle_connection, path)
+        return self.server
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        self.prepare()
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    def prepare(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        self.queue = asyncio.Queue(self.max_queue)
+        self.slots = asyncio.Semaphore(self.max_batches)
+        self.batcher = asyncio.create_task(self.run_batches())
+
+    async def close(self):
+        # Every request taken in is answered before waiting on the server,
+        # whose connections may be waiting for those answers.
+        if self.server is not None:
+            self.server.close()
+        if self.batcher is not None:
+            self.batcher.cancel()
+            try:
+                await self.batcher
+            except asyncio.CancelledError:
+                pass
+            while not self.queue.empty():
+                _, future = self.queue.get_nowait()
+                future.set_result(SHUTTING_DOWN)
+        if self.server is not None:
+            await self.server.wait_closed()
+        if self.running:
+            await asyncio.gather(*self.running, return_exceptions=True)
+        if self.own_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else None,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "latency_ms": self.latency.snapshot(),
+        }
+
+    async def handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        replies = set()
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except (ProtocolError, ValueError) as e:
+                    await self.send(writer, write_lock, {"error": str(e)})
+                    break
+                if request is None:
+                    break
+
+                started = time.perf_counter()
+                if not isinstance(request, dict):
+                    await self.send(writer, write_lock, {"error": "request must be an object"})
+                    continue
+                if request.get("op") == "stats":
+                    await self.send(writer, write_lock, {"id": request.get("id"), **self.stats()})
+                    continue
+
+                future = asyncio.get_running_loop().create_future()
+                if self.batcher.done():
+                    future.set_result(SHUTTING_DOWN)
+                else:
+                    await self.queue.put((request, future))
+                reply = asyncio.create_task(
+                    self.reply(writer, write_lock, request.get("id"), future, started))
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+
+            if replies:
+                await asyncio.gather(*replies, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def reply(self, writer, write_lock, request_id, future, started):
+        response = await future
+        self.latency.observe((time.perf_counter() - started) * 1000)
+        try:
+            frame = encode_frame({"id": request_id, **response})
+        except Exception as e:
+            # For example an evaluated integer past json's digit limit; the
+            # client is still waiting for this id.
+            frame = encode_frame({"id": request_id, "error": f"cannot encode response: {e}"})
+        await self.write(writer, write_lock, frame)
+
+    async def send(self, writer, write_lock, message):
+        await self.write(writer, write_lock, encode_frame(message))
+
+    async def write(self, writer, write_lock, frame):
+        async with write_lock:
+            writer.write(frame)
+            await writer.drain()
+
+    async def run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            try:
+                batch.append(await self.queue.get())
+                deadline = loop.time() + self.batch_delay
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Bounds the batches handed to the executor; the queue keeps
+                # filling meanwhile and applies backpressure once full.
+                await self.slots.acquire()
+            except asyncio.CancelledError:
+                # Off the queue but not running yet, so close() would not
+                # answer these.
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(SHUTTING_DOWN)
+                raise
+            task = asyncio.create_task(self.run_batch(batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def run_batch(self, batch):
+        try:
+            requests = [request for request, _ in batch]
+            try:
+                responses = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, handle_batch, requests)
+            except Exception as e:
+                responses = [{"error": f"internal error: {e}"}] * len(batch)
+            self.requests += len(batch)
+            self.batches += 1
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+        finally:
+            self.slots.release()
+
+
+class ServiceClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.pending = {}
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect_unix(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    @classmethod
+    async def connect_tcp(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def receive(self):
+        try:
+            while True:
+                response = await read_frame(self.reader)
+                if response is None:
+                    break
+                future = self.pending.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Service connection closed"))
+            self.pending.clear()
+
+    async def request(self, message):
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(encode_frame({**message, "id": request_id}))
+        await self.writer.drain()
+        return await future
+
+    async def parse(self, source, format="string", evaluate=False):
+        return await self.request({"source": source, "format": format, "evaluate": evaluate})
+
+    async def stats(self):
+        return await self.request({"op": "stats"})
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self.receiver
+
+
+async def serve(args):
+    service = ParseService(args.batch_size, args.batch_delay / 1000, args.max_queue)
+    if args.unix:
+        server = await service.start_unix(args.unix)
+    else:
+        server = await service.start_tcp(args.host, args.port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving on {addresses}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve Monkey parse requests.")
+    arg_parser.add_argument("--unix", help="listen on this Unix socket path")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=7979)
+    arg_parser.add_argument("--batch-size", type=int, default=64)
+    arg_parser.add_argument("--batch-delay", type=float, default=2.0, help="milliseconds")
+    arg_parser.add_argument("--max-queue", type=int, default=1024)
+    args = arg_parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 class Token:
-    def __init__(self, type, literal):
+    __slots__ = ("type", "literal", "position")
+
+    def __init__(self, type, literal, position=None):
         self.type = type
         self.literal = literal
+        self.position = position
 
     def __str__(self):
         return f"Token(Type: {self.type}, Literal: {self.literal})"
@@ -35,6 +38,28 @@ RPAREN = ")"
 LBRACE = "{"
 RBRACE = "}"
 
+operators = {
+    "==": EQ,
+    "!=": NOT_EQ,
+    "=":  ASSIGN,
+    "+":  PLUS,
+    "-":  MINUS,
+    "!":  BANG,
+    "*":  ASTERISK,
+    "/":  SLASH,
+    "<":  LT,
+    ">":  GT,
+}
+
+delimiters = {
+    ",": COMMA,
+    ";": SEMICOLON,
+    "(": LPAREN,
+    ")": RPAREN,
+    "{": LBRACE,
+    "}": RBRACE,
+}
+
 # Keywords
 FUNCTION = "FUNCTION"
 LET      = "LET"
@@ -55,4 +80,20 @@ keywords = {
 }
 
 def lookup_ident(ident):
-    return keywords.get(ident, IDENT)
\ No newline at end of file
+    return keywords.get(ident, IDENT)
+
+
+token_types = (
+    ILLEGAL, EOF, IDENT, INT,
+    ASSIGN, PLUS, MINUS, BANG, ASTERISK, SLASH, EQ, NOT_EQ, LT, GT,
+    COMMA, SEMICOLON, LPAREN, RPAREN, LBRACE, RBRACE,
+    FUNCTION, LET, TRUE, FALSE, IF, ELSE, RETURN,
+)
+
+type_codes = {token_type: code for code, token_type in enumerate(token_types)}
+
+# The literal of every type that only has one, by type code, or None.
+fixed_literals = tuple(
+    {type: literal for literal, type in {**operators, **delimiters, **keywords}.items()}.get(type)
+    for type in token_types
+)
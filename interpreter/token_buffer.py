@@ -0,0 +1,79 @@
+from array import array
+import interpreter.token as token
+from interpreter.lexer import MASTER_PATTERN
+from interpreter.position import LineIndex
+from interpreter.token import Token
+
+
+class TokenBuffer:
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.tokenize()
+
+    def __len__(self):
+        return len(self.types)
+
+    def tokenize(self):
+        type_codes = token.type_codes
+        keyword_codes = {word: type_codes[type] for word, type in token.keywords.items()}
+        symbol_codes = {
+            symbol: type_codes[type]
+            for symbol, type in {**token.operators, **token.delimiters}.items()
+        }
+        ident_code = type_codes[token.IDENT]
+        int_code = type_codes[token.INT]
+        illegal_code = type_codes[token.ILLEGAL]
+
+        add_type = self.types.append
+        add_start = self.starts.append
+        add_end = self.ends.append
+        for match in MASTER_PATTERN.finditer(self.source):
+            kind = match.lastgroup
+            if kind == "symbol":
+                add_type(symbol_codes[match[kind]])
+            elif kind == "ident":
+                add_type(keyword_codes.get(match[kind], ident_code))
+            elif kind == "int":
+                add_type(int_code)
+            elif kind == "illegal":
+                add_type(illegal_code)
+            else:
+                break
+            token_start, token_end = match.span(kind)
+            add_start(token_start)
+            add_end(token_end)
+
+    def type(self, index):
+        if index >= len(self.types):
+            return token.EOF
+        return token.token_types[self.types[index]]
+
+    def literal(self, index):
+        if index >= len(self.types):
+            return ''
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def token(self, index):
+        if index >= len(self.types):
+            return Token(token.EOF, '', len(self.source))
+        start = self.starts[index]
+        return Token(
+            token.token_types[self.types[index]],
+            self.source[start:self.ends[index]],
+            start,
+        )
+
+    def position(self, index):
+        if index >= len(self.types):
+            return len(self.source)
+        return self.starts[index]
+
+    def line_index(self):
+        return LineIndex(self.source)
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column)
+            for column in (self.types, self.starts, self.ends))
@@ -0,0 +1,313 @@
+import ast
+import gc
+import threading
+from collections import OrderedDict
+from interpreter.ast import (
+    Boolean,
+    ExpressionStatement,
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    ReturnStatement,
+)
+from interpreter.cache import source_key
+from interpreter.evaluator import EvaluationError, divide
+from interpreter.parser import parse
+
+INTEGER = "INTEGER"
+BOOLEAN = "BOOLEAN"
+NULL = "NULL"
+# The expression always raises when it is reached.
+ERROR = "ERROR"
+
+FUNCTION_NAME = "monkey_program"
+RESULT = "result"
+
+# Given to every expression and statement node up front; running
+# ast.fix_missing_locations over the module costs more than building it.
+AT = {"lineno": 1, "col_offset": 0}
+
+ARITHMETIC = {"+": ast.Add, "-": ast.Sub, "*": ast.Mult}
+COMPARISONS = {"<": ast.Lt, ">": ast.Gt, "==": ast.Eq, "!=": ast.NotEq}
+
+# Deeper expressions are emitted one operation per statement, since
+# CPython's compiler recurses over nested expressions.
+MAX_NESTING = 200
+
+
+def fail(message):
+    raise EvaluationError(message)
+
+
+HELPERS = {"fail": fail, "divide": divide}
+
+
+def variable(name):
+    # Monkey names may be Python keywords or non-ASCII letters that Python
+    # would NFKC-normalize into each other.
+    if name.isascii():
+        return "m_" + name
+    return "u_" + name.encode("utf-8").hex()
+
+
+def constant(value):
+    return ast.Constant(value, **AT)
+
+
+def name(identifier):
+    return ast.Name(identifier, ast.Load(), **AT)
+
+
+def assign(identifier, value):
+    return ast.Assign([ast.Name(identifier, ast.Store(), **AT)], value, **AT)
+
+
+def call(function, *arguments):
+    return ast.Call(name(function), list(arguments), [], **AT)
+
+
+def raises(message):
+    return call("fail", constant(message))
+
+
+class Value:
+    __slots__ = ("node", "type", "pure")
+
+    def __init__(self, node, type, pure=True):
+        self.node = node
+        self.type = type
+        # False when evaluating the node may raise.
+        self.pure = pure
+
+
+def sequence(values, last):
+    # Evaluates the impure values for their errors, in order, then last.
+    impure = [value.node for value in values if not value.pure]
+    if not impure:
+        return last.node
+    evaluated = ast.Tuple(impure + [last.node], ast.Load(), **AT)
+    return ast.Subscript(evaluated, constant(-1), ast.Load(), **AT)
+
+
+class Transpiler:
+    # Programs are straight-line code, so the type of every variable at
+    # every use is known from the let statements before it. Type errors and
+    # unknown identifiers therefore become fail() calls at the point the
+    # evaluator would raise, and everything else becomes plain Python
+    # operations on ints and bools. Division by zero is the only error
+    # left to check at runtime.
+    def __init__(self):
+        self.types = {}
+        self.temporaries = 0
+
+    def transpile(self, program):
+        body = [assign(RESULT, constant(None))]
+        for statement in program.statements:
+            self.statement(statement, body)
+        body.append(ast.Return(name(RESULT), **AT))
+
+        function = ast.FunctionDef(FUNCTION_NAME, ast.arguments([], [], None, [], [], None, []),
+            body, [], None, **AT)
+        return ast.Module([function], [])
+
+    def statement(self, statement, body):
+        if isinstance(statement, ExpressionStatement):
+            value = self.expression(statement.expression, body)
+            body.append(assign(RESULT, value.node))
+        elif isinstance(statement, LetStatement):
+            value = self.expression(statement.value, body)
+            if value.type == ERROR:
+                body.append(ast.Expr(value.node, **AT))
+                return
+            body.append(assign(variable(statement.name.value), value.node))
+            body.append(assign(RESULT, constant(None)))
+            self.types[statement.name.value] = value.type
+        elif isinstance(statement, ReturnStatement):
+            value = self.expression(statement.return_value, body)
+            body.append(ast.Return(value.node, **AT))
+        else:
+            raise EvaluationError(f"cannot evaluate {type(statement).__name__}")
+
+    def expression(self, expression, body):
+        spill = self.depth(expression) > MAX_NESTING
+        values = []
+        work = [(expression, False)]
+        while work:
+            node, operands_ready = work.pop()
+            node_type = type(node)
+            if node_type is InfixExpression:
+                if not operands_ready:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+                    continue
+                right = values.pop()
+                value = self.infix(node.operator, values.pop(), right)
+            elif node_type is PrefixExpression:
+                if not operands_ready:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    continue
+                value = self.prefix(node.operator, values.pop())
+            else:
+                value = self.leaf(node)
+
+            if spill and not isinstance(value.node, (ast.Constant, ast.Name)):
+                value = self.temporary(value, body)
+            values.append(value)
+        return values.pop()
+
+    def depth(self, expression):
+        deepest = 0
+        stack = [(expression, 1)]
+        while stack:
+            node, depth = stack.pop()
+            deepest = max(deepest, depth)
+            if type(node) is InfixExpression:
+                stack.append((node.left, depth + 1))
+                stack.append((node.right, depth + 1))
+            elif type(node) is PrefixExpression:
+                stack.append((node.right, depth + 1))
+        return deepest
+
+    def temporary(self, value, body):
+        self.temporaries += 1
+        temporary = f"t{self.temporaries}"
+        body.append(assign(temporary, value.node))
+        # The assignment has already run by the time the name is read.
+        return Value(name(temporary), value.type)
+
+    def leaf(self, node):
+        node_type = type(node)
+        if node_type is IntegerLiteral:
+            return Value(constant(node.value), INTEGER)
+        if node_type is Boolean:
+            return Value(constant(node.value), BOOLEAN)
+        if node_type is Identifier:
+            value_type = self.types.get(node.value)
+            if value_type is None:
+                return Value(raises(f"identifier not found: {node.value}"), ERROR, False)
+            return Value(name(variable(node.value)), value_type)
+        if node is None:
+            return Value(constant(None), NULL)
+        raise EvaluationError(f"cannot evaluate {node_type.__name__}")
+
+    def prefix(self, operator, right):
+        if right.type == ERROR:
+            return right
+        if operator == "!":
+            if right.type == BOOLEAN:
+                return Value(ast.UnaryOp(ast.Not(), right.node, **AT), BOOLEAN, right.pure)
+            return Value(sequence([right], Value(constant(right.type == NULL), BOOLEAN)),
+                BOOLEAN, right.pure)
+        if operator == "-" and right.type == INTEGER:
+            return Value(ast.UnaryOp(ast.USub(), right.node, **AT), INTEGER, right.pure)
+        return Value(sequence([right], Value(raises(f"unknown operator: {operator}{right.type}"),
+            ERROR)), ERROR, False)
+
+    def infix(self, operator, left, right):
+        if left.type == ERROR:
+            return left
+        if right.type == ERROR:
+            return Value(sequence([left], right), ERROR, False)
+
+        pure = left.pure and right.pure
+        if left.type == INTEGER and right.type == INTEGER:
+            if operator in ARITHMETIC:
+                return Value(ast.BinOp(left.node, ARITHMETIC[operator](), right.node, **AT),
+                    INTEGER, pure)
+            if operator == "/":
+                return Value(call("divide", left.node, right.node), INTEGER, False)
+            if operator in COMPARISONS:
+                return Value(ast.Compare(left.node, [COMPARISONS[operator]()], [right.node], **AT),
+                    BOOLEAN, pure)
+        elif operator == "==" or operator == "!=":
+            if left.type == right.type:
+                return Value(ast.Compare(left.node, [COMPARISONS[operator]()], [right.node], **AT),
+                    BOOLEAN, pure)
+            return Value(sequence([left, right], Value(constant(operator == "!="), BOOLEAN)),
+                BOOLEAN, pure)
+        elif left.type != right.type:
+            message = f"type mismatch: {left.type} {operator} {right.type}"
+            return Value(sequence([left, right], Value(raises(message), ERROR)), ERROR, False)
+        message = f"unknown operator: {left.type} {operator} {right.type}"
+        return Value(sequence([left, right], Value(raises(message), ERROR)), ERROR, False)
+
+
+def transpile(program):
+    # The Python syntax tree is acyclic, so, as in serialize.loads, the cycle
+    # collector is paused instead of rescanning every new node.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return Transpiler().transpile(program)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def compile_program(program, filename="<monkey>"):
+    return compile(transpile(program), filename, "exec")
+
+
+def load(code):
+    namespace = dict(HELPERS)
+    exec(code, namespace)
+    return namespace[FUNCTION_NAME]
+
+
+def run_program(program):
+    return load(compile_program(program))()
+
+
+class SourceError(ValueError):
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class CodeCache:
+    # Compiled module code objects keyed by the SHA-256 of their source.
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def code(self, source):
+        key = source_key(source)
+        with self.lock:
+            code = self.entries.get(key)
+            if code is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return code
+
+        # A source with parse errors is never run, since the partial tree
+        # would fail with confusing errors about missing expressions.
+        result = parse(source)
+        if result.errors:
+            raise SourceError(result.errors)
+        code = compile_program(result.program)
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = code
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return code
+
+    def run(self, source):
+        return load(self.code(source))()
+
+
+code_cache = CodeCache()
+
+
+def run_source(source):
+    return code_cache.run(source)
@@ -0,0 +1,298 @@
+from collections import namedtuple
+from interpreter.ast import Boolean, Identifier, InfixExpression, IntegerLiteral, PrefixExpression
+from interpreter.evaluator import UNSET, EvaluationError, Evaluator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INTEGER = "INTEGER"
+BOOLEAN = "BOOLEAN"
+
+# Values in an int64 column must stay below this in magnitude; results that
+# could reach it are computed on Python ints in an object array instead.
+INT64_LIMIT = 1 << 63
+
+ARITHMETIC = ("+", "-", "*", "/")
+COMPARISONS = ("<", ">", "==", "!=")
+
+# values holds the result of every row, with rows that raised left as 0,
+# False or None. errors maps each evaluation error message to the mask of
+# rows that raised it. unsupported lists what kept the expression off the
+# vectorized path, in which case it was evaluated row by row.
+BatchResult = namedtuple("BatchResult", ["values", "errors", "unsupported"])
+
+
+def unsupported_nodes(expression):
+    found = []
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is InfixExpression:
+            stack.append(node.right)
+            stack.append(node.left)
+        elif node_type is PrefixExpression:
+            stack.append(node.right)
+        elif node is None:
+            found.append("missing expression")
+        elif node_type not in (Identifier, IntegerLiteral, Boolean):
+            found.append(f"{node_type.__name__} node")
+    return found
+
+
+def identifiers(expression):
+    names = []
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        if type(node) is InfixExpression:
+            stack.append(node.right)
+            stack.append(node.left)
+        elif type(node) is PrefixExpression:
+            stack.append(node.right)
+        elif type(node) is Identifier and node.value not in names:
+            names.append(node.value)
+    return names
+
+
+def max_magnitude(values):
+    if values.size == 0:
+        return 0
+    return max(abs(int(values.max())), abs(int(values.min())))
+
+
+def exact_integers(values):
+    # int64 when every value fits, otherwise Python ints.
+    if values.dtype == object and values.size and max_magnitude(values) < INT64_LIMIT:
+        return values.astype(np.int64)
+    return values
+
+
+def column(name, values):
+    # Returns the type and array of one column, or None when its rows do
+    # not share a Monkey type.
+    values = np.asarray(values)
+    kind = values.dtype.kind
+    if kind == "b":
+        return BOOLEAN, values
+    if kind == "i":
+        return INTEGER, values.astype(np.int64, copy=False)
+    if kind == "u":
+        if values.dtype.itemsize < 8 or max_magnitude(values) < INT64_LIMIT:
+            return INTEGER, values.astype(np.int64)
+        return INTEGER, values.astype(object)
+    if kind == "O":
+        types = {type(value) for value in values.flat}
+        if types == {bool}:
+            return BOOLEAN, values.astype(bool)
+        if types <= {int}:
+            return INTEGER, exact_integers(values)
+        return None
+    raise TypeError(f"Column {name!r} has dtype {values.dtype}, expected integers or booleans")
+
+
+class ColumnEvaluator:
+    # Evaluates an expression over whole columns, following eval_infix and
+    # eval_prefix row for row. Column types are known before any value is
+    # read, so type errors apply to every row at once. Each row keeps only
+    # the first error it hits in evaluation order, as it would when
+    # evaluated alone.
+    def __init__(self, columns, shape):
+        self.columns = columns
+        self.shape = shape
+        self.failed = np.zeros(shape, dtype=bool)
+        self.errors = {}
+
+    def fail(self, message, rows=None):
+        new = ~self.failed if rows is None else rows & ~self.failed
+        if not new.any():
+            return
+        self.failed |= new
+        mask = self.errors.get(message)
+        self.errors[message] = new if mask is None else mask | new
+
+    def evaluate(self, expression):
+        values = []
+        work = [(expression, False)]
+        while work:
+            node, operands_ready = work.pop()
+            node_type = type(node)
+            if node_type is IntegerLiteral:
+                values.append(column(None, node.value))
+            elif node_type is Boolean:
+                values.append((BOOLEAN, np.asarray(node.value)))
+            elif node_type is Identifier:
+                values.append(self.identifier(node.value))
+            elif node_type is InfixExpression:
+                if operands_ready:
+                    right = values.pop()
+                    value_type, result = self.infix(node.operator, values.pop(), right)
+                    # Operations on 0-d arrays return numpy scalars.
+                    values.append((value_type, np.asarray(result)))
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+            else:
+                if operands_ready:
+                    value_type, result = self.prefix(node.operator, values.pop())
+                    values.append((value_type, np.asarray(result)))
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+        result = np.broadcast_to(values.pop()[1], self.shape).copy()
+        result[self.failed] = 0
+        return result
+
+    def identifier(self, name):
+        found = self.columns.get(name)
+        if found is None:
+            self.fail(f"identifier not found: {name}")
+            return INTEGER, np.zeros((), dtype=np.int64)
+        return found
+
+    def prefix(self, operator, right):
+        right_type, values = right
+        if operator == "!":
+            if right_type == BOOLEAN:
+                return BOOLEAN, ~values
+            return BOOLEAN, np.zeros(values.shape, dtype=bool)
+        if operator == "-" and right_type == INTEGER:
+            if values.dtype != object and values.size and int(values.min()) == -INT64_LIMIT:
+                values = values.astype(object)
+            return INTEGER, -values
+        self.fail(f"unknown operator: {operator}{right_type}")
+        return right
+
+    def infix(self, operator, left, right):
+        left_type, left_values = left
+        right_type, right_values = right
+        if left_type == INTEGER and right_type == INTEGER:
+            if operator in ARITHMETIC:
+                return INTEGER, self.arithmetic(operator, left_values, right_values)
+            if operator in COMPARISONS:
+                return BOOLEAN, self.compare(operator, left_values, right_values)
+        elif operator == "==" or operator == "!=":
+            if left_type == right_type:
+                return BOOLEAN, self.compare(operator, left_values, right_values)
+            shape = np.broadcast_shapes(left_values.shape, right_values.shape)
+            return BOOLEAN, np.full(shape, operator == "!=")
+        elif left_type != right_type:
+            self.fail(f"type mismatch: {left_type} {operator} {right_type}")
+            return left
+        self.fail(f"unknown operator: {left_type} {operator} {right_type}")
+        return left
+
+    def compare(self, operator, left, right):
+        if operator == "<":
+            result = left < right
+        elif operator == ">":
+            result = left > right
+        elif operator == "==":
+            result = left == right
+        else:
+            result = left != right
+        return np.asarray(result, dtype=bool)
+
+    def arithmetic(self, operator, left, right):
+        promote = left.dtype == object or right.dtype == object
+        if not promote:
+            # Bounds of the result from the bounds of the operands, so int64
+            # is only used where it cannot wrap around. Division takes the
+            # absolute value of both sides, which wraps for INT64_MIN.
+            left_max = max_magnitude(left)
+            right_max = max_magnitude(right)
+            if operator == "*":
+                bound = left_max * right_max
+            elif operator == "/":
+                bound = max(left_max, right_max)
+            else:
+                bound = left_max + right_max
+            promote = bound >= INT64_LIMIT
+        if promote:
+            left = left.astype(object)
+            right = right.astype(object)
+
+        if operator == "+":
+            result = left + right
+        elif operator == "-":
+            result = left - right
+        elif operator == "*":
+            result = left * right
+        else:
+            zero = right == 0
+            if zero.any():
+                self.fail("division by zero", np.broadcast_to(zero, self.shape))
+                right = np.where(zero, 1, right).astype(left.dtype)
+            # Truncates toward zero like evaluator.divide.
+            quotient = abs(left) // abs(right)
+            negated = -quotient
+            if promote:
+                quotient = np.asarray(quotient, dtype=object)
+                negated = np.asarray(negated, dtype=object)
+            result = np.where((left < 0) == (right < 0), quotient, negated)
+        # Operations on 0-d object arrays return Python ints, which numpy
+        # would turn back into fixed width integers.
+        return np.asarray(result, dtype=object) if promote else result
+
+
+def evaluate_rows(expression, columns, shape):
+    evaluator = Evaluator()
+    for name in columns:
+        evaluator.scope.declare(name)
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        if type(node) is Identifier:
+            node.depth, node.slot = evaluator.scope.lookup(node.value)
+        elif type(node) is InfixExpression:
+            stack.append(node.left)
+            stack.append(node.right)
+        elif type(node) is PrefixExpression:
+            stack.append(node.right)
+
+    frame = evaluator.frames[-1]
+    frame.extend([UNSET] * len(columns))
+    rows = [np.broadcast_to(np.asarray(values), shape).ravel().tolist()
+        for values in columns.values()]
+    results = np.empty(int(np.prod(shape)), dtype=object)
+    failures = {}
+    for row in range(results.size):
+        for slot, values in enumerate(rows):
+            frame[slot] = values[row]
+        try:
+            results[row] = evaluator.eval_expression(expression)
+        except EvaluationError as e:
+            failures.setdefault(str(e), []).append(row)
+
+    errors = {}
+    for message, failed in failures.items():
+        mask = np.zeros(results.size, dtype=bool)
+        mask[failed] = True
+        errors[message] = mask.reshape(shape)
+    return results.reshape(shape), errors
+
+
+def evaluate_columns(expression, columns):
+    if np is None:
+        raise ImportError("Vectorized evaluation requires numpy")
+
+    unsupported = unsupported_nodes(expression)
+    typed = {}
+    for name in identifiers(expression):
+        if name in columns:
+            found = column(name, columns[name])
+            if found is None:
+                unsupported.append(f"column {name!r} mixes value types")
+            typed[name] = found
+    shape = np.broadcast_shapes(*(np.shape(values) for values in columns.values()))
+
+    if unsupported:
+        values, errors = evaluate_rows(expression, {name: columns[name] for name in typed}, shape)
+        return BatchResult(values, errors, unsupported)
+
+    evaluator = ColumnEvaluator(typed, shape)
+    values = evaluator.evaluate(expression)
+    return BatchResult(values, evaluator.errors, [])
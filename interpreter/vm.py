@@ -0,0 +1,113 @@
+from interpreter.compiler import (
+    OP_ADD,
+    OP_BANG,
+    OP_CONSTANT,
+    OP_DIV,
+    OP_EQUAL,
+    OP_FALSE,
+    OP_GET_GLOBAL,
+    OP_GREATER_THAN,
+    OP_LESS_THAN,
+    OP_MINUS,
+    OP_MUL,
+    OP_NOT_EQUAL,
+    OP_NULL,
+    OP_POP,
+    OP_RETURN_VALUE,
+    OP_SET_GLOBAL,
+    OP_SUB,
+    OP_TRUE,
+    compile_program,
+)
+import operator
+from interpreter.evaluator import UNSET, EvaluationError, divide, eval_infix, eval_prefix
+
+INFIX_OPERATORS = {
+    OP_ADD: "+",
+    OP_SUB: "-",
+    OP_MUL: "*",
+    OP_DIV: "/",
+    OP_EQUAL: "==",
+    OP_NOT_EQUAL: "!=",
+    OP_LESS_THAN: "<",
+    OP_GREATER_THAN: ">",
+}
+
+INTEGER_OPERATIONS = [None] * (OP_GREATER_THAN + 1)
+INTEGER_OPERATIONS[OP_ADD] = operator.add
+INTEGER_OPERATIONS[OP_SUB] = operator.sub
+INTEGER_OPERATIONS[OP_MUL] = operator.mul
+INTEGER_OPERATIONS[OP_DIV] = divide
+INTEGER_OPERATIONS[OP_EQUAL] = operator.eq
+INTEGER_OPERATIONS[OP_NOT_EQUAL] = operator.ne
+INTEGER_OPERATIONS[OP_LESS_THAN] = operator.lt
+INTEGER_OPERATIONS[OP_GREATER_THAN] = operator.gt
+
+
+class VM:
+    def __init__(self, bytecode, globals=None):
+        self.instructions = list(bytecode.instructions)
+        self.constants = bytecode.constants
+        self.names = bytecode.names
+        self.globals = globals if globals is not None else []
+        self.globals.extend([UNSET] * (len(self.names) - len(self.globals)))
+        self.last_popped = None
+
+    def run(self):
+        constants = self.constants
+        globals = self.globals
+        integer_operations = INTEGER_OPERATIONS
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        last_popped = None
+
+        # The bytecode has no jumps yet, so the instruction stream is consumed
+        # with an iterator; operands are pulled with next_word().
+        words = iter(self.instructions)
+        next_word = words.__next__
+        for op in words:
+            if op == OP_GET_GLOBAL:
+                index = next_word()
+                value = globals[index]
+                if value is UNSET:
+                    raise EvaluationError(f"identifier not found: {self.names[index]}")
+                push(value)
+            elif op == OP_CONSTANT:
+                push(constants[next_word()])
+            elif OP_ADD <= op <= OP_GREATER_THAN:
+                right = pop()
+                left = pop()
+                if type(left) is int and type(right) is int:
+                    push(integer_operations[op](left, right))
+                else:
+                    push(eval_infix(INFIX_OPERATORS[op], left, right))
+            elif op == OP_POP:
+                last_popped = pop()
+            elif op == OP_TRUE:
+                push(True)
+            elif op == OP_FALSE:
+                push(False)
+            elif op == OP_MINUS:
+                value = pop()
+                push(-value if type(value) is int else eval_prefix("-", value))
+            elif op == OP_BANG:
+                value = pop()
+                push(value is False or value is None)
+            elif op == OP_SET_GLOBAL:
+                globals[next_word()] = pop()
+                last_popped = None
+            elif op == OP_NULL:
+                push(None)
+            elif op == OP_RETURN_VALUE:
+                self.last_popped = pop()
+                return self.last_popped
+            else:
+                raise EvaluationError(f"unknown opcode {op}")
+
+        self.last_popped = last_popped
+        return last_popped
+
+
+def run_program(program):
+    return VM(compile_program(program)).run()
@@ -0,0 +1,146 @@
+from interpreter.ast import Program
+
+
+def walk(node):
+    # Preorder, children in source order.
+    stack = [node]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        yield node
+        children = node.children()
+        if children:
+            extend(reversed(children))
+
+
+def walk_postorder(node):
+    stack = [(node, False)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, expanded = pop()
+        if expanded:
+            yield node
+            continue
+        children = node.children()
+        if not children:
+            yield node
+            continue
+        push((node, True))
+        for child in reversed(children):
+            push((child, False))
+
+
+def lookup_method(dispatch, prefix, visitor_class, node_class):
+    # Resolves and caches the handler for node_class, falling back along its
+    # MRO so that a visit_Expression method covers every expression.
+    for base in node_class.__mro__:
+        method = getattr(visitor_class, prefix + base.__name__, None)
+        if method is not None:
+            break
+    dispatch[node_class] = method
+    return method
+
+
+class Visitor:
+    # visit_<Class>(node) runs before a node's children and leave_<Class>(node)
+    # after them. A visit method returning False skips the node's children
+    # (and its leave method). Handlers are looked up once per node class and
+    # cached on the visitor class.
+    visit_dispatch = {}
+    leave_dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.visit_dispatch = {}
+        cls.leave_dispatch = {}
+
+    def visit(self, node):
+        visitor_class = type(self)
+        visit_dispatch = visitor_class.visit_dispatch
+        leave_dispatch = visitor_class.leave_dispatch
+
+        stack = [(node, False)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, leaving = pop()
+            node_class = type(node)
+            if leaving:
+                leave = leave_dispatch[node_class]
+                leave(self, node)
+                continue
+
+            try:
+                visit = visit_dispatch[node_class]
+            except KeyError:
+                visit = lookup_method(visit_dispatch, "visit_", visitor_class, node_class)
+            if visit is not None and visit(self, node) is False:
+                continue
+
+            try:
+                leave = leave_dispatch[node_class]
+            except KeyError:
+                leave = lookup_method(leave_dispatch, "leave_", visitor_class, node_class)
+            if leave is not None:
+                push((node, True))
+
+            children = node.children()
+            if children:
+                for child in reversed(children):
+                    push((child, False))
+        return self
+
+
+class Transformer:
+    # Rebuilds the tree bottom-up: once a node's children have been
+    # transformed and stored back in its child fields, transform_<Class>(node)
+    # returns the node to use in its place. Returning None removes a
+    # statement from a Program or leaves an empty child field. Nodes are
+    # changed in place.
+    transform_dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.transform_dispatch = {}
+
+    def transform(self, node):
+        transformer_class = type(self)
+        dispatch = transformer_class.transform_dispatch
+
+        values = []
+        stack = [(node, -1)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, count = pop()
+            if node is None:
+                values.append(None)
+                continue
+
+            node_class = type(node)
+            fields = node_class.child_fields
+            if count < 0 and fields:
+                children = node.statements if node_class is Program \
+                    else [getattr(node, field) for field in fields]
+                push((node, len(children)))
+                for child in reversed(children):
+                    push((child, -1))
+                continue
+
+            if fields:
+                results = values[len(values) - count:]
+                del values[len(values) - count:]
+                if node_class is Program:
+                    node.statements = [result for result in results if result is not None]
+                else:
+                    for field, result in zip(fields, results):
+                        setattr(node, field, result)
+
+            try:
+                method = dispatch[node_class]
+            except KeyError:
+                method = lookup_method(dispatch, "transform_", transformer_class, node_class)
+            values.append(node if method is None else method(self, node))
+        return values.pop()
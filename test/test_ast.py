@@ -0,0 +1,136 @@
+import io
+import tracemalloc
+import unittest
+import interpreter.token as token
+from interpreter.ast import (
+    DIRECT_DEPTH,
+    ExpressionStatement,
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    ReturnStatement,
+    to_string,
+    write,
+)
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser
+from interpreter.token import Token
+
+
+class UnslottedToken:
+    def __init__(self, type, literal, position=None):
+        self.type = type
+        self.literal = literal
+        self.position = position
+
+
+class UnslottedInfixExpression:
+    def __init__(self, token, left, operator, right=None):
+        self.token = token
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+
+class AstTest(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        program = Parser(Lexer("let x = 5; -a * b + 10 == true")).parse_program()
+
+        nodes = [program, program.statements[0].token]
+        for statement in program.statements:
+            nodes.append(statement)
+            nodes.append(statement.token)
+        nodes.append(program.statements[1].expression)
+
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"), type(node).__name__)
+
+    def test_slotted_nodes_use_less_memory(self):
+        count = 10000
+
+        def allocate(token_class, infix_class):
+            tracemalloc.start()
+            try:
+                nodes = [
+                    infix_class(token_class(token.PLUS, "+"), None, "+")
+                    for i in range(count)
+                ]
+                size, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            del nodes
+            return size / count
+
+        slotted = allocate(Token, InfixExpression)
+        unslotted = allocate(UnslottedToken, UnslottedInfixExpression)
+
+        self.assertLess(slotted, unslotted * 0.75)
+        self.assertLess(slotted, 150)
+
+    def test_leaf_nodes_report_literals(self):
+        identifier = Identifier(Token(token.IDENT, "x", 0), "x")
+        integer = IntegerLiteral(Token(token.INT, "5", 4), 5)
+
+        self.assertEqual(identifier.token_literal(), "x")
+        self.assertEqual(integer.string(), "5")
+        self.assertEqual(integer.position, 4)
+
+
+    def test_string_format(self):
+        source = "let x = -a * b + 10 == !true; return (x); return; foo < 2 / 3"
+        program = Parser(Lexer(source)).parse_program()
+
+        self.assertEqual(program.string(),
+            "let x = ((((-a) * b) + 10) == (!true));return x;return ;(foo < (2 / 3))")
+        self.assertEqual(program.statements[0].value.right.string(), "(!true)")
+        self.assertEqual(program.statements[0].value.left.left.string(), "((-a) * b)")
+
+    def test_missing_children_print_as_nothing(self):
+        let = LetStatement(Token(token.LET, "let"), Identifier(Token(token.IDENT, "x"), "x"))
+        statement = ExpressionStatement(Token(token.INT, "1"))
+        prefix = PrefixExpression(Token(token.MINUS, "-"), "-")
+
+        self.assertEqual(let.string(), "let x = ;")
+        self.assertEqual(ReturnStatement(Token(token.RETURN, "return")).string(), "return ;")
+        self.assertEqual(statement.string(), "")
+        self.assertEqual(prefix.string(), "(-)")
+
+    def test_deep_trees_print_without_recursion(self):
+        count = 50000
+        program = Parser(Lexer(" + ".join(["a"] * count) + "; " + "-" * count + "b")).parse_program()
+
+        text = program.string()
+        chain = count + len(" + ") * (count - 1) + len("()") * (count - 1)
+        negations = len("b") + len("(-)") * count
+        self.assertEqual(len(text), chain + negations)
+        self.assertTrue(text.endswith("(-b)" + ")" * (count - 1)))
+
+    def test_shallow_trees_print_as_deep_ones_do(self):
+        for depth in range(DIRECT_DEPTH - 2, DIRECT_DEPTH + 3):
+            source = f"let x = {' + '.join(['a'] * depth)}; return {'-' * depth}!b; {'(' * depth}1"
+            program = Parser(Lexer(source + " * 2)" * depth)).parse_program()
+
+            for statement in program.statements:
+                self.assertEqual(statement.string(), to_string(statement))
+            self.assertEqual(program.string(), to_string(program))
+
+    def test_write_streams_in_batches(self):
+        class Recorder(io.StringIO):
+            writes = 0
+
+            def write(self, text):
+                Recorder.writes += 1
+                return super().write(text)
+
+        program = Parser(Lexer("let a = 1 + b * 3;\n" * 2000)).parse_program()
+        stream = Recorder()
+        write(program, stream)
+
+        self.assertEqual(stream.getvalue(), program.string())
+        self.assertGreater(Recorder.writes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from interpreter.batch import parse_many
+from interpreter.parser import parse
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sources = {}
+        for i in range(40):
+            path = os.path.join(self.directory.name, f"script{i}.monkey")
+            source = f"let x{i} = {i};\n{i} + x * -y;" if i % 7 else "let = 1;"
+            with open(path, "w") as f:
+                f.write(source)
+            self.sources[path] = source
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_results(self, results):
+        self.assertEqual(sorted(result.path for result in results), sorted(self.sources))
+        for result in results:
+            expected = parse(self.sources[result.path])
+            self.assertEqual(result.errors, expected.errors)
+            self.assertEqual(result.program.string(), expected.program.string())
+
+    def test_files_are_parsed_in_process(self):
+        self.check_results(list(parse_many(self.sources, workers=1, chunk_size=3)))
+
+    def test_files_are_parsed_across_processes(self):
+        self.check_results(list(parse_many(iter(self.sources), workers=2, chunk_size=3)))
+
+    def test_unreadable_files_are_reported_and_streaming_continues(self):
+        undecodable = os.path.join(self.directory.name, "binary.monkey")
+        with open(undecodable, "wb") as f:
+            f.write(b"\xff\xfe")
+        missing = os.path.join(self.directory.name, "missing.monkey")
+        paths = [undecodable, missing, *self.sources]
+
+        for workers in (1, 2):
+            results = {result.path: result for result in parse_many(paths, workers, chunk_size=3)}
+
+            self.assertEqual(len(results), len(paths))
+            for path in (undecodable, missing):
+                self.assertIsNone(results[path].program)
+                self.assertEqual(len(results[path].errors), 1)
+                self.assertTrue(results[path].errors[0].startswith(f"Cannot read {path}: "))
+            self.check_results([results[path] for path in self.sources])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import mmap
+import tempfile
+import unittest
+import interpreter.token as token
+from interpreter.byte_lexer import ByteLexer, OffsetToken
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser, parse
+
+
+class ByteLexerTest(unittest.TestCase):
+    source = "let five = 5;\nlet ten = 10;\r\n!-/*5; 5 < 10 > 5;\t10 == 10; 10 != 9; @ fn if else return true false"
+
+    def triples(self, lexer):
+        triples = []
+        while True:
+            tok = lexer.next_token()
+            triples.append((tok.type, tok.literal, tok.position))
+            if tok.type == token.EOF:
+                return triples
+
+    def test_matches_str_lexer_on_ascii(self):
+        self.assertEqual(
+            self.triples(ByteLexer(self.source.encode())),
+            self.triples(Lexer(self.source, engine="regex")))
+
+    def test_buffer_types(self):
+        data = self.source.encode()
+        expected = self.triples(ByteLexer(data))
+        for source in (bytearray(data), memoryview(data)):
+            self.assertEqual(self.triples(ByteLexer(source)), expected)
+
+    def test_non_ascii_bytes_are_illegal(self):
+        tokens = list(ByteLexer("é=".encode()))
+
+        self.assertEqual([tok.type for tok in tokens], [token.ILLEGAL, token.ILLEGAL, token.ASSIGN])
+        self.assertEqual(tokens[2].position, 2)
+
+    def test_literals_are_decoded_when_read(self):
+        data = bytearray(b"ab 12 let")
+        tokens = list(ByteLexer(data))
+
+        self.assertEqual([type(tok) for tok in tokens], [OffsetToken, OffsetToken, token.Token])
+        data[0:2] = b"cd"
+        self.assertEqual(tokens[0].literal, "cd")
+        self.assertIs(type(tokens[0].decoded()), token.Token)
+
+    def test_trees_do_not_refer_to_the_buffer(self):
+        data = bytearray(b"12 + ab")
+        program = Parser(data).parse_program()
+
+        data[0:2] = b"99"
+
+        self.assertEqual(program.string(), "(12 + ab)")
+        self.assertEqual(program.statements[0].expression.left.value, 12)
+
+    def test_mmap_can_be_closed_after_parsing(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b"let x = 1;\nx + 2;\n7;\n" * 1000)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                program = Parser(ByteLexer(mapped)).parse_program()
+
+        self.assertEqual(len(program.statements), 3000)
+        self.assertEqual(program.statements[-3].string(), "let x = 1;")
+        self.assertEqual(program.statements[-2].token.literal, "x")
+
+    def test_parser_results_match(self):
+        source = "let a = 1 + b * (c - 2);\nlet = 5;\n  x + ;"
+        expected = parse(source)
+        parser = Parser(source.encode())
+        program = parser.parse_program()
+
+        self.assertEqual(program.string(), expected.program.string())
+        self.assertEqual(parser.errors, expected.errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from interpreter.cache import ParseCache, source_key
+
+
+class ParseCacheTest(unittest.TestCase):
+    def test_repeated_sources_are_served_from_cache(self):
+        cache = ParseCache()
+
+        first = cache.parse("1 + 2 * 3")
+        second = cache.parse("1 + 2 * 3")
+
+        self.assertIs(first, second)
+        self.assertEqual(first.program.string(), "(1 + (2 * 3))")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_parser_errors_are_cached(self):
+        cache = ParseCache()
+
+        cache.parse("let = 5;")
+        result = cache.parse("let = 5;")
+
+        self.assertEqual(result.errors[0],
+            "Expected next token to be IDENT, got = instead at line 1, column 5")
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ParseCache(max_entries=2)
+
+        cache.parse("a")
+        cache.parse("b")
+        cache.parse("a")
+        cache.parse("c")
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_entries_are_bounded_by_source_bytes(self):
+        cache = ParseCache(max_source_bytes=10)
+
+        cache.parse("1 + 1")
+        cache.parse("2 + 2")
+        cache.parse("3 + 3")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["source_bytes"], 10)
+
+    def test_directory_store_is_shared_across_caches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ParseCache(directory=directory).parse("-a * b; let = 1")
+
+            cache = ParseCache(directory=directory)
+            result = cache.parse("-a * b; let = 1")
+
+            self.assertEqual(cache.disk_hits, 1)
+            self.assertEqual(cache.misses, 0)
+            self.assertEqual(result.program.string(), "((-a) * b)1")
+            self.assertEqual(len(result.errors), 2)
+
+    def test_failed_store_writes_keep_the_parse(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ParseCache(directory=directory)
+            blocked = cache.path(source_key("a + b"))
+            with open(os.path.dirname(blocked), "w"):
+                pass
+            unwritable = cache.path(source_key("c + d"))
+            os.makedirs(unwritable)
+
+            self.assertEqual(cache.parse("a + b").program.string(), "(a + b)")
+            self.assertEqual(cache.parse("c + d").program.string(), "(c + d)")
+            self.assertEqual(cache.misses, 2)
+            self.assertIn("a + b", cache)
+            self.assertEqual(os.listdir(os.path.dirname(unwritable)), [os.path.basename(unwritable)])
+
+    def test_truncated_store_entries_are_misses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = ParseCache(directory=directory)
+            writer.parse("let name = 1;")
+            path = writer.path(source_key("let name = 1;"))
+            with open(path, "r+b") as f:
+                f.truncate(10)
+
+            cache = ParseCache(directory=directory)
+            result = cache.parse("let name = 1;")
+
+            self.assertEqual(cache.disk_hits, 0)
+            self.assertEqual(result.program.string(), "let name = 1;")
+
+
+if __name__ == '__main__':
+    unittest.main()
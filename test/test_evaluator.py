@@ -0,0 +1,103 @@
+import unittest
+from interpreter.evaluator import EvaluationError, Evaluator, evaluate
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser
+
+
+class EvaluatorTest(unittest.TestCase):
+    def run_program(self, input):
+        parser = Parser(Lexer(input))
+        program = parser.parse_program()
+        self.assertEqual(parser.errors, [])
+        return evaluate(program)
+
+    def test_integer_expressions_are_evaluated(self):
+        tests = [
+            ("5", 5),
+            ("-10", -10),
+            ("5 + 5 + 5 + 5 - 10", 10),
+            ("2 * (5 + 10)", 30),
+            ("-50 + 100 + -50", 0),
+            ("7 / 2", 3),
+            ("-7 / 2", -3),
+            ("7 / -2", -3),
+            ("(5 + 10 * 2 + 15 / 3) * 2 + -10", 50),
+        ]
+
+        for input, expected in tests:
+            self.assertEqual(self.run_program(input), expected, input)
+
+    def test_boolean_expressions_are_evaluated(self):
+        tests = [
+            ("true", True),
+            ("1 < 2", True),
+            ("1 > 2", False),
+            ("1 == 1", True),
+            ("1 != 1", False),
+            ("true == true", True),
+            ("true != false", True),
+            ("(1 < 2) == true", True),
+            ("1 == true", False),
+            ("!true", False),
+            ("!5", False),
+            ("!!5", True),
+            ("!!false", False),
+        ]
+
+        for input, expected in tests:
+            self.assertIs(self.run_program(input), expected, input)
+
+    def test_let_and_return_statements_are_evaluated(self):
+        tests = [
+            ("let a = 5; a;", 5),
+            ("let a = 5 * 5; a;", 25),
+            ("let a = 5; let b = a; let c = a + b + 5; c;", 15),
+            ("let a = 1; let a = a + 1; a", 2),
+            ("let a = 1;", None),
+            ("return 10; 9;", 10),
+            ("9; return 2 * 5; 9;", 10),
+        ]
+
+        for input, expected in tests:
+            self.assertEqual(self.run_program(input), expected, input)
+
+    def test_errors_are_reported(self):
+        tests = [
+            ("5 + true;", "type mismatch: INTEGER + BOOLEAN"),
+            ("5 + true; 5;", "type mismatch: INTEGER + BOOLEAN"),
+            ("-true", "unknown operator: -BOOLEAN"),
+            ("true + false;", "unknown operator: BOOLEAN + BOOLEAN"),
+            ("foobar", "identifier not found: foobar"),
+            ("x; let x = 1;", "identifier not found: x"),
+            ("1 / 0", "division by zero"),
+        ]
+
+        for input, expected in tests:
+            with self.assertRaises(EvaluationError, msg=input) as context:
+                self.run_program(input)
+            self.assertEqual(str(context.exception), expected)
+
+    def test_identifiers_are_resolved_to_slots(self):
+        program = Parser(Lexer("let a = 1; let b = 2; b + a; c")).parse_program()
+        Evaluator().resolve(program)
+
+        expression = program.statements[2].expression
+        self.assertEqual((expression.left.depth, expression.left.slot), (0, 1))
+        self.assertEqual((expression.right.depth, expression.right.slot), (0, 0))
+        self.assertEqual(program.statements[3].expression.slot, None)
+
+    def test_bindings_persist_across_programs(self):
+        evaluator = Evaluator()
+        evaluator.evaluate(Parser(Lexer("let a = 20;")).parse_program())
+
+        self.assertEqual(evaluator.evaluate(Parser(Lexer("a + 1")).parse_program()), 21)
+
+    def test_long_expressions_are_evaluated_without_recursion(self):
+        input = " + ".join(["1"] * 50000)
+        program = Parser(Lexer(input, engine="regex")).parse_program()
+
+        self.assertEqual(evaluate(program), 50000)
+
+
+if __name__ == '__main__':
+    unittest.main()
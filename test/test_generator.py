@@ -0,0 +1,47 @@
+import unittest
+from benchmarks.bench_parser import run_suite
+from benchmarks.generator import generate_program, parse_operator_mix, parse_size
+from interpreter.parser import parse
+
+
+class GeneratorTest(unittest.TestCase):
+    def test_generated_programs_are_deterministic(self):
+        self.assertEqual(generate_program(2000, seed=7), generate_program(2000, seed=7))
+        self.assertNotEqual(generate_program(2000, seed=7), generate_program(2000, seed=8))
+
+    def test_generated_programs_parse_without_errors(self):
+        source = generate_program(20000, seed=3, max_depth=6)
+        self.assertGreaterEqual(len(source), 20000)
+        result = parse(source)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(len(result.program.statements), source.count(";"))
+
+    def test_deep_nesting(self):
+        source = generate_program(10000, seed=1, max_depth=2000)
+        self.assertEqual(parse(source).errors, [])
+        depth = deepest = 0
+        for ch in source:
+            depth += {"(": 1, ")": -1}.get(ch, 0)
+            deepest = max(deepest, depth)
+        self.assertGreater(deepest, 50)
+
+    def test_operator_mix(self):
+        source = generate_program(5000, seed=2, operators=parse_operator_mix("*:1"))
+        for operator in ("+ ", " / ", "==", "!=", " < ", " > "):
+            self.assertNotIn(operator, source)
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("1K"), 1024)
+        self.assertEqual(parse_size("100MB"), 100 << 20)
+
+    def test_suite_report(self):
+        report = run_suite([1024], repeat=1)
+        case = report["results"][0]
+        self.assertEqual(case["lexer"]["char"]["tokens"], case["lexer"]["regex"]["tokens"])
+        self.assertGreater(case["parser"]["statements"], 0)
+        self.assertGreater(case["parser"]["peak_memory_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
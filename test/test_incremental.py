@@ -0,0 +1,91 @@
+import random
+import unittest
+from interpreter.incremental import parse_document, reparse
+from interpreter.parser import parse
+from interpreter.serialize import dumps
+
+
+class IncrementalTest(unittest.TestCase):
+    def check_matches_full_parse(self, document):
+        full = parse(document.source)
+        self.assertEqual(document.errors, full.errors)
+        self.assertEqual(dumps(document.program), dumps(full.program))
+
+    def test_edits_match_full_parse(self):
+        source = "let x = 5;\na + b;\nc * d\n-e;\nlet = 1;\nreturn 10;\n"
+        edits = [
+            [(11, 12, "z")],
+            [(0, 0, "1 + ")],
+            [(16, 17, "")],
+            [(20, 21, "!")],
+            [(3, 4, "\n\n"), (30, 31, "2")],
+            [(0, len(source), "")],
+            [(len(source), len(source), "f")],
+        ]
+
+        for edit in edits:
+            document = reparse(parse_document(source), edit)
+            self.check_matches_full_parse(document)
+
+    def test_untouched_statements_are_reused(self):
+        source = "a + 1;\nb + 2;\nc + 3;\nd + 4;\ne + 5;\nf + 6;\ng + 7;\n"
+        document = parse_document(source)
+        first = document.program.statements[0]
+        last = document.program.statements[-1]
+
+        document = reparse(document, [(28, 29, "ee")])
+
+        self.assertEqual(document.program.string(),
+            "(a + 1)(b + 2)(c + 3)(d + 4)(ee + 5)(f + 6)(g + 7)")
+        self.assertIs(document.program.statements[0], first)
+        self.assertIs(document.program.statements[-1], last)
+        self.assertEqual(last.position, 43)
+        self.check_matches_full_parse(document)
+
+    def test_error_locations_follow_edits(self):
+        document = parse_document("1;\nlet = 2;")
+        document = reparse(document, [(0, 0, "\n")])
+
+        self.assertEqual(document.errors[0],
+            "Expected next token to be IDENT, got = instead at line 3, column 5")
+        self.check_matches_full_parse(document)
+
+    def test_chained_edits_shift_positions_once_read(self):
+        source = "".join(f"let v{i} = a + {i};\nx{i} + ;\n" for i in range(40))
+        document = parse_document(source)
+        last = document.program.statements[-1]
+        position = last.position
+
+        for start, end, replacement in [(30, 30, "zz"), (400, 410, ""), (5, 6, "q\n\n"), (200, 200, "1;")]:
+            document = reparse(document, [(start, end, replacement)])
+        self.assertEqual(last.position, position)
+
+        self.assertIs(document.program.statements[-1], last)
+        self.assertEqual(last.position, position + 2 - 10 + 2 + 2)
+        self.check_matches_full_parse(document)
+
+    def test_random_edits_match_full_parse(self):
+        pieces = ["let ", "x", " = ", "1", " + ", "(", ")", ";", "\n", "return ", "!", "@"]
+        generator = random.Random(7)
+        for _ in range(200):
+            source = "".join(generator.choice(pieces) for _ in range(40))
+            document = parse_document(source)
+            for _ in range(4):
+                start = generator.randrange(len(source) + 1)
+                end = min(len(source), start + generator.randrange(4))
+                replacement = "".join(generator.choice(pieces) for _ in range(generator.randrange(3)))
+                document = reparse(document, [(start, end, replacement)])
+                source = document.source
+                if generator.random() < 0.5:
+                    self.check_matches_full_parse(document)
+            self.check_matches_full_parse(document)
+
+    def test_overlapping_edits_are_rejected(self):
+        document = parse_document("a + b")
+
+        with self.assertRaises(ValueError):
+            reparse(document, [(0, 3, "x"), (2, 4, "y")])
+
+
+if __name__ == '__main__':
+    unittest.main()
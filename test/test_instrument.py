@@ -0,0 +1,91 @@
+import io
+import unittest
+from interpreter.instrument import Instrumentation, profile
+from interpreter.parser import Parser, parse
+
+
+class InstrumentationTest(unittest.TestCase):
+    source = "let a = 1 + 2 * b;\nreturn -(a + 3);\nfoo == !true;"
+
+    def test_results_match_uninstrumented_parse(self):
+        for engine in ("char", "regex"):
+            result, _ = profile(self.source, engine)
+            expected = parse(self.source, engine)
+            self.assertEqual(result.program.string(), expected.program.string())
+            self.assertEqual(result.errors, expected.errors)
+
+    def test_errors_are_reported(self):
+        result, _ = profile("let = 5;")
+        self.assertEqual(result.errors, parse("let = 5;").errors)
+
+    def test_counts(self):
+        _, report = profile(self.source)
+
+        self.assertEqual(report.functions["parse_statement"].calls, 3)
+        self.assertEqual(report.functions["parse_let_statement"].calls, 1)
+        self.assertEqual(report.functions["parse_return_statement"].calls, 1)
+        self.assertEqual(report.functions["parse_expression_statement"].calls, 1)
+        self.assertEqual(report.functions["parse_infix_expression"].calls, 4)
+        self.assertEqual(report.functions["parse_grouped_expression"].calls, 1)
+        self.assertEqual(report.token_counts["INT"], 3)
+        self.assertEqual(report.token_counts["IDENT"], 4)
+        self.assertEqual(report.token_counts[";"], 3)
+        self.assertEqual(report.nodes["InfixExpression"], 4)
+        self.assertEqual(report.nodes["Identifier"], 4)
+        self.assertEqual(report.nodes["PrefixExpression"], 2)
+
+    def test_timings_are_consistent(self):
+        _, report = profile(self.source)
+        for stats in report.functions.values():
+            self.assertGreaterEqual(stats.total_ns, stats.self_ns)
+            self.assertGreaterEqual(stats.self_ns, 0)
+        self.assertEqual(sum(report.token_counts.values()), report.tokens)
+
+    def test_max_expression_depth(self):
+        _, shallow = profile("a + b;")
+        _, deep = profile("((((a))));")
+        self.assertEqual(shallow.max_expression_depth, 2)
+        self.assertEqual(deep.max_expression_depth, 5)
+
+    def test_memory(self):
+        _, report = profile(self.source)
+        self.assertIsNone(report.allocated_bytes)
+        _, report = profile(self.source, memory=True)
+        self.assertGreater(report.allocated_bytes, 0)
+
+    def test_collapsed_stacks(self):
+        _, report = profile(self.source)
+        out = io.StringIO()
+        report.dump_collapsed(out)
+        lines = out.getvalue().splitlines()
+
+        self.assertIn("parse_program;parse_statement;parse_let_statement",
+            [line.rsplit(" ", 1)[0] for line in lines])
+        for line in lines:
+            stack, microseconds = line.rsplit(" ", 1)
+            self.assertTrue(stack.split(";")[0] in ("parse_program", "next_token"))
+            self.assertGreater(int(microseconds), 0)
+
+    def test_other_parsers_are_unaffected(self):
+        functions = dict(vars(Parser))
+        prefix_parse_fns = dict(Parser.prefix_parse_fns)
+        infix_parse_fns = dict(Parser.infix_parse_fns)
+        Instrumentation().parse(self.source)
+
+        self.assertEqual(dict(vars(Parser)), functions)
+        self.assertEqual(Parser.prefix_parse_fns, prefix_parse_fns)
+        self.assertEqual(Parser.infix_parse_fns, infix_parse_fns)
+        parser = Parser.__new__(Parser)
+        self.assertNotIn("parse_statement", vars(parser))
+        self.assertEqual(parse("a + b").program.string(), "(a + b)")
+
+    def test_format(self):
+        _, report = profile(self.source, memory=True)
+        text = report.format()
+        self.assertIn("parse_infix_expression", text)
+        self.assertIn("max expression depth", text)
+        self.assertIn("peak allocated bytes", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import tracemalloc
+import unittest
+from interpreter.evaluator import evaluate
+from interpreter.intern import Interner
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser, parse
+
+
+class InternTest(unittest.TestCase):
+    source = "let a = 1 + b * 2; let c = a + b * 2; true == !true; a + b * 2;"
+
+    def test_output_is_unchanged(self):
+        expected = parse(self.source)
+        for mode in (True, "subtrees"):
+            result = parse(self.source, intern=mode)
+            self.assertEqual(result.program.string(), expected.program.string())
+            self.assertEqual(result.errors, expected.errors)
+
+    def test_leaves_are_shared(self):
+        first, second, third, fourth = parse(self.source, intern=True).program.statements
+
+        self.assertIs(first.value.right.left, second.value.right.left)
+        self.assertIs(first.name, second.value.left)
+        self.assertIs(third.expression.left, third.expression.right.right)
+        self.assertIsNot(first.value.right, second.value.right)
+
+    def test_subtrees_are_shared(self):
+        first, second, _, fourth = parse(self.source, intern="subtrees").program.statements
+
+        self.assertIs(first.value.right, second.value.right)
+        self.assertIs(second.value, fourth.expression)
+        self.assertIsNot(first.value, second.value)
+
+    def test_different_literals_are_kept_apart(self):
+        statements = parse("7; 07; x; y; true; false", intern=True).program.statements
+        nodes = [statement.expression for statement in statements]
+
+        self.assertEqual(len({id(node) for node in nodes}), 6)
+        self.assertEqual([node.string() for node in nodes], ["7", "07", "x", "y", "true", "false"])
+
+    def test_interner_shared_across_parsers(self):
+        interner = Interner()
+        first = Parser(Lexer("alpha"), intern=interner).parse_program()
+        second = Parser(Lexer("alpha + 1"), intern=interner).parse_program()
+
+        self.assertIs(first.statements[0].expression, second.statements[0].expression.left)
+        self.assertEqual(len(interner), 2)
+        self.assertEqual(interner.hits, 1)
+
+    def test_shared_trees_evaluate(self):
+        source = "let a = 2; let b = a * a + 1; let a = b * a * a + 1; a"
+        self.assertEqual(evaluate(parse(source, intern="subtrees").program),
+            evaluate(parse(source).program))
+
+    def test_repetitive_programs_use_less_memory(self):
+        source = "let total = total + price * quantity;\n" * 2000
+
+        def allocated(mode):
+            tracemalloc.start()
+            try:
+                program = parse(source, intern=mode).program
+                size, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            del program
+            return size
+
+        plain = allocated(False)
+        leaves = allocated(True)
+        subtrees = allocated("subtrees")
+        self.assertLess(leaves, plain * 0.7)
+        self.assertLess(subtrees, leaves * 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,67 @@
+import io
+import mmap
+import tempfile
 import unittest
 import interpreter.token as token
-from interpreter.lexer import Lexer
+from interpreter.lexer import Lexer, StreamLexer
 
 class LexerTest(unittest.TestCase):
     def test_lexer_produces_correct_tokens(self):
+        self.check_lexer_produces_correct_tokens("char")
+
+    def test_regex_lexer_produces_correct_tokens(self):
+        self.check_lexer_produces_correct_tokens("regex")
+
+    def test_regex_lexer_matches_char_lexer(self):
+        input = "let x1 = 10 +\t@y;\r\n!=!= ==5 ÿé 12ab"
+
+        char_lexer = Lexer(input)
+        regex_lexer = Lexer(input, engine="regex")
+        while True:
+            expected = char_lexer.next_token()
+            tok = regex_lexer.next_token()
+            self.assertEqual((expected.type, expected.literal), (tok.type, tok.literal))
+            if expected.type == token.EOF:
+                break
+
+        self.assertEqual(regex_lexer.next_token().type, token.EOF)
+
+    def test_unknown_lexer_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Lexer("", engine="fortran")
+
+    def test_stream_lexer_handles_tokens_across_chunks(self):
+        input = "let foobar = 1234567890;\n10 == 10 != 9 é@ x;  "
+        expected = self.token_pairs(Lexer(input, engine="regex"))
+
+        for chunk_size in range(1, 8):
+            lexer = StreamLexer(io.StringIO(input), chunk_size=chunk_size)
+            self.assertEqual(expected, self.token_pairs(lexer), f"chunk_size={chunk_size}")
+
+            lexer = StreamLexer(io.BytesIO(input.encode()), chunk_size=chunk_size)
+            self.assertEqual(expected, self.token_pairs(lexer), f"chunk_size={chunk_size}")
+
+    def test_stream_lexer_reads_memory_mapped_files(self):
+        input = "let ten = 10;\n" * 1000
+
+        with tempfile.TemporaryFile() as f:
+            f.write(input.encode())
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                tokens = list(StreamLexer(mapped, chunk_size=100))
+
+        self.assertEqual(len(tokens), 5000)
+        self.assertEqual((tokens[-2].type, tokens[-2].literal), (token.INT, "10"))
+
+    def token_pairs(self, lexer):
+        pairs = []
+        while True:
+            tok = lexer.next_token()
+            pairs.append((tok.type, tok.literal))
+            if tok.type == token.EOF:
+                return pairs
+
+    def check_lexer_produces_correct_tokens(self, engine):
         input = """
             let five = 5;
             let ten = 10;
@@ -116,7 +174,7 @@ class LexerTest(unittest.TestCase):
             (token.EOF, ""),
         ]
 
-        lexer = Lexer(input)
+        lexer = Lexer(input, engine=engine)
         for i, exp_tok in enumerate(expected):
             tok = lexer.next_token()
             
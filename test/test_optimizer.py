@@ -0,0 +1,66 @@
+import unittest
+from interpreter.evaluator import EvaluationError, evaluate
+from interpreter.lexer import Lexer
+from interpreter.optimizer import optimize
+from interpreter.parser import Parser
+
+
+def parse_program(input):
+    return Parser(Lexer(input)).parse_program()
+
+
+class OptimizerTest(unittest.TestCase):
+    def test_programs_are_simplified(self):
+        tests = [
+            ("(2 * 3) + x * 1", "(6 + (x * 1))", 2),
+            ("let x = 4; (2 * 3) + x * 1", "let x = 4;(6 + x)", 4),
+            ("!!true", "true", 2),
+            ("let b = 1 < 2; !!b", "let b = true;b", 4),
+            ("let y = 3; --y; 0 + y - 0 / 1", "let y = 3;yy", 8),
+            ("-(5 + 5) * 2 > 10 == false", "true", 9),
+            ("let z = true; z * 1; !!z", "let z = true;(z * 1)z", 2),
+            ("1 / 0", "(1 / 0)", 0),
+            ("true + 1", "(true + 1)", 0),
+            ("let n = 0; 0 - n", "let n = 0;(0 - n)", 0),
+        ]
+
+        for input, expected, removed in tests:
+            program = parse_program(input)
+            self.assertEqual(optimize(program), removed, input)
+            self.assertEqual(program.string(), expected, input)
+
+    def test_results_are_preserved(self):
+        inputs = [
+            "let a = 7; let b = a * 1 + 0; -b / 2 * (3 - 1)",
+            "let t = 5 > 3; !!t == (1 < 2)",
+            "let x = 3; --x + 1 * x",
+            "return 2 * 3 + 4; 5",
+            "let a = true; a * 1",
+            "let a = true; --a",
+            "5 / (2 - 2)",
+        ]
+
+        for input in inputs:
+            try:
+                expected = evaluate(parse_program(input))
+            except EvaluationError as e:
+                expected = e.args
+
+            program = parse_program(input)
+            optimize(program)
+            try:
+                result = evaluate(program)
+            except EvaluationError as e:
+                result = e.args
+
+            self.assertEqual(result, expected, input)
+
+    def test_long_expressions_are_folded_without_recursion(self):
+        program = Parser(Lexer(" + ".join(["1"] * 50000), engine="regex")).parse_program()
+
+        self.assertEqual(optimize(program), 2 * 49999)
+        self.assertEqual(program.string(), "50000")
+
+
+if __name__ == '__main__':
+    unittest.main()
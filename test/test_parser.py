@@ -37,6 +37,36 @@ class ParserTest(unittest.TestCase):
             self.assertEqual(program.statements[i].name.value, expected_identifiers[i])
             self.assertEqual(program.statements[i].name.token_literal(), expected_identifiers[i])
 
+    def test_let_statement_values_are_correctly_parsed(self):
+        let_tests = [
+            ("let x = 5;", "x", 5),
+            ("let y = true;", "y", True),
+            ("let foobar = y;", "foobar", "y"),
+            ("let total = a + b * 2", "total", None),
+        ]
+
+        for input, expected_identifier, expected_value in let_tests:
+            parser = Parser(Lexer(input))
+            program = parser.parse_program()
+            self.check_parser_errors(parser)
+
+            self.assertEqual(len(program.statements), 1)
+            statement = program.statements[0]
+            self.assertEqual(statement.name.value, expected_identifier)
+            if expected_value is None:
+                self.assertEqual(statement.value.string(), "(a + (b * 2))")
+            elif isinstance(expected_value, str):
+                self.assertEqual(statement.value.value, expected_value)
+            else:
+                self.check_literal_expression(statement.value, expected_value)
+
+    def test_return_statement_values_are_correctly_parsed(self):
+        parser = Parser(Lexer("return 5; return x + 1; return;"))
+        program = parser.parse_program()
+        self.check_parser_errors(parser)
+
+        self.assertEqual(program.string(), "return 5;return (x + 1);return ;")
+
     def test_return_statement_is_correctly_parsed(self):
         input = """
         return 5;
@@ -204,6 +234,39 @@ class ParserTest(unittest.TestCase):
             self.check_parser_errors(parser)
             self.assertEqual(program.string(), precedence_tests[i][1])
 
+    def test_long_operator_chain_is_parsed_without_recursion(self):
+        count = 100000
+        input = " + ".join(["1"] * (count + 1))
+
+        parser = Parser(Lexer(input, engine="regex"))
+        program = parser.parse_program()
+        self.check_parser_errors(parser)
+
+        expression = program.statements[0].expression
+        depth = 0
+        while isinstance(expression, InfixExpression):
+            self.assertEqual(expression.right.value, 1)
+            expression = expression.left
+            depth += 1
+        self.assertEqual(depth, count)
+
+    def test_deeply_nested_expression_is_parsed_without_recursion(self):
+        depth = 10000
+        input = "-(" * depth + "x" + ")" * depth + " * 2"
+
+        parser = Parser(Lexer(input, engine="regex"))
+        program = parser.parse_program()
+        self.check_parser_errors(parser)
+
+        expression = program.statements[0].expression
+        self.assertEqual(isinstance(expression, InfixExpression), True)
+        self.assertEqual(expression.operator, "*")
+
+        expression = expression.left
+        for _ in range(depth):
+            self.assertEqual(isinstance(expression, PrefixExpression), True)
+            expression = expression.right
+        self.assertEqual(expression.value, "x")
 
     def check_literal_expression(self, expression, expected_value):
         if isinstance(expected_value, bool):
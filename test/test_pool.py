@@ -0,0 +1,139 @@
+import threading
+import unittest
+import interpreter.token as token
+from interpreter.ast import Identifier
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser, parse
+from interpreter.pool import ParserPool
+from interpreter.token_buffer import TokenBuffer
+
+
+class ResetTest(unittest.TestCase):
+    def test_reset_reuses_lexer(self):
+        for engine in ("char", "regex"):
+            lexer = Lexer("a + b", engine=engine)
+            parser = Parser(lexer)
+            first = parser.parse_program()
+
+            parser.reset("let = 1; c * d")
+            second = parser.parse_program()
+
+            self.assertIs(parser.lexer, lexer)
+            self.assertEqual(first.string(), "(a + b)")
+            self.assertEqual(second.string(), "1(c * d)")
+            self.assertEqual(parser.errors, parse("let = 1; c * d").errors)
+
+    def test_reset_switches_token_sources(self):
+        parser = Parser(TokenBuffer("1 + 2"))
+        self.assertEqual(parser.parse_program().string(), "(1 + 2)")
+
+        parser.reset("3 * 4")
+        self.assertEqual(parser.parse_program().string(), "(3 * 4)")
+
+        parser.reset(TokenBuffer("5 - 6"))
+        self.assertEqual(parser.parse_program().string(), "(5 - 6)")
+
+    def test_errors_are_not_shared_between_parses(self):
+        parser = Parser(Lexer("let = 1;"))
+        parser.parse_program()
+        errors = parser.errors
+
+        parser.reset("1")
+        parser.parse_program()
+
+        self.assertEqual(errors, parse("let = 1;").errors)
+        self.assertEqual(parser.errors, [])
+
+
+class DispatchTableTest(unittest.TestCase):
+    def test_tables_are_shared_by_instances(self):
+        first = Parser(Lexer("a"))
+        second = Parser(Lexer("b"))
+
+        self.assertIs(first.prefix_parse_fns, second.prefix_parse_fns)
+        self.assertIs(first.infix_parse_fns, Parser.infix_parse_fns)
+
+    def test_instance_registration_does_not_leak(self):
+        parser = Parser(Lexer("{"))
+        parser.register_prefix(token.LBRACE, lambda: Identifier(parser.cur_token, "brace"))
+
+        self.assertEqual(parser.parse_program().string(), "brace")
+        self.assertEqual(parser.errors, [])
+        self.assertNotIn(token.LBRACE, Parser.prefix_parse_fns)
+        self.assertEqual(parse("{").errors[0],
+            "No prefix parse function for { found at line 1, column 1")
+
+    def test_bound_methods_can_be_registered(self):
+        parser = Parser(Lexer("x"))
+        parser.register_prefix(token.IDENT, parser.parse_boolean)
+
+        self.assertEqual(parser.parse_program().statements[0].expression.value, False)
+
+    def test_registered_functions_take_only_parse_arguments(self):
+        parser = Parser(Lexer("x +"))
+        parser.register_prefix(token.IDENT, lambda: Identifier(parser.cur_token, "y"))
+        parser.register_infix(token.PLUS, lambda left: Identifier(parser.cur_token, left.value + "+"))
+
+        self.assertEqual(parser.parse_program().string(), "y+")
+        self.assertEqual(parser.errors, [])
+
+    def test_subclass_overrides_are_dispatched(self):
+        class UpperParser(Parser):
+            def parse_identifier(self):
+                return Identifier(self.cur_token, self.cur_token.literal.upper())
+
+        self.assertEqual(UpperParser(Lexer("a + b")).parse_program().string(), "(A + B)")
+        self.assertEqual(parse("a + b").program.string(), "(a + b)")
+
+
+class ParserPoolTest(unittest.TestCase):
+    def test_parsers_are_reused(self):
+        pool = ParserPool()
+
+        for source in ("a", "b + c", "let = 1;"):
+            result = pool.parse(source)
+            expected = parse(source)
+            self.assertEqual(result.program.string(), expected.program.string())
+            self.assertEqual(result.errors, expected.errors)
+
+        self.assertEqual(pool.created, 1)
+        self.assertEqual(len(pool), 1)
+
+    def test_context_manager(self):
+        pool = ParserPool()
+        with pool.parser("1 * 2") as parser:
+            self.assertEqual(parser.parse_program().string(), "(1 * 2)")
+        with pool.parser("3") as again:
+            self.assertIs(again, parser)
+
+    def test_idle_parsers_are_bounded(self):
+        pool = ParserPool(max_idle=2)
+        parsers = [pool.acquire("x") for _ in range(4)]
+        for parser in parsers:
+            pool.release(parser)
+
+        self.assertEqual(pool.created, 4)
+        self.assertEqual(len(pool), 2)
+
+    def test_concurrent_parsing(self):
+        pool = ParserPool(max_idle=4)
+        sources = [f"{i} + {i} * x" for i in range(200)]
+        failures = []
+
+        def work(offset):
+            for source in sources[offset::4]:
+                if pool.parse(source).program.string() != parse(source).program.string():
+                    failures.append(source)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        self.assertLessEqual(len(pool), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
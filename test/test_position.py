@@ -0,0 +1,108 @@
+import io
+import tracemalloc
+import unittest
+from interpreter.lexer import Lexer, StreamLexer
+from interpreter.parser import Parser
+from interpreter.position import LineIndex
+from interpreter.recognizer import validate
+from interpreter.token_buffer import TokenBuffer
+
+
+class PositionTest(unittest.TestCase):
+    def test_line_index_computes_locations(self):
+        index = LineIndex("ab\ncd\n\nx")
+
+        self.assertEqual(index.line_starts, [0, 3, 6, 7])
+        self.assertEqual(index.location(0), (1, 1))
+        self.assertEqual(index.location(2), (1, 3))
+        self.assertEqual(index.location(4), (2, 2))
+        self.assertEqual(index.location(6), (3, 1))
+        self.assertEqual(index.location(7), (4, 1))
+
+    def test_tokens_carry_start_offsets(self):
+        input = "let x = 10;\n  x == 5 !"
+        expected = [0, 4, 6, 8, 10, 14, 16, 19, 21, 22]
+
+        lexers = [
+            Lexer(input),
+            Lexer(input, engine="regex"),
+            StreamLexer(io.StringIO(input), chunk_size=3),
+        ]
+        for lexer in lexers:
+            positions = [lexer.next_token().position for _ in expected]
+            self.assertEqual(positions, expected, lexer)
+
+        buffer = TokenBuffer(input)
+        self.assertEqual([buffer.token(i).position for i in range(len(expected))], expected)
+
+    def test_stream_lexer_tokens_carry_locations(self):
+        input = "a\nbb\n\n  ccc;\n\n\n (1 +\n2"
+        index = LineIndex(input)
+        for chunk_size in (1, 2, 3, 5, 100):
+            lexer = StreamLexer(io.StringIO(input), chunk_size=chunk_size)
+            tokens = list(lexer) + [lexer.next_token()]
+
+            self.assertEqual([(tok.line, tok.column) for tok in tokens],
+                [index.location(tok.position) for tok in tokens], chunk_size)
+
+        source = "let x = 1;\n\n  let = 2;\n(3 +\n"
+        parser = Parser(StreamLexer(io.StringIO(source), chunk_size=4))
+        parser.parse_program()
+        expected = Parser(Lexer(source))
+        expected.parse_program()
+        self.assertEqual(parser.errors, expected.errors)
+        self.assertTrue(parser.errors[-1].endswith("got EOF instead at line 5, column 1"))
+
+    def test_stream_lexer_memory_does_not_grow_with_lines(self):
+        class Lines:
+            def __init__(self, count):
+                self.left = count
+
+            def read(self, size):
+                lines = min(self.left, size // 3)
+                self.left -= lines
+                return "x;\n" * lines
+
+        peaks = []
+        for count in (5000, 50000):
+            tracemalloc.start()
+            lexer = StreamLexer(Lines(count), chunk_size=3000)
+            for _ in lexer:
+                pass
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.assertEqual(lexer.next_token().line, count + 1)
+
+        self.assertLess(peaks[1], peaks[0] + 16 * 1024)
+
+    def test_nodes_carry_start_offsets(self):
+        program = Parser(Lexer("let a = 1;\n-b * c + d")).parse_program()
+
+        statement = program.statements[1]
+        self.assertEqual(statement.position, 11)
+        self.assertEqual(statement.expression.position, 11)
+        self.assertEqual(statement.expression.right.position, 20)
+
+    def test_parser_errors_report_locations(self):
+        parser = Parser(Lexer("let x 5;\n  ;"))
+        parser.parse_program()
+
+        self.assertEqual(parser.errors, [
+            "Expected next token to be =, got INT instead at line 1, column 7",
+            "No prefix parse function for ; found at line 2, column 3",
+        ])
+
+    def test_eof_stays_at_the_end_of_the_source(self):
+        lexer = Lexer("x")
+        lexer.next_token()
+        self.assertEqual([lexer.next_token().position for _ in range(3)], [1, 1, 1])
+
+        for engine in ("char", "regex"):
+            parser = Parser(Lexer("(", engine=engine))
+            parser.parse_program()
+            self.assertEqual(parser.errors, validate("(").errors, engine)
+            self.assertTrue(parser.errors[-1].endswith("got EOF instead at line 1, column 2"), engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
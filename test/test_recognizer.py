@@ -0,0 +1,62 @@
+import random
+import unittest
+from benchmarks.generator import generate_program
+from interpreter.parser import parse
+from interpreter.recognizer import validate
+
+
+class RecognizerTest(unittest.TestCase):
+    def assertSameAsParser(self, source):
+        expected = parse(source)
+        result = validate(source, stats=True)
+        self.assertEqual(result.errors, expected.errors, source)
+        self.assertEqual(result.valid, not expected.errors)
+        self.assertEqual(result.stats["statements"], len(expected.program.statements), source)
+
+    def test_valid_programs(self):
+        for source in (
+            "",
+            "let x = 5; let y = x * (2 + -x);",
+            "return; return 1 == 2 != !true;",
+            "a + b * c - d / e < f > g",
+            generate_program(20000, seed=5, max_depth=8),
+        ):
+            self.assertSameAsParser(source)
+            self.assertTrue(validate(source).valid)
+
+    def test_errors_match_parser(self):
+        for source in (
+            "let = 5;",
+            "let x 5; y",
+            "let x = ;",
+            "(1 + 2;",
+            "1 + ) 2",
+            "return + ;",
+            "@ 1 ; fn",
+            "let x = (((1",
+            "if (x) { y }",
+        ):
+            self.assertSameAsParser(source)
+            self.assertFalse(validate(source).valid)
+
+    def test_random_token_sequences(self):
+        pieces = ["let", "return", "a", "7", "true", "+", "-", "*", "<", "==",
+            "!", "=", "(", ")", ";", "{", "fn", "@", "\n"]
+        rng = random.Random(4)
+        for _ in range(500):
+            self.assertSameAsParser(" ".join(rng.choice(pieces) for _ in range(rng.randint(0, 20))))
+
+    def test_deep_nesting(self):
+        source = "(" * 5000 + "1" + ")" * 5000 + " + " + "-" * 5000 + "2"
+        result = validate(source, stats=True)
+        self.assertTrue(result.valid)
+        self.assertEqual(result.stats["max_depth"], 5002)
+
+    def test_stats(self):
+        self.assertIsNone(validate("1").stats)
+        stats = validate("let a = 1 + 2; a;", stats=True).stats
+        self.assertEqual(stats, {"tokens": 9, "statements": 2, "max_depth": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
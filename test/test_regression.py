@@ -0,0 +1,51 @@
+import unittest
+from benchmarks.regression import MEMORY_SLACK, compare, summarize, workloads
+
+
+def run(**workloads):
+    return {"workloads": {name: {"normalized": median, "normalized_mad": mad,
+        "peak_memory_bytes": memory} for name, (median, mad, memory) in workloads.items()}}
+
+
+class RegressionTest(unittest.TestCase):
+    def test_summarize_uses_median_and_mad(self):
+        self.assertEqual(summarize([1.0, 2.0, 3.0, 4.0, 100.0]), {"median": 3.0, "mad": 1.0})
+
+    def test_slowdowns_beyond_threshold_and_noise_regress(self):
+        baseline = run(lexer=(1.0, 0.01, 1000), parser=(1.0, 0.01, 1000))
+        current = run(lexer=(1.05, 0.01, 1000), parser=(1.2, 0.01, 1000))
+
+        statuses = {row["workload"]: row["status"] for row in compare(baseline, current)}
+
+        self.assertEqual(statuses, {"lexer": "ok", "parser": "slower"})
+
+    def test_noisy_slowdowns_pass(self):
+        baseline = run(parser=(1.0, 0.05, 1000))
+        current = run(parser=(1.2, 0.05, 1000))
+
+        self.assertEqual(compare(baseline, current)[0]["status"], "ok")
+        self.assertEqual(compare(baseline, current, noise=1.0)[0]["status"], "slower")
+
+    def test_memory_growth_regresses(self):
+        big = 10 * MEMORY_SLACK
+        baseline = run(parser=(1.0, 0.01, big), lexer=(1.0, 0.01, 1000))
+        current = run(parser=(1.0, 0.01, 2 * big), lexer=(1.0, 0.01, 2000))
+
+        statuses = {row["workload"]: row["status"] for row in compare(baseline, current)}
+
+        self.assertEqual(statuses, {"parser": "more memory", "lexer": "ok"})
+
+    def test_workloads_missing_from_the_baseline_are_new(self):
+        rows = compare(run(), run(parser=(1.0, 0.01, 1000)))
+
+        self.assertEqual(rows, [{"workload": "parser", "status": "new", "current": 1.0}])
+
+    def test_workload_set_is_fixed(self):
+        self.assertEqual(list(workloads()), [
+            "lexer.regex", "lexer.char", "lexer.bytes",
+            "parser.program", "parser.nested", "parser.chain", "recognizer.validate",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
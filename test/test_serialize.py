@@ -0,0 +1,71 @@
+import unittest
+from interpreter.ast import PrefixExpression
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser, parse
+from interpreter.serialize import FormatError, dumps, loads, loads_result
+
+
+class SerializeTest(unittest.TestCase):
+    def test_program_round_trips(self):
+        inputs = [
+            "",
+            "let x = 5; let y = 10; let foobar = 838383;",
+            "return 993322;",
+            "-a * b; !-a; a + b * c + d / e - f; 3 + 4; -5 * 5",
+            "3 + 4 * 5 == 3 * 1 + 4 * 5; (5 + 5) * 2; !(true == false)",
+            "12345678901234567890 * -1; é + x",
+        ]
+
+        for input in inputs:
+            program = Parser(Lexer(input)).parse_program()
+            self.assertEqual(loads(dumps(program)).string(), program.string(), input)
+
+    def test_tokens_and_positions_round_trip(self):
+        program = Parser(Lexer("let a = 1;\n-b * 300")).parse_program()
+        loaded = loads(dumps(program))
+
+        original = program.statements[1].expression
+        expression = loaded.statements[1].expression
+        self.assertEqual(expression.token.type, original.token.type)
+        self.assertEqual(expression.token.position, 14)
+        self.assertEqual(expression.left.token.position, 11)
+        self.assertEqual(expression.right.value, 300)
+        self.assertEqual(loaded.statements[0].name.value, "a")
+
+    def test_errors_round_trip(self):
+        result = parse("let = 5; )")
+        loaded = loads_result(dumps(result.program, result.errors))
+
+        self.assertEqual(loaded.errors, result.errors)
+        self.assertEqual(loaded.program.string(), result.program.string())
+
+    def test_deep_trees_round_trip(self):
+        depth = 5000
+        program = Parser(Lexer("-" * depth + "x", engine="regex")).parse_program()
+
+        expression = loads(dumps(program)).statements[0].expression
+        for _ in range(depth):
+            self.assertEqual(isinstance(expression, PrefixExpression), True)
+            expression = expression.right
+        self.assertEqual(expression.value, "x")
+
+    def test_invalid_data_is_rejected(self):
+        data = dumps(Parser(Lexer("1 + 2")).parse_program())
+
+        with self.assertRaises(FormatError):
+            loads(b"not an ast")
+        with self.assertRaises(FormatError):
+            loads(data[:-3])
+        with self.assertRaises(FormatError):
+            loads(data[:5] + b"\x09" + data[6:])
+
+    def test_truncated_data_is_rejected_at_every_offset(self):
+        data = dumps(Parser(Lexer("let name = -value + 2;")).parse_program())
+
+        for end in range(len(data)):
+            with self.assertRaises(FormatError, msg=end):
+                loads(data[:end])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import base64
+import os
+import struct
+import tempfile
+import unittest
+from interpreter.parser import parse
+from interpreter.serialize import loads_result
+from interpreter.service import Histogram, ParseService, ServiceClient, read_frame
+
+
+class HistogramTest(unittest.TestCase):
+    def test_buckets_and_percentiles(self):
+        histogram = Histogram(buckets=(1, 10, 100))
+        for value in (0.5, 2, 3, 50, 500):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], [[1, 1], [10, 2], [100, 1], ["inf", 1]])
+        self.assertEqual(snapshot["count"], 5)
+        self.assertEqual(snapshot["max"], 500)
+        self.assertEqual(histogram.percentile(0.5), 10)
+        self.assertEqual(histogram.percentile(1.0), 500)
+        self.assertIsNone(Histogram().percentile(0.5))
+
+
+class ParseServiceTest(unittest.TestCase):
+    def run_with_service(self, test, **options):
+        async def main():
+            service = ParseService(**options)
+            server = await service.start_tcp()
+            host, port = server.sockets[0].getsockname()[:2]
+            client = await ServiceClient.connect_tcp(host, port)
+            try:
+                return await test(service, client)
+            finally:
+                await client.close()
+                await service.close()
+        return asyncio.run(main())
+
+    def test_parse_and_evaluate(self):
+        async def test(service, client):
+            response = await client.parse("let a = 2; a * (3 + 4)", evaluate=True)
+            self.assertEqual(response["program"], "let a = 2;(a * (3 + 4))")
+            self.assertEqual(response["errors"], [])
+            self.assertEqual(response["value"], 14)
+
+            response = await client.parse("let = 1;")
+            self.assertEqual(response["errors"], parse("let = 1;").errors)
+
+            response = await client.parse("1 / 0", evaluate=True)
+            self.assertEqual(response["evaluation_error"], "division by zero")
+        self.run_with_service(test)
+
+    def test_serialized_ast(self):
+        async def test(service, client):
+            response = await client.parse("x + 1;", format="ast")
+            result = loads_result(base64.b64decode(response["ast"]))
+            self.assertEqual(result.program.string(), "(x + 1)")
+        self.run_with_service(test)
+
+    def test_bad_requests(self):
+        async def test(service, client):
+            self.assertIn("error", await client.request({"source": 5}))
+            self.assertIn("error", await client.parse("1", format="xml"))
+        self.run_with_service(test)
+
+    def test_unencodable_responses_are_reported(self):
+        async def test(service, client):
+            source = f"let a = {'9' * 3000}; a * a * a"
+            response = await asyncio.wait_for(client.parse(source, evaluate=True), 5)
+            self.assertIn("cannot encode response", response["error"])
+
+            response = await asyncio.wait_for(client.parse("1 + 1"), 5)
+            self.assertEqual(response["program"], "(1 + 1)")
+        self.run_with_service(test)
+
+    def test_failing_request_does_not_fail_its_batch(self):
+        sources = ["1 + 2", "9" * 5000, "a * b"]
+
+        async def test(service, client):
+            responses = await asyncio.gather(*(client.parse(source) for source in sources))
+            self.assertEqual(responses[0]["program"], "(1 + 2)")
+            self.assertTrue(responses[1]["error"].startswith("internal error: "))
+            self.assertEqual(responses[2]["program"], "(a * b)")
+            self.assertEqual(service.batches, 1)
+        self.run_with_service(test, batch_delay=0.05)
+
+    def test_requests_held_by_the_batcher_are_answered_on_close(self):
+        async def test(service, client, hold_slot):
+            if hold_slot:
+                await service.slots.acquire()
+            pending = asyncio.ensure_future(client.parse("1 + 1"))
+            await asyncio.sleep(0.05)
+            self.assertEqual(service.queue.qsize(), 0)
+
+            await service.close()
+            response = await asyncio.wait_for(pending, 5)
+            self.assertEqual(response["error"], "service is shutting down")
+
+        self.run_with_service(lambda service, client: test(service, client, False), batch_delay=10)
+        self.run_with_service(lambda service, client: test(service, client, True), max_batches=1)
+
+    def test_concurrent_requests_are_batched(self):
+        sources = [f"{i} + {i}" for i in range(100)]
+
+        async def test(service, client):
+            responses = await asyncio.gather(*(client.parse(source) for source in sources))
+            self.assertEqual([response["program"] for response in responses],
+                [f"({i} + {i})" for i in range(100)])
+
+            stats = await client.stats()
+            self.assertEqual(stats["requests"], 100)
+            self.assertLess(stats["batches"], 100)
+            self.assertEqual(stats["latency_ms"]["count"], 100)
+        self.run_with_service(test, batch_size=32, batch_delay=0.01)
+
+    def test_small_queue_applies_backpressure(self):
+        async def test(service, client):
+            responses = await asyncio.gather(*(client.parse("a") for _ in range(50)))
+            self.assertTrue(all(response["program"] == "a" for response in responses))
+            self.assertEqual(service.requests, 50)
+        self.run_with_service(test, batch_size=2, max_queue=2, max_batches=1)
+
+    def test_malformed_frame(self):
+        async def test(service, client):
+            host, port = service.server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            payload = b"{not json"
+            writer.write(struct.pack(">I", len(payload)) + payload)
+            response = await read_frame(reader)
+            writer.close()
+            await writer.wait_closed()
+            self.assertIn("error", response)
+        self.run_with_service(test)
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "requires Unix sockets")
+    def test_unix_socket(self):
+        async def main(path):
+            service = ParseService()
+            await service.start_unix(path)
+            client = await ServiceClient.connect_unix(path)
+            try:
+                return await client.parse("-5")
+            finally:
+                await client.close()
+                await service.close()
+
+        with tempfile.TemporaryDirectory() as directory:
+            response = asyncio.run(main(os.path.join(directory, "monkey.sock")))
+        self.assertEqual(response["program"], "(-5)")
+
+
+if __name__ == "__main__":
+    unittest.main()
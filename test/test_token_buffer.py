@@ -0,0 +1,81 @@
+import unittest
+import interpreter.token as token
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser
+from interpreter.serialize import dumps
+from interpreter.token_buffer import TokenBuffer
+
+
+class TokenBufferTest(unittest.TestCase):
+    def test_token_buffer_matches_lexer(self):
+        input = """
+            let add = fn(x, y) { x + y; };
+            if (5 < 10) { return true; } else { return false; }
+            10 == 10; 10 != 9; !-/*5; @
+        """
+
+        lexer = Lexer(input)
+        buffer = TokenBuffer(input)
+        for i in range(len(buffer) + 2):
+            expected = lexer.next_token()
+            tok = buffer.token(i)
+            self.assertEqual(expected.type, tok.type, f"Test #{i}")
+            self.assertEqual(expected.literal, tok.literal, f"Test #{i}")
+            self.assertEqual(expected.type, buffer.type(i), f"Test #{i}")
+            self.assertEqual(expected.literal, buffer.literal(i), f"Test #{i}")
+
+        self.assertEqual(buffer.type(len(buffer)), token.EOF)
+
+    def test_token_buffer_is_compact(self):
+        buffer = TokenBuffer("let x = 5 + 10;" * 100)
+        self.assertEqual(len(buffer), 700)
+        self.assertEqual(buffer.nbytes(), 700 * 9)
+
+    def test_parser_reads_from_token_buffer(self):
+        inputs = [
+            "let x = 5; let y = 10;",
+            "return 993322;",
+            "3 + 4 * 5 == 3 * 1 + 4 * 5; -(5 + 5); !(true == true)",
+            "let = 5; (1 + 2; )",
+        ]
+
+        for input in inputs:
+            expected_parser = Parser(Lexer(input))
+            expected = expected_parser.parse_program()
+
+            parser = Parser(TokenBuffer(input))
+            program = parser.parse_program()
+
+            self.assertEqual(program.string(), expected.string())
+            self.assertEqual(parser.errors, expected_parser.errors)
+
+    def test_buffered_trees_keep_every_position(self):
+        inputs = [
+            "(1 + 2) * x; (a);",
+            "let = 5; ;; )) let x 5; = 3; return ); !; @ 1",
+            ")",
+        ]
+
+        for input in inputs:
+            expected_parser = Parser(Lexer(input))
+            expected = expected_parser.parse_program()
+
+            parser = Parser(TokenBuffer(input))
+            program = parser.parse_program()
+
+            self.assertEqual(dumps(program), dumps(expected), input)
+            self.assertEqual(parser.errors, expected_parser.errors, input)
+
+    def test_delimiters_are_not_built_per_token(self):
+        first = Parser(TokenBuffer("x;"))
+        second = Parser(TokenBuffer("1 + 2;"))
+        second.next_token()
+        second.next_token()
+
+        self.assertEqual(first.peek_token.type, token.SEMICOLON)
+        self.assertIs(first.peek_token, second.peek_token)
+        self.assertEqual(second.cur_token.position, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
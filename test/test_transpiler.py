@@ -0,0 +1,92 @@
+import ast
+import unittest
+from interpreter.evaluator import EvaluationError, evaluate
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser, parse
+from interpreter.transpiler import CodeCache, SourceError, run_program, transpile
+
+
+def parse_program(input):
+    return Parser(Lexer(input)).parse_program()
+
+
+class TranspilerTest(unittest.TestCase):
+    def test_programs_match_evaluator(self):
+        inputs = [
+            "5", "-10", "5 + 5 + 5 + 5 - 10", "2 * (5 + 10)", "-7 / 2", "7 / -2",
+            "(5 + 10 * 2 + 15 / 3) * 2 + -10",
+            "1 < 2", "1 > 2", "1 == 1", "1 != 1", "true == true", "true != false",
+            "(1 < 2) == true", "1 == true", "1 != false", "!true", "!5", "!!5", "!!false",
+            "let a = 5; a;", "let a = 5; let b = a; let c = a + b + 5; c;",
+            "let a = 1; let a = a + 1; a", "let a = 1;", "return 10; 9;", "9; return 2 * 5; 9;",
+            "let class = 2; let None = 3; class * None", "let é = 2; let e = 3; é * 10 + e",
+        ]
+
+        for input in inputs:
+            expected = evaluate(parse_program(input))
+            result = run_program(parse_program(input))
+            self.assertEqual(result, expected, input)
+            self.assertIs(type(result), type(expected), input)
+
+    def test_errors_match_evaluator(self):
+        inputs = [
+            "5 + true;", "-true", "true + false;", "foobar", "x; let x = 1;", "1 / 0",
+            "1 / 0 == true", "!(1 / 0)", "x + (1 / 0)", "(1 / 0) + x", "let a = 0; 5 + 5 / a",
+            "let a = true; let b = a - 1;",
+        ]
+
+        for input in inputs:
+            with self.assertRaises(EvaluationError) as expected:
+                evaluate(parse_program(input))
+            with self.assertRaises(EvaluationError, msg=input) as context:
+                run_program(parse_program(input))
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_known_types_compile_to_plain_operations(self):
+        module = transpile(parse_program("let x = 1 + 2; -x * 2 == 1; x + true; return x / 2"))
+
+        self.assertEqual(ast.unparse(module), "\n".join([
+            "def monkey_program():",
+            "    result = None",
+            "    m_x = 1 + 2",
+            "    result = None",
+            "    result = -m_x * 2 == 1",
+            "    result = fail('type mismatch: INTEGER + BOOLEAN')",
+            "    return divide(m_x, 2)",
+            "    return result",
+        ]))
+
+    def test_deep_expressions_compile(self):
+        inputs = [
+            " + ".join(["1"] * 50000),
+            "-" * 5000 + "1",
+            "(" * 1000 + "1" + ")" * 1000,
+        ]
+
+        for input in inputs:
+            self.assertEqual(run_program(parse_program(input)), evaluate(parse_program(input)))
+
+    def test_code_cache_reuses_code_by_source(self):
+        cache = CodeCache(max_entries=2)
+
+        self.assertEqual(cache.run("let a = 6; a * 7"), 42)
+        self.assertIs(cache.code("let a = 6; a * 7"), cache.code("let a = 6; a * 7"))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        cache.code("1")
+        cache.code("2")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.misses, 3)
+
+    def test_code_cache_rejects_sources_with_parse_errors(self):
+        cache = CodeCache()
+
+        with self.assertRaises(SourceError) as context:
+            cache.run("let = 5; 1 +")
+
+        self.assertEqual(context.exception.errors, parse("let = 5; 1 +").errors)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
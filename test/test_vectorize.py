@@ -0,0 +1,115 @@
+import unittest
+from interpreter.evaluator import EvaluationError, evaluate
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser
+from interpreter.vectorize import evaluate_columns, evaluate_rows, np, unsupported_nodes
+
+
+def parse_expression(input):
+    return Parser(Lexer(input)).parse_program().statements[0].expression
+
+
+def evaluate_row(input, row):
+    lets = "".join(f"let {name} = {str(value).lower()}; " for name, value in row.items())
+    try:
+        return evaluate(Parser(Lexer(lets + input)).parse_program()), None
+    except EvaluationError as e:
+        return None, str(e)
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class VectorizeTest(unittest.TestCase):
+    def columns(self):
+        return {
+            "a": np.array([-7, -1, 0, 3, 7, 2]),
+            "b": np.array([2, -2, 5, 0, -3, 1]),
+            "c": np.array([True, False, True, False, True, False]),
+            "big": np.array([2 ** 62, -(2 ** 63), 1, 2 ** 63 - 1, -3, 0], dtype=np.int64),
+        }
+
+    def assert_matches_rows(self, input, columns):
+        result = evaluate_columns(parse_expression(input), columns)
+        for row in range(len(columns["a"])):
+            values = {name: column[row].item() for name, column in columns.items()}
+            value, error = evaluate_row(input, values)
+            errors = [message for message, mask in result.errors.items() if mask[row]]
+            if error is not None:
+                self.assertEqual(errors, [error], (input, values))
+            else:
+                self.assertEqual(errors, [], (input, values))
+                self.assertEqual(result.values.tolist()[row], value, (input, values))
+                self.assertIs(type(result.values.tolist()[row]), type(value), (input, values))
+        return result
+
+    def test_expressions_match_evaluator_row_by_row(self):
+        inputs = [
+            "a * 2 + b > 3", "a / b", "-a / b + 1", "a / 2", "!a", "!!a", "!c", "-a",
+            "a == c", "a != c", "c == true", "c != (a < b)", "a < b == c",
+            "a + c", "-c", "c + c", "(a / b) + c", "missing + 1", "a + (b / 0 + missing)",
+            "big * big", "big + big - a", "-big", "big / -1", "big * 0 + 1",
+            "5 / big", "big / big", "a / (big * big)",
+        ]
+
+        for input in inputs:
+            result = self.assert_matches_rows(input, self.columns())
+            self.assertEqual(result.unsupported, [], input)
+
+    def test_literals_beyond_int64_are_exact(self):
+        inputs = [
+            "-9223372036854775808", "9223372036854775808", "18446744073709551616 / 2",
+            "(9223372036854775807 + 3) / 1", "99999999999999999999 / 3",
+            "-99999999999999999999 / 3", "9223372036854775807 + 1 - 1", "a + 9223372036854775808",
+        ]
+
+        columns = {"a": np.array([-1, 0, 2 ** 62])}
+        for input in inputs:
+            expression = parse_expression(input)
+            result = evaluate_columns(expression, columns)
+            values, errors = evaluate_rows(expression, columns, result.values.shape)
+            self.assertEqual(result.values.tolist(), values.tolist(), input)
+            self.assertEqual(result.errors, errors, input)
+
+    def test_integer_columns_stay_int64_when_results_fit(self):
+        result = evaluate_columns(parse_expression("a * 2 + b"), self.columns())
+
+        self.assertEqual(result.values.dtype, np.int64)
+        self.assertEqual(result.values.tolist(), [-12, -4, 5, 6, 11, 5])
+
+    def test_errors_mark_only_the_failing_rows(self):
+        result = evaluate_columns(parse_expression("a / b"), self.columns())
+
+        self.assertEqual(list(result.errors), ["division by zero"])
+        self.assertEqual(result.errors["division by zero"].tolist(),
+            [False, False, False, True, False, False])
+        self.assertEqual(result.values.tolist(), [-3, 0, 0, 0, -2, 2])
+
+    def test_scalars_broadcast_against_columns(self):
+        result = evaluate_columns(parse_expression("a + k"), {"a": np.arange(3), "k": 10})
+
+        self.assertEqual(result.values.tolist(), [10, 11, 12])
+
+    def test_mixed_columns_fall_back_to_row_evaluation(self):
+        columns = {"a": np.array([1, True, 3], dtype=object)}
+
+        result = evaluate_columns(parse_expression("a + 1"), columns)
+
+        self.assertEqual(result.unsupported, ["column 'a' mixes value types"])
+        self.assertEqual(result.values.tolist(), [2, None, 4])
+        self.assertEqual(result.errors["type mismatch: BOOLEAN + INTEGER"].tolist(),
+            [False, True, False])
+
+    def test_other_dtypes_are_rejected(self):
+        with self.assertRaises(TypeError):
+            evaluate_columns(parse_expression("a + 1"), {"a": np.array([1.5])})
+
+
+class UnsupportedNodesTest(unittest.TestCase):
+    def test_reports_nodes_outside_the_expression_subset(self):
+        program = Parser(Lexer("let x = 1;")).parse_program()
+
+        self.assertEqual(unsupported_nodes(parse_expression("-a * (b + true)")), [])
+        self.assertEqual(unsupported_nodes(program.statements[0]), ["LetStatement node"])
+
+
+if __name__ == '__main__':
+    unittest.main()
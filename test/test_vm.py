@@ -0,0 +1,65 @@
+import unittest
+from interpreter.compiler import compile_program, disassemble
+from interpreter.evaluator import EvaluationError, evaluate
+from interpreter.lexer import Lexer
+from interpreter.parser import Parser
+from interpreter.vm import run_program
+
+
+def parse_program(input):
+    return Parser(Lexer(input)).parse_program()
+
+
+class VMTest(unittest.TestCase):
+    def test_programs_match_evaluator(self):
+        inputs = [
+            "5", "-10", "5 + 5 + 5 + 5 - 10", "2 * (5 + 10)", "-7 / 2", "7 / -2",
+            "(5 + 10 * 2 + 15 / 3) * 2 + -10",
+            "1 < 2", "1 > 2", "1 == 1", "1 != 1", "true == true", "true != false",
+            "(1 < 2) == true", "1 == true", "!true", "!5", "!!5", "!!false",
+            "let a = 5; a;", "let a = 5; let b = a; let c = a + b + 5; c;",
+            "let a = 1; let a = a + 1; a", "let a = 1;", "return 10; 9;", "9; return 2 * 5; 9;",
+        ]
+
+        for input in inputs:
+            self.assertEqual(run_program(parse_program(input)), evaluate(parse_program(input)), input)
+
+    def test_errors_match_evaluator(self):
+        inputs = ["5 + true;", "-true", "true + false;", "foobar", "x; let x = 1;", "1 / 0"]
+
+        for input in inputs:
+            with self.assertRaises(EvaluationError) as expected:
+                evaluate(parse_program(input))
+            with self.assertRaises(EvaluationError, msg=input) as context:
+                run_program(parse_program(input))
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_programs_compile_to_flat_bytecode(self):
+        bytecode = compile_program(parse_program("let x = 1 + 2; -x * 2 == 1; return x"))
+
+        self.assertEqual(bytecode.constants, [1, 2])
+        self.assertEqual(bytecode.names, ["x"])
+        self.assertEqual(disassemble(bytecode.instructions), "\n".join([
+            "0000 OP_CONSTANT 0",
+            "0002 OP_CONSTANT 1",
+            "0004 OP_ADD",
+            "0005 OP_SET_GLOBAL 0",
+            "0007 OP_GET_GLOBAL 0",
+            "0009 OP_MINUS",
+            "0010 OP_CONSTANT 1",
+            "0012 OP_MUL",
+            "0013 OP_CONSTANT 0",
+            "0015 OP_EQUAL",
+            "0016 OP_POP",
+            "0017 OP_GET_GLOBAL 0",
+            "0019 OP_RETURN_VALUE",
+        ]))
+
+    def test_long_expressions_compile_without_recursion(self):
+        program = Parser(Lexer(" + ".join(["1"] * 50000), engine="regex")).parse_program()
+
+        self.assertEqual(run_program(program), 50000)
+
+
+if __name__ == '__main__':
+    unittest.main()
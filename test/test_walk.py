@@ -0,0 +1,147 @@
+import unittest
+import interpreter.token as token
+from interpreter.ast import (
+    Identifier,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    ReturnStatement,
+)
+from interpreter.parser import parse
+from interpreter.token import Token
+from interpreter.walk import Transformer, Visitor, walk, walk_postorder
+
+
+def names(nodes):
+    return [type(node).__name__ for node in nodes]
+
+
+class WalkTest(unittest.TestCase):
+    def test_children(self):
+        program = parse("let a = -b; return; c * 1").program
+        let, ret, statement = program.statements
+
+        self.assertEqual(program.children(), (let, ret, statement))
+        self.assertEqual(let.children(), (let.name, let.value))
+        self.assertEqual(let.value.children(), (let.value.right,))
+        self.assertEqual(ret.children(), ())
+        self.assertEqual(statement.expression.children(),
+            (statement.expression.left, statement.expression.right))
+        self.assertEqual(let.name.children(), ())
+        self.assertEqual(InfixExpression(Token(token.PLUS, "+"), None, "+").children(), ())
+
+    def test_preorder_and_postorder(self):
+        program = parse("let a = 1 + -b;").program
+
+        self.assertEqual(names(walk(program)), ["Program", "LetStatement", "Identifier",
+            "InfixExpression", "IntegerLiteral", "PrefixExpression", "Identifier"])
+        self.assertEqual(names(walk_postorder(program)), ["Identifier", "IntegerLiteral",
+            "Identifier", "PrefixExpression", "InfixExpression", "LetStatement", "Program"])
+
+    def test_deep_trees(self):
+        count = 100000
+        program = parse(" + ".join(["x"] * count)).program
+
+        self.assertEqual(sum(1 for _ in walk(program)), 2 * count + 1)
+        self.assertEqual(sum(1 for _ in walk_postorder(program)), 2 * count + 1)
+
+
+class VisitorTest(unittest.TestCase):
+    def test_dispatch_by_class_and_base_class(self):
+        class Counter(Visitor):
+            def __init__(self):
+                self.identifiers = []
+                self.expressions = 0
+
+            def visit_Identifier(self, node):
+                self.identifiers.append(node.value)
+
+            def visit_Expression(self, node):
+                self.expressions += 1
+
+        counter = Counter().visit(parse("let a = b + 1 * c; d").program)
+
+        self.assertEqual(counter.identifiers, ["a", "b", "c", "d"])
+        self.assertEqual(counter.expressions, 3)
+        self.assertIs(Counter.visit_dispatch[InfixExpression], Counter.visit_Expression)
+        self.assertIsNone(Counter.visit_dispatch[LetStatement])
+        self.assertEqual(Visitor.visit_dispatch, {})
+
+    def test_leave_and_skip(self):
+        class Depth(Visitor):
+            def __init__(self):
+                self.depth = 0
+                self.deepest = 0
+                self.visited = []
+
+            def visit_PrefixExpression(self, node):
+                return False
+
+            def visit_Node(self, node):
+                self.visited.append(type(node).__name__)
+                self.depth += 1
+                self.deepest = max(self.deepest, self.depth)
+
+            def leave_Node(self, node):
+                self.depth -= 1
+
+        depth = Depth().visit(parse("(1 + (2 * (3 - -x)))").program)
+
+        self.assertEqual(depth.depth, 0)
+        self.assertEqual(depth.deepest, 5)
+        self.assertNotIn("Identifier", depth.visited)
+
+
+class TransformerTest(unittest.TestCase):
+    def test_rewrites_bottom_up(self):
+        class Rename(Transformer):
+            def transform_Identifier(self, node):
+                return Identifier(node.token, node.value.upper())
+
+            def transform_PrefixExpression(self, node):
+                if node.operator == "-" and isinstance(node.right, IntegerLiteral):
+                    value = -node.right.value
+                    return IntegerLiteral(Token(token.INT, str(value), node.position), value)
+                return node
+
+        program = Rename().transform(parse("let a = b + -1; -c").program)
+        self.assertEqual(program.string(), "let A = (B + -1);(-C)")
+        self.assertEqual(program.statements[0].value.right.value, -1)
+
+    def test_removes_statements(self):
+        class DropReturns(Transformer):
+            def transform_ReturnStatement(self, node):
+                return None
+
+        program = DropReturns().transform(parse("a; return b; c").program)
+        self.assertEqual(program.string(), "ac")
+
+    def test_base_class_handlers(self):
+        class Collect(Transformer):
+            def __init__(self):
+                self.seen = []
+
+            def transform_Expression(self, node):
+                self.seen.append(type(node).__name__)
+                return node
+
+        collect = Collect()
+        collect.transform(parse("return 1 == true;").program)
+
+        self.assertEqual(collect.seen, ["IntegerLiteral", "Boolean", "InfixExpression"])
+        self.assertIsNone(Collect.transform_dispatch[ReturnStatement])
+
+    def test_deep_trees(self):
+        count = 50000
+
+        class Negate(Transformer):
+            def transform_IntegerLiteral(self, node):
+                return IntegerLiteral(node.token, -node.value)
+
+        program = Negate().transform(parse(" + ".join(["1"] * count)).program)
+        self.assertEqual(sum(node.value for node in walk(program)
+            if isinstance(node, IntegerLiteral)), -count)
+
+
+if __name__ == "__main__":
+    unittest.main()